@@ -15,6 +15,7 @@ import json
 import hashlib
 from pathlib import Path
 from datetime import datetime
+from CYCLOTRON_SCHEMA import init_schema, get_hash, upsert_document, delete_document, bump_generation, prune_changes
 
 # Directories to vacuum
 VACUUM_DIRS = [
@@ -36,31 +37,9 @@ def init_database():
     DB_PATH.parent.mkdir(exist_ok=True)
 
     conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
 
-    # Create FTS5 virtual table for full-text search
-    cursor.execute('''
-        CREATE VIRTUAL TABLE IF NOT EXISTS knowledge USING fts5(
-            path,
-            name,
-            type,
-            content,
-            preview,
-            modified,
-            hash,
-            tokenize='porter unicode61'
-        )
-    ''')
-
-    # Create metadata table for tracking
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS index_meta (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    ''')
-
-    conn.commit()
+    # documents/index_meta tables + external-content FTS5 index
+    init_schema(conn)
     return conn
 
 def extract_content(filepath):
@@ -80,11 +59,9 @@ def vacuum_knowledge(conn):
     """Vacuum up all knowledge from directories"""
     cursor = conn.cursor()
 
-    # Clear existing index for fresh rebuild
-    cursor.execute('DELETE FROM knowledge')
-
     indexed_count = 0
     total_chars = 0
+    seen = set()
 
     for vacuum_dir in VACUUM_DIRS:
         if not os.path.exists(vacuum_dir):
@@ -115,28 +92,35 @@ def vacuum_knowledge(conn):
                     # Get metadata
                     stat = os.stat(filepath)
                     file_hash = get_file_hash(content)
-                    preview = content[:500].replace('\n', ' ')
-
-                    # Insert into FTS5 table
-                    cursor.execute('''
-                        INSERT INTO knowledge (path, name, type, content, preview, modified, hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        filepath,
-                        file,
-                        ext[1:],  # Remove the dot
-                        content,
-                        preview,
-                        int(stat.st_mtime),
-                        file_hash
-                    ))
-
+                    seen.add(filepath)
                     indexed_count += 1
                     total_chars += len(content)
 
+                    # Unchanged since last vacuum - skip the FTS rewrite
+                    if get_hash(cursor, filepath) == file_hash:
+                        continue
+
+                    upsert_document(cursor, {
+                        'path': filepath,
+                        'name': file,
+                        'type': ext[1:],  # Remove the dot
+                        'content': content,
+                        'preview': content[:500].replace('\n', ' '),
+                        'modified': int(stat.st_mtime),
+                        'hash': file_hash,
+                        'mtime': stat.st_mtime,
+                        'size': stat.st_size
+                    })
+
                 except Exception as e:
                     print(f"  ❌ Error indexing {filepath}: {e}")
 
+    # Drop files that no longer exist
+    cursor.execute('SELECT path FROM documents')
+    for (path,) in cursor.fetchall():
+        if path not in seen:
+            delete_document(cursor, path)
+
     # Update metadata
     cursor.execute('''
         INSERT OR REPLACE INTO index_meta (key, value)
@@ -153,6 +137,9 @@ def vacuum_knowledge(conn):
         VALUES ('total_chars', ?)
     ''', (str(total_chars),))
 
+    bump_generation(cursor)
+    prune_changes(cursor)
+
     conn.commit()
 
     return indexed_count, total_chars
@@ -164,13 +151,14 @@ def search(conn, query, limit=20):
     # FTS5 search with BM25 ranking
     cursor.execute('''
         SELECT
-            path,
-            name,
-            type,
-            preview,
-            modified,
+            d.path,
+            d.name,
+            d.type,
+            d.preview,
+            d.modified,
             bm25(knowledge) as score
         FROM knowledge
+        JOIN documents d ON d.id = knowledge.rowid
         WHERE knowledge MATCH ?
         ORDER BY score
         LIMIT ?
@@ -196,7 +184,8 @@ def get_snippet(conn, query, filepath):
     cursor.execute('''
         SELECT snippet(knowledge, 3, '>>>>', '<<<<', '...', 50)
         FROM knowledge
-        WHERE knowledge MATCH ? AND path = ?
+        WHERE knowledge MATCH ?
+          AND rowid = (SELECT id FROM documents WHERE path = ?)
     ''', (query, filepath))
 
     row = cursor.fetchone()
@@ -213,7 +202,7 @@ def get_stats(conn):
     # Get type breakdown
     cursor.execute('''
         SELECT type, COUNT(*)
-        FROM knowledge
+        FROM documents
         GROUP BY type
         ORDER BY COUNT(*) DESC
     ''')
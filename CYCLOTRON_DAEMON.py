@@ -20,11 +20,17 @@ import time
 import sqlite3
 import hashlib
 import json
+import queue
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from CYCLOTRON_SCHEMA import (init_schema, get_hash, upsert_document, touch_document,
+                              delete_document, bump_generation, prune_changes)
 
 # Configuration
 VACUUM_DIRS = [
@@ -40,6 +46,17 @@ DB_PATH = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/cyclotron.db")
 STATUS_FILE = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/daemon_status.json")
 LOG_FILE = Path("C:/Users/dwrek/100X_DEPLOYMENT/.cyclotron_atoms/daemon.log")
 
+# Vacuum pipeline tuning
+VACUUM_WORKERS = min(8, (os.cpu_count() or 2) * 2)  # reader/hasher threads
+VACUUM_BATCH_SIZE = 500  # rows per writer commit
+SKIP_DIRS = ['.git', '__pycache__', 'node_modules', '.venv', 'venv']
+
+# Watcher event queue tuning
+EVENT_QUEUE_MAX = 50_000  # distinct pending paths before events are dropped
+EVENT_BATCH_SIZE = 200  # events per transaction
+EVENT_BATCH_MS = 250  # settle window before draining a batch
+EVENT_WORKERS = 4  # file reader threads
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -56,6 +73,8 @@ class CyclotronIndexer:
 
     def __init__(self):
         self.conn = None
+        self.lock = threading.RLock()
+        self.vacuum_lock = threading.Lock()
         self.stats = {
             'files_indexed': 0,
             'files_updated': 0,
@@ -70,18 +89,11 @@ class CyclotronIndexer:
         """Initialize database connection"""
         DB_PATH.parent.mkdir(exist_ok=True)
         self.conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
-        cursor = self.conn.cursor()
 
-        # Create FTS5 table if not exists
-        cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS knowledge USING fts5(
-                path, name, type, content, preview, modified, hash,
-                tokenize='porter unicode61'
-            )
-        ''')
-        self.conn.commit()
+        # documents table keyed by path + external-content FTS5 index
+        init_schema(self.conn)
 
-    def should_index(self, path):
+    def should_index(self, path, st=None):
         """Check if file should be indexed"""
         p = Path(path)
 
@@ -90,70 +102,75 @@ class CyclotronIndexer:
             return False
 
         # Skip hidden/system directories
-        skip_dirs = ['.git', '__pycache__', 'node_modules', '.venv', 'venv']
-        if any(skip in str(path) for skip in skip_dirs):
+        if any(skip in str(path) for skip in SKIP_DIRS):
             return False
 
         # Skip very large files (>1MB)
         try:
-            if p.stat().st_size > 1_000_000:
+            if (st or p.stat()).st_size > 1_000_000:
                 return False
         except:
             return False
 
         return True
 
-    def get_file_hash(self, path):
-        """Get content hash for change detection"""
+    def read_file(self, path, st=None):
+        """Read a file once, returning a row ready for the writer (or None)"""
         try:
+            st = st or os.stat(path)
             with open(path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
+                raw = f.read()
+        except OSError:
             return None
 
+        content = raw.decode('utf-8', errors='ignore')
+        p = Path(path)
+        return {
+            'path': str(path),
+            'name': p.name,
+            'type': p.suffix,
+            'content': content,
+            'preview': content[:500].replace('\n', ' ').strip(),
+            'modified': datetime.fromtimestamp(st.st_mtime).isoformat(),
+            'hash': hashlib.md5(raw).hexdigest(),
+            'mtime': st.st_mtime,
+            'size': st.st_size,
+        }
+
+    def write_record(self, cursor, record, existing=None):
+        """Insert/replace one row; caller owns the transaction. True if content changed"""
+        if existing is None:
+            existing = get_hash(cursor, record['path'])
+
+        if existing == record['hash']:
+            touch_document(cursor, record['path'], record['mtime'], record['size'])
+            return False  # No change
+
+        if existing:
+            self.stats['files_updated'] += 1
+        else:
+            self.stats['files_indexed'] += 1
+
+        upsert_document(cursor, record)
+        return True
+
     def index_file(self, path):
         """Index a single file"""
         if not self.should_index(path):
             return False
 
         try:
-            p = Path(path)
-
-            # Read content
-            try:
-                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-            except:
+            record = self.read_file(path)
+            if record is None:
                 return False
 
-            # Get metadata
-            file_hash = self.get_file_hash(path)
-            modified = datetime.fromtimestamp(p.stat().st_mtime).isoformat()
-            preview = content[:500].replace('\n', ' ').strip()
-
-            # Check if already indexed with same hash
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT hash FROM knowledge WHERE path = ?', (str(path),))
-            existing = cursor.fetchone()
-
-            if existing and existing[0] == file_hash:
-                return False  # No change
-
-            # Delete old entry if exists
-            if existing:
-                cursor.execute('DELETE FROM knowledge WHERE path = ?', (str(path),))
-                self.stats['files_updated'] += 1
-            else:
-                self.stats['files_indexed'] += 1
-
-            # Insert new entry
-            cursor.execute('''
-                INSERT INTO knowledge (path, name, type, content, preview, modified, hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (str(path), p.name, p.suffix, content, preview, modified, file_hash))
-
-            self.conn.commit()
-            return True
+            with self.lock:
+                cursor = self.conn.cursor()
+                changed = self.write_record(cursor, record)
+                if changed:
+                    bump_generation(cursor)
+                self.conn.commit()
+            return changed
 
         except Exception as e:
             logger.error(f"Error indexing {path}: {e}")
@@ -163,21 +180,52 @@ class CyclotronIndexer:
     def delete_file(self, path):
         """Remove file from index"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('DELETE FROM knowledge WHERE path = ?', (str(path),))
-            if cursor.rowcount > 0:
-                self.stats['files_deleted'] += 1
+            with self.lock:
+                cursor = self.conn.cursor()
+                deleted = delete_document(cursor, str(path))
+                if deleted:
+                    bump_generation(cursor)
                 self.conn.commit()
+            if deleted:
+                self.stats['files_deleted'] += 1
                 return True
         except Exception as e:
             logger.error(f"Error deleting {path}: {e}")
         return False
 
-    def vacuum(self):
-        """Full re-index of all directories"""
-        logger.info("Starting full vacuum...")
-        start_time = time.time()
+    def apply_batch(self, records, deleted_paths):
+        """Write a batch of read records and deletions in one transaction"""
+        changed = deleted = 0
+        with self.lock:
+            cursor = self.conn.cursor()
+            for record in records:
+                try:
+                    if self.write_record(cursor, record):
+                        changed += 1
+                except Exception as e:
+                    logger.error(f"Error indexing {record['path']}: {e}")
+                    self.stats['errors'] += 1
+            for path in deleted_paths:
+                try:
+                    if delete_document(cursor, str(path)):
+                        deleted += 1
+                except Exception as e:
+                    logger.error(f"Error deleting {path}: {e}")
+            if changed or deleted:
+                bump_generation(cursor)
+            self.conn.commit()
+        self.stats['files_deleted'] += deleted
+        return changed, deleted
+
+    def _load_manifest(self):
+        """Manifest of path -> (mtime, size, hash) for everything already indexed"""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT path, mtime, size, hash FROM documents')
+            return {row[0]: row[1:] for row in cursor.fetchall()}
 
+    def _walk(self, manifest):
+        """Yield (path, stat) for files whose mtime/size differ from the manifest"""
         for directory in VACUUM_DIRS:
             if not os.path.exists(directory):
                 continue
@@ -188,22 +236,118 @@ class CyclotronIndexer:
 
                 for file in files:
                     path = os.path.join(root, file)
-                    self.index_file(path)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if not self.should_index(path, st):
+                        continue
+
+                    known = manifest.get(path)
+                    if known and known[0] == st.st_mtime and known[1] == st.st_size:
+                        continue
+                    yield path, st
+
+    def _writer(self, records, manifest):
+        """Single writer thread: drain records and commit in batches"""
+        cursor = self.conn.cursor()
+        pending = 0
+        changed = False
+        while True:
+            record = records.get()
+            if record is None:
+                break
+            with self.lock:
+                try:
+                    known = manifest.get(record['path'])
+                    changed |= self.write_record(cursor, record, known[2] if known else '')
+                    pending += 1
+                except Exception as e:
+                    logger.error(f"Error indexing {record['path']}: {e}")
+                    self.stats['errors'] += 1
+
+                if pending >= VACUUM_BATCH_SIZE:
+                    self._commit_batch(cursor, changed)
+                    pending = 0
+                    changed = False
+        with self.lock:
+            self._commit_batch(cursor, changed, prune=True)
+
+    def _commit_batch(self, cursor, changed, prune=False):
+        """Commit a writer batch; on failure roll back and keep draining.
+
+        The writer must never die: readers block on the bounded queue. Rolled-back
+        files keep their old manifest entry, so the next vacuum picks them up again.
+        """
+        try:
+            if changed:
+                bump_generation(cursor)
+            if prune:
+                prune_changes(cursor)
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error committing vacuum batch: {e}")
+            self.stats['errors'] += 1
+            try:
+                self.conn.rollback()
+            except sqlite3.Error:
+                pass
+
+    def vacuum(self):
+        """Incremental re-index of all directories
+
+        Files whose (mtime, size) match the documents table are skipped on stat alone.
+        The rest are read and hashed once on a thread pool, and a single writer
+        thread inserts them, committing every VACUUM_BATCH_SIZE rows.
+        """
+        with self.vacuum_lock:
+            return self._vacuum()
+
+    def _vacuum(self):
+        logger.info("Starting full vacuum...")
+        start_time = time.time()
+
+        manifest = self._load_manifest()
+        records = queue.Queue(maxsize=VACUUM_WORKERS * 4)
+        writer = threading.Thread(target=self._writer, args=(records, manifest), daemon=True)
+        writer.start()
+
+        # Bound in-flight reads so a huge tree doesn't queue every path up front
+        in_flight = threading.BoundedSemaphore(VACUUM_WORKERS * 4)
+
+        def read(item):
+            try:
+                record = self.read_file(*item)
+                if record is not None:
+                    records.put(record)
+            finally:
+                in_flight.release()
+
+        changed = 0
+        with ThreadPoolExecutor(max_workers=VACUUM_WORKERS) as pool:
+            for item in self._walk(manifest):
+                in_flight.acquire()
+                pool.submit(read, item)
+                changed += 1
+
+        records.put(None)
+        writer.join()
 
         elapsed = time.time() - start_time
         self.stats['last_vacuum'] = datetime.now().isoformat()
-        logger.info(f"Vacuum complete in {elapsed:.2f}s - {self.stats['files_indexed']} indexed, {self.stats['files_updated']} updated")
+        logger.info(f"Vacuum complete in {elapsed:.2f}s - {changed} changed on disk, {self.stats['files_indexed']} indexed, {self.stats['files_updated']} updated")
 
         return self.stats
 
     def get_stats(self):
         """Get current statistics"""
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM knowledge')
-        total = cursor.fetchone()[0]
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM documents')
+            total = cursor.fetchone()[0]
 
-        cursor.execute('SELECT SUM(LENGTH(content)) FROM knowledge')
-        total_chars = cursor.fetchone()[0] or 0
+            cursor.execute('SELECT SUM(LENGTH(content)) FROM documents')
+            total_chars = cursor.fetchone()[0] or 0
 
         return {
             **self.stats,
@@ -212,56 +356,169 @@ class CyclotronIndexer:
             'db_path': str(DB_PATH)
         }
 
+class EventQueue:
+    """Bounded, coalescing work queue: one pending operation per path"""
+
+    def __init__(self, maxsize=EVENT_QUEUE_MAX):
+        self.maxsize = maxsize
+        self.pending = OrderedDict()  # path -> (op, first_seen), oldest first
+        self.cond = threading.Condition()
+        self.closed = False
+        self.coalesced = 0
+        self.dropped = 0
+        self.overflowed = False
+
+    def put(self, path, op):
+        """Queue op ('index' or 'delete') for path; the latest op wins"""
+        with self.cond:
+            if path in self.pending:
+                # Keep the original timestamp so lag reflects the oldest event
+                self.pending[path] = (op, self.pending[path][1])
+                self.coalesced += 1
+            elif len(self.pending) >= self.maxsize:
+                self.dropped += 1
+                self.overflowed = True
+                return False
+            else:
+                self.pending[path] = (op, time.time())
+            self.cond.notify()
+            return True
+
+    def take(self, max_items, settle):
+        """Wait for work, let the burst settle, then pop up to max_items"""
+        with self.cond:
+            while not self.pending and not self.closed:
+                self.cond.wait()
+            if self.closed and not self.pending:
+                return None
+
+        # Events landing during the settle window coalesce into this batch
+        time.sleep(settle)
+
+        with self.cond:
+            batch = []
+            while self.pending and len(batch) < max_items:
+                path, (op, _) = self.pending.popitem(last=False)
+                batch.append((path, op))
+            return batch
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def stats(self):
+        with self.cond:
+            oldest = next(iter(self.pending.values()), None)
+            return {
+                'depth': len(self.pending),
+                'lag_seconds': round(time.time() - oldest[1], 3) if oldest else 0.0,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped
+            }
+
 class CyclotronHandler(FileSystemEventHandler):
-    """Watchdog event handler for file changes"""
+    """Watchdog event handler for file changes
 
-    def __init__(self, indexer):
+    Observer callbacks only enqueue; a drain thread pulls coalesced batches,
+    reads files on a worker pool and commits each batch in one transaction.
+    """
+
+    def __init__(self, indexer, workers=EVENT_WORKERS):
         self.indexer = indexer
-        self.last_event = {}
-        self.debounce_seconds = 1
-
-    def _should_process(self, path):
-        """Debounce rapid events on same file"""
-        now = time.time()
-        last = self.last_event.get(path, 0)
-        if now - last < self.debounce_seconds:
-            return False
-        self.last_event[path] = now
-        return True
+        self.queue = EventQueue()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.processed = 0
+        self.last_batch = 0
+        self._drainer = threading.Thread(target=self._drain, daemon=True)
+        self._drainer.start()
+
+    def _wanted(self, path):
+        """Cheap filter run on the observer thread (no stat)"""
+        return (Path(path).suffix.lower() in INDEX_EXTENSIONS
+                and not any(skip in str(path) for skip in SKIP_DIRS))
+
+    def _enqueue(self, path, op):
+        if self._wanted(path) and not self.queue.put(path, op):
+            if self.queue.dropped == 1:
+                logger.warning("Event queue full - dropping events, will re-vacuum")
+
+    def _drain(self):
+        while True:
+            batch = self.queue.take(EVENT_BATCH_SIZE, EVENT_BATCH_MS / 1000)
+            if batch is None:
+                return
+            try:
+                if batch:
+                    self._process(batch)
+
+                # Dropped events are recovered by an incremental vacuum
+                if self.queue.overflowed:
+                    self.queue.overflowed = False
+                    self.indexer.vacuum()
+            except Exception as e:
+                logger.error(f"Error processing event batch: {e}")
+                self.indexer.stats['errors'] += 1
+
+    def _process(self, batch):
+        to_index = [path for path, op in batch if op == 'index' and self.indexer.should_index(path)]
+        deletes = [path for path, op in batch if op == 'delete']
+
+        records = []
+        for path, record in zip(to_index, self.pool.map(self.indexer.read_file, to_index)):
+            if record is not None:
+                records.append(record)
+            elif not os.path.exists(path):
+                deletes.append(path)  # Created and removed before we got to it
+
+        changed, deleted = self.indexer.apply_batch(records, deletes)
+        self.processed += len(batch)
+        self.last_batch = len(batch)
+        if changed or deleted:
+            logger.info(f"Batch of {len(batch)} events: {changed} indexed, {deleted} removed")
+
+    def stop(self):
+        """Drain what's queued, then stop the worker thread"""
+        self.queue.close()
+        self._drainer.join()
+        self.pool.shutdown()
+
+    def queue_stats(self):
+        return {
+            **self.queue.stats(),
+            'processed': self.processed,
+            'last_batch': self.last_batch
+        }
 
     def on_created(self, event):
         if event.is_directory:
             return
-        if self._should_process(event.src_path):
-            if self.indexer.index_file(event.src_path):
-                logger.info(f"Indexed new file: {event.src_path}")
+        self._enqueue(event.src_path, 'index')
 
     def on_modified(self, event):
         if event.is_directory:
             return
-        if self._should_process(event.src_path):
-            if self.indexer.index_file(event.src_path):
-                logger.info(f"Re-indexed modified file: {event.src_path}")
+        self._enqueue(event.src_path, 'index')
 
     def on_deleted(self, event):
         if event.is_directory:
             return
-        if self.indexer.delete_file(event.src_path):
-            logger.info(f"Removed deleted file: {event.src_path}")
+        self._enqueue(event.src_path, 'delete')
 
     def on_moved(self, event):
         if event.is_directory:
             return
-        self.indexer.delete_file(event.src_path)
-        if self.indexer.index_file(event.dest_path):
-            logger.info(f"Moved file: {event.src_path} -> {event.dest_path}")
+        self._enqueue(event.src_path, 'delete')
+        self._enqueue(event.dest_path, 'index')
 
-def save_status(indexer, running=True):
+def save_status(indexer, running=True, handler=None):
     """Save daemon status to file"""
     status = indexer.get_stats()
     status['running'] = running
     status['pid'] = os.getpid()
     status['updated'] = datetime.now().isoformat()
+    if handler is not None:
+        status['queue'] = handler.queue_stats()
 
     with open(STATUS_FILE, 'w') as f:
         json.dump(status, f, indent=2)
@@ -285,6 +542,10 @@ def show_status():
     print(f"Files Deleted: {status.get('files_deleted', 0)}")
     print(f"Errors: {status.get('errors', 0)}")
     print(f"Last Vacuum: {status.get('last_vacuum', 'Never')}")
+    queue_status = status.get('queue')
+    if queue_status:
+        print(f"Queue Depth: {queue_status.get('depth', 0)} (lag {queue_status.get('lag_seconds', 0)}s)")
+        print(f"Events Processed: {queue_status.get('processed', 0)} ({queue_status.get('coalesced', 0)} coalesced, {queue_status.get('dropped', 0)} dropped)")
     print(f"Last Update: {status.get('updated', 'N/A')}")
     print(f"Database: {status.get('db_path', 'N/A')}")
     print("=" * 32)
@@ -296,10 +557,6 @@ def run_daemon():
     # Initialize indexer
     indexer = CyclotronIndexer()
 
-    # Do initial vacuum
-    logger.info("Performing initial vacuum...")
-    indexer.vacuum()
-
     # Setup watchdog
     handler = CyclotronHandler(indexer)
     observer = Observer()
@@ -310,21 +567,26 @@ def run_daemon():
             observer.schedule(handler, directory, recursive=True)
             logger.info(f"Watching: {directory}")
 
-    # Start watching
+    # Start watching first - events queue up while the initial vacuum runs
     observer.start()
+
+    # Do initial vacuum
+    logger.info("Performing initial vacuum...")
+    indexer.vacuum()
     logger.info("Daemon running - watching for changes...")
 
     try:
         while True:
-            save_status(indexer, running=True)
+            save_status(indexer, running=True, handler=handler)
             time.sleep(30)  # Update status every 30 seconds
 
     except KeyboardInterrupt:
         logger.info("Stopping daemon...")
         observer.stop()
-        save_status(indexer, running=False)
 
     observer.join()
+    handler.stop()
+    save_status(indexer, running=False, handler=handler)
     logger.info("Daemon stopped")
 
 if __name__ == '__main__':
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+CYCLOTRON SCHEMA - Shared storage layout for cyclotron.db
+=========================================================
+
+`documents` is a regular table keyed by path: one row per file holding the
+metadata (hash, mtime, size, type) and the single stored copy of the content.
+`knowledge` is an external-content FTS5 index over it (content='documents'),
+kept in sync by triggers, so FTS rowid == documents.id.
+
+Path lookups (change detection, delete, file fetch) hit the UNIQUE index on
+documents.path instead of scanning the FTS table.
+
+Each document is also split into overlapping passages along markdown headers
+and code fences. `chunks` stores only their offsets into documents.content;
+`passages` is an FTS5 index whose content table is a view slicing the text
+back out, so passage search doesn't store the content a second time.
+
+Writers bump index_meta['generation'] in every committed batch so readers
+can tell when cached query results are stale. `changes` is an append-only
+feed of (seq, doc_id, op) written by triggers, which incremental consumers
+such as SEMANTIC_VECTOR_ENGINE replay from their last seen seq.
+"""
+
+import re
+import sqlite3
+
+DOCUMENT_COLUMNS = ('path', 'name', 'type', 'content', 'preview', 'modified', 'hash', 'mtime', 'size')
+
+# Passage sizing (characters)
+PASSAGE_MAX = 1500
+PASSAGE_OVERLAP = 200
+
+CHANGE_FEED_KEEP = 200_000  # change rows retained; older consumers rebuild
+
+HEADER_RE = re.compile(r'^#{1,6}\s+(.*)$')
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE,
+        name TEXT,
+        type TEXT,
+        content TEXT,
+        preview TEXT,
+        modified TEXT,
+        hash TEXT,
+        mtime REAL,
+        size INTEGER
+    );
+
+    CREATE TABLE IF NOT EXISTS index_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS documents_type ON documents(type);
+    CREATE INDEX IF NOT EXISTS documents_modified ON documents(modified);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS knowledge USING fts5(
+        path, name, type, content,
+        content='documents',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+        INSERT INTO knowledge (rowid, path, name, type, content)
+        VALUES (new.id, new.path, new.name, new.type, new.content);
+    END;
+
+    CREATE TABLE IF NOT EXISTS chunks (
+        id INTEGER PRIMARY KEY,
+        doc_id INTEGER NOT NULL,
+        seq INTEGER,
+        start INTEGER,
+        end INTEGER,
+        heading TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS chunks_doc ON chunks(doc_id);
+
+    CREATE VIEW IF NOT EXISTS chunk_text AS
+        SELECT c.id, c.heading, substr(d.content, c.start + 1, c.end - c.start) AS text
+        FROM chunks c JOIN documents d ON d.id = c.doc_id;
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+        heading, text,
+        content='chunk_text',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+        INSERT INTO passages (rowid, heading, text)
+        SELECT new.id, new.heading, substr(d.content, new.start + 1, new.end - new.start)
+        FROM documents d WHERE d.id = new.doc_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+        INSERT INTO knowledge (knowledge, rowid, path, name, type, content)
+        VALUES ('delete', old.id, old.path, old.name, old.type, old.content);
+        INSERT INTO passages (passages, rowid, heading, text)
+        SELECT 'delete', c.id, c.heading, substr(old.content, c.start + 1, c.end - c.start)
+        FROM chunks c WHERE c.doc_id = old.id;
+        DELETE FROM chunks WHERE doc_id = old.id;
+    END;
+
+    CREATE TABLE IF NOT EXISTS changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        doc_id INTEGER NOT NULL,
+        op TEXT NOT NULL
+    );
+
+    CREATE TRIGGER IF NOT EXISTS documents_feed_ai AFTER INSERT ON documents BEGIN
+        INSERT INTO changes (doc_id, op) VALUES (new.id, 'upsert');
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_feed_au AFTER UPDATE OF content ON documents BEGIN
+        INSERT INTO changes (doc_id, op) VALUES (new.id, 'upsert');
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS documents_feed_ad AFTER DELETE ON documents BEGIN
+        INSERT INTO changes (doc_id, op) VALUES (old.id, 'delete');
+    END;
+
+    -- Passages are rebuilt by upsert_document after the new content lands
+    CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF path, name, type, content ON documents BEGIN
+        INSERT INTO knowledge (knowledge, rowid, path, name, type, content)
+        VALUES ('delete', old.id, old.path, old.name, old.type, old.content);
+        INSERT INTO knowledge (rowid, path, name, type, content)
+        VALUES (new.id, new.path, new.name, new.type, new.content);
+        INSERT INTO passages (passages, rowid, heading, text)
+        SELECT 'delete', c.id, c.heading, substr(old.content, c.start + 1, c.end - c.start)
+        FROM chunks c WHERE c.doc_id = old.id;
+        DELETE FROM chunks WHERE doc_id = old.id;
+    END;
+'''
+
+def _table_sql(cursor, name):
+    cursor.execute("SELECT sql FROM sqlite_master WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def init_schema(conn):
+    """Create documents/knowledge, migrating a legacy standalone FTS table"""
+    cursor = conn.cursor()
+
+    # WAL lets the search API's read-only connections run alongside writers
+    cursor.execute('PRAGMA journal_mode = WAL')
+
+    # Legacy layout: `knowledge` was a self-contained FTS5 table with
+    # preview/modified/hash columns and no path index
+    legacy_sql = _table_sql(cursor, 'knowledge')
+    legacy = legacy_sql is not None and "content='documents'" not in legacy_sql
+    if legacy:
+        cursor.execute('ALTER TABLE knowledge RENAME TO knowledge_legacy')
+
+    new_passages = _table_sql(cursor, 'chunks') is None
+    if new_passages:
+        # Older document triggers don't maintain passages; recreate them
+        cursor.execute('DROP TRIGGER IF EXISTS documents_ad')
+        cursor.execute('DROP TRIGGER IF EXISTS documents_au')
+
+    cursor.executescript(SCHEMA)
+
+    if legacy:
+        # Triggers populate the new FTS index as rows land in documents
+        cursor.execute('''
+            INSERT OR IGNORE INTO documents (path, name, type, content, preview, modified, hash)
+            SELECT path, name, type, content, preview, modified, hash FROM knowledge_legacy
+        ''')
+        cursor.execute('DROP TABLE knowledge_legacy')
+
+    # Documents indexed before passages existed
+    if new_passages:
+        reader = conn.cursor()
+        reader.execute('SELECT id, content FROM documents')
+        for doc_id, content in reader:
+            insert_chunks(cursor, doc_id, content or '')
+
+    conn.commit()
+
+def _sections(content):
+    """Split text into (start, end, heading) at markdown headers and code fences"""
+    sections = []
+    start = 0
+    heading = ''
+    in_fence = False
+    pos = 0
+
+    for line in content.splitlines(keepends=True):
+        fence = FENCE_RE.match(line)
+        header = None if in_fence else HEADER_RE.match(line)
+
+        if header or (fence and not in_fence):
+            # New section starts at this line
+            if pos > start:
+                sections.append((start, pos, heading))
+            start = pos
+            if header:
+                heading = header.group(1).strip()
+
+        pos += len(line)
+
+        if fence:
+            in_fence = not in_fence
+            if not in_fence:
+                # Code block closes: it is a section of its own
+                sections.append((start, pos, heading))
+                start = pos
+
+    if pos > start:
+        sections.append((start, pos, heading))
+    return sections
+
+def split_passages(content, max_chars=PASSAGE_MAX, overlap=PASSAGE_OVERLAP):
+    """Passages as (start, end, heading) character offsets into content
+
+    Sections longer than max_chars are cut into windows that overlap by
+    `overlap` characters, breaking at a newline when one is close.
+    """
+    passages = []
+    for start, end, heading in _sections(content):
+        if not content[start:end].strip():
+            continue
+        while end - start > max_chars:
+            cut = content.rfind('\n', start + max_chars // 2, start + max_chars)
+            cut = cut + 1 if cut != -1 else start + max_chars
+            passages.append((start, cut, heading))
+            start = max(cut - overlap, start + 1)
+        passages.append((start, end, heading))
+    return passages
+
+def insert_chunks(cursor, doc_id, content):
+    """Index the passages of one document (triggers feed the passages FTS)"""
+    cursor.executemany(
+        'INSERT INTO chunks (doc_id, seq, start, end, heading) VALUES (?, ?, ?, ?, ?)',
+        [(doc_id, seq, start, end, heading)
+         for seq, (start, end, heading) in enumerate(split_passages(content))]
+    )
+
+def bump_generation(cursor):
+    """Advance the index generation; call inside the writing transaction"""
+    cursor.execute('''
+        INSERT INTO index_meta (key, value) VALUES ('generation', '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+    ''')
+
+def get_generation(cursor):
+    """Current index generation (0 if never written)"""
+    cursor.execute("SELECT value FROM index_meta WHERE key = 'generation'")
+    row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+def prune_changes(cursor, keep=CHANGE_FEED_KEEP):
+    """Trim the change feed to its newest `keep` rows"""
+    cursor.execute('''
+        DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?
+    ''', (keep,))
+
+def get_hash(cursor, path):
+    """Indexed content hash for path, or None"""
+    cursor.execute('SELECT hash FROM documents WHERE path = ?', (path,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def upsert_document(cursor, record):
+    """Insert or replace the document at record['path']; caller commits"""
+    values = tuple(record.get(col) for col in DOCUMENT_COLUMNS)
+    cursor.execute('''
+        INSERT INTO documents (path, name, type, content, preview, modified, hash, mtime, size)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            name = excluded.name,
+            type = excluded.type,
+            content = excluded.content,
+            preview = excluded.preview,
+            modified = excluded.modified,
+            hash = excluded.hash,
+            mtime = excluded.mtime,
+            size = excluded.size
+    ''', values)
+
+    cursor.execute('SELECT id FROM documents WHERE path = ?', (record['path'],))
+    insert_chunks(cursor, cursor.fetchone()[0], record.get('content') or '')
+
+def touch_document(cursor, path, mtime, size):
+    """Record new stat info for an unchanged document (no FTS work)"""
+    cursor.execute('UPDATE documents SET mtime = ?, size = ? WHERE path = ?', (mtime, size, path))
+
+def delete_document(cursor, path):
+    """Remove a document and its FTS entry; returns True if a row was deleted"""
+    cursor.execute('DELETE FROM documents WHERE path = ?', (path,))
+    return cursor.rowcount > 0
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) != 2:
+        print("Usage: python CYCLOTRON_SCHEMA.py <cyclotron.db>   # create/migrate schema")
+        sys.exit(1)
+    conn = sqlite3.connect(sys.argv[1])
+    init_schema(conn)
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM documents')
+    print(f"Schema ready: {cursor.fetchone()[0]} documents")
+    conn.close()
@@ -5,6 +5,8 @@ Cyclotron Search API - Query the knowledge base
 
 import json
 import re
+import time
+import threading
 from pathlib import Path
 from flask import Flask, request, jsonify
 from flask_cors import CORS
@@ -13,36 +15,76 @@ app = Flask(__name__)
 CORS(app)
 
 ATOMS_DIR = Path.home() / '100X_DEPLOYMENT' / '.cyclotron_atoms'
-
-def load_index():
-    """Load the current index"""
-    index_file = ATOMS_DIR / 'index.json'
-    if not index_file.exists():
-        return None
-    with open(index_file) as f:
-        return json.load(f)
-
-def search_atoms(query, atom_type=None, limit=50):
-    """Search atoms by query string"""
-    index = load_index()
-    if not index:
-        return []
-
-    atoms = index.get('atoms', [])
-    results = []
-
-    query_lower = query.lower()
-
-    for atom in atoms:
-        # Search in name and path
-        name = atom.get('name', '').lower()
-        path = atom.get('path', '').lower()
-
-        if query_lower in name or query_lower in path:
-            # Filter by type if specified
-            if atom_type and atom.get('type') != atom_type:
+RELOAD_INTERVAL = 2.0  # seconds between index.json mtime/size checks
+
+def _trigrams(text):
+    """All 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class IndexSnapshot:
+    """Immutable view of index.json with precomputed lookup structures"""
+
+    def __init__(self, index, signature=None):
+        self.signature = signature
+        self.total_atoms = index.get('total_atoms', 0)
+        self.last_updated = index.get('last_updated', 0)
+        self.atoms_by_type = index.get('atoms_by_type', {})
+        self.atoms = index.get('atoms', [])
+
+        # Lowercased search keys, in index order
+        self.names = [atom.get('name', '').lower() for atom in self.atoms]
+        self.paths = [atom.get('path', '').lower() for atom in self.atoms]
+
+        # type -> ascending atom positions
+        self.by_type = {}
+        for pos, atom in enumerate(self.atoms):
+            self.by_type.setdefault(atom.get('type'), []).append(pos)
+
+        # Positions ordered newest first for /api/recent
+        self.recent = sorted(
+            range(len(self.atoms)),
+            key=lambda pos: self.atoms[pos].get('modified', 0) or 0,
+            reverse=True
+        )
+
+        # trigram -> set of atom positions whose name or path contains it
+        self.trigrams = {}
+        for pos in range(len(self.atoms)):
+            for gram in _trigrams(self.names[pos]) | _trigrams(self.paths[pos]):
+                self.trigrams.setdefault(gram, set()).add(pos)
+
+    def _matches(self, pos, query_lower):
+        return query_lower in self.names[pos] or query_lower in self.paths[pos]
+
+    def _candidates(self, query_lower, atom_type):
+        """Atom positions worth checking, in index order"""
+        if len(query_lower) >= 3:
+            postings = []
+            for gram in _trigrams(query_lower):
+                posting = self.trigrams.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            found = set(postings[0]).intersection(*postings[1:])
+            if atom_type:
+                found = [pos for pos in found if self.atoms[pos].get('type') == atom_type]
+            return sorted(found)
+
+        if atom_type:
+            return self.by_type.get(atom_type, [])
+        return range(len(self.atoms))
+
+    def search(self, query, atom_type=None, limit=50):
+        """Substring search over name and path, first `limit` hits in index order"""
+        query_lower = query.lower()
+        results = []
+
+        for pos in self._candidates(query_lower, atom_type):
+            if not self._matches(pos, query_lower):
                 continue
 
+            atom = self.atoms[pos]
             results.append({
                 'name': atom.get('name'),
                 'path': atom.get('path'),
@@ -54,7 +96,81 @@ def search_atoms(query, atom_type=None, limit=50):
             if len(results) >= limit:
                 break
 
-    return results
+        return results
+
+    def most_recent(self, limit=20):
+        """Most recently modified atoms"""
+        return [self.atoms[pos] for pos in self.recent[:limit]]
+
+class AtomIndex:
+    """Resident index that reloads when index.json changes on disk"""
+
+    def __init__(self, index_file=None, interval=RELOAD_INTERVAL):
+        self.index_file = Path(index_file) if index_file else ATOMS_DIR / 'index.json'
+        self.interval = interval
+        self.snapshot = None
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def _signature(self):
+        try:
+            st = self.index_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self):
+        """Rebuild the snapshot if the file changed; returns True on reload"""
+        with self._lock:
+            signature = self._signature()
+            current = self.snapshot
+            if current is not None and current.signature == signature:
+                return False
+
+            if signature is None:
+                self.snapshot = None
+                return current is not None
+
+            try:
+                with open(self.index_file) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                # Partially written file - keep serving the previous snapshot
+                return False
+
+            # Single reference swap: readers see either the old or new snapshot
+            self.snapshot = IndexSnapshot(index, signature)
+            return True
+
+    def _watch(self):
+        while True:
+            self.refresh()
+            time.sleep(self.interval)
+
+    def start(self):
+        """Load now and keep watching for changes in a daemon thread"""
+        self.refresh()
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, daemon=True)
+            self._watcher.start()
+
+    def get(self):
+        """Current snapshot (None if there is no index)"""
+        # One stat per request keeps the snapshot fresh however the module
+        # was launched (WSGI import, flask run, tests) - no watcher needed
+        current = self.snapshot
+        if current is None or current.signature != self._signature():
+            self.refresh()
+        return self.snapshot
+
+atom_index = AtomIndex()
+
+def search_atoms(query, atom_type=None, limit=50):
+    """Search atoms by query string"""
+    snapshot = atom_index.get()
+    if not snapshot:
+        return []
+    return snapshot.search(query, atom_type, limit)
 
 @app.route('/api/search', methods=['GET'])
 def api_search():
@@ -76,40 +192,36 @@ def api_search():
 @app.route('/api/stats', methods=['GET'])
 def api_stats():
     """Get index statistics"""
-    index = load_index()
-    if not index:
+    snapshot = atom_index.get()
+    if not snapshot:
         return jsonify({'error': 'Index not found'}), 404
 
     return jsonify({
-        'total_atoms': index.get('total_atoms', 0),
-        'last_updated': index.get('last_updated', 0),
-        'atoms_by_type': index.get('atoms_by_type', {})
+        'total_atoms': snapshot.total_atoms,
+        'last_updated': snapshot.last_updated,
+        'atoms_by_type': snapshot.atoms_by_type
     })
 
 @app.route('/api/types', methods=['GET'])
 def api_types():
     """Get all atom types"""
-    index = load_index()
-    if not index:
+    snapshot = atom_index.get()
+    if not snapshot:
         return jsonify({'error': 'Index not found'}), 404
 
     return jsonify({
-        'types': list(index.get('atoms_by_type', {}).keys())
+        'types': list(snapshot.atoms_by_type.keys())
     })
 
 @app.route('/api/recent', methods=['GET'])
 def api_recent():
     """Get most recently modified atoms"""
     limit = int(request.args.get('limit', 20))
-    index = load_index()
-    if not index:
+    snapshot = atom_index.get()
+    if not snapshot:
         return jsonify({'error': 'Index not found'}), 404
 
-    atoms = sorted(
-        index.get('atoms', []),
-        key=lambda x: x.get('modified', 0),
-        reverse=True
-    )[:limit]
+    atoms = snapshot.most_recent(limit)
 
     return jsonify({
         'count': len(atoms),
@@ -123,4 +235,5 @@ if __name__ == '__main__':
     print("  /api/stats")
     print("  /api/types")
     print("  /api/recent?limit=<n>")
+    atom_index.start()
     app.run(host='0.0.0.0', port=6668, debug=True)
@@ -7,21 +7,370 @@ Searches the actual CONTENT of files, not just filenames.
 Returns relevant passages with context.
 """
 
+import os
+import json
+import base64
+import queue
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+from CYCLOTRON_SCHEMA import get_generation
 
 app = Flask(__name__)
 CORS(app)
 
 DB_PATH = Path.home() / '100X_DEPLOYMENT' / '.cyclotron_atoms' / 'cyclotron.db'
 
+# Server tuning (override via environment)
+WORKERS = int(os.environ.get('CYCLOTRON_SEARCH_WORKERS', 8))
+PORT = int(os.environ.get('CYCLOTRON_SEARCH_PORT', 6669))
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_KIB = 64 * 1024
+STATEMENT_CACHE = 128
+QUERY_CACHE_SIZE = 1024  # cached result lists
+QUERY_CACHE_TTL = 300  # seconds
+MAX_PAGE_SIZE = 1000  # JSON responses; NDJSON streams honour any limit
+PAGE_BATCH = 200  # rows fetched per keyset query
+
+class ConnectionPool:
+    """Read-only SQLite connections shared across request threads
+
+    Each connection keeps its own prepared-statement cache, so reusing
+    connections also reuses compiled queries. Writers (the indexers) put
+    the database in WAL mode, so readers never block them.
+    """
+
+    def __init__(self, db_path, size=WORKERS):
+        self.db_path = db_path
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            f"file:{self.db_path.as_posix()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE
+        )
+        conn.execute('PRAGMA query_only = ON')
+        conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+        conn.execute(f'PRAGMA cache_size = -{CACHE_KIB}')
+        return conn
+
+    def acquire(self):
+        """Idle connection, a new one while under size, else wait for a release"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            if self.created < self.size:
+                conn = self._connect()
+                self.created += 1
+                return conn
+        return self.idle.get()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self.idle.put(conn)
+
+class QueryCache:
+    """LRU + TTL cache of result lists, invalidated by index generation
+
+    Entries are only valid for the generation they were computed at; the
+    first lookup that sees a newer generation drops everything.
+    """
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (stored_at, results)
+        self.generation = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _sync(self, generation):
+        if generation != self.generation:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.generation = generation
+
+    def get(self, key, generation):
+        with self.lock:
+            self._sync(generation)
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, generation, results):
+        with self.lock:
+            self._sync(generation)
+            self.entries[key] = (time.time(), results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'generation': self.generation,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+def normalize_query(query):
+    """Cache key form of a query: FTS5 operators are case-sensitive, so only whitespace is folded"""
+    return ' '.join(query.split())
+
+def encode_cursor(*key):
+    """Opaque keyset cursor for the row after which the next page starts"""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError on a malformed token
+
+    A valid key is [sort value, rowid]: the sort value is a bm25 score or a
+    modified timestamp (number or string), the rowid an integer.
+    """
+    if not token:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if (not isinstance(key, list) or len(key) != 2
+            or isinstance(key[0], bool) or not isinstance(key[0], (int, float, str))
+            or isinstance(key[1], bool) or not isinstance(key[1], int)):
+        raise ValueError('Invalid cursor')
+    return key
+
+def wants_ndjson():
+    """Client asked for newline-delimited JSON streaming"""
+    return (request.args.get('format') == 'ndjson'
+            or 'application/x-ndjson' in request.headers.get('Accept', ''))
+
+def ndjson_response(conn, rows, tail):
+    """Stream rows as NDJSON, then one trailing object from tail(); releases conn when done"""
+    def generate():
+        try:
+            for row in rows:
+                yield json.dumps(row) + '\n'
+            yield json.dumps(tail()) + '\n'
+        finally:
+            release_db(conn)
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def iter_search(cursor, query, file_type, limit, after=None):
+    """Yield ((score, rowid), result) in rank order, PAGE_BATCH rows per query
+
+    Ranking and keyset filtering only touch rowid/bm25; snippets are built
+    afterwards for the rows actually returned. Every batch re-ranks the full
+    match set - deliberate, so an NDJSON stream of any length holds at most
+    PAGE_BATCH rows. All queries run in one read transaction, so the ranking
+    and detail queries see the same snapshot even while an indexer commits.
+    """
+    conn = cursor.connection
+    owns_txn = not conn.in_transaction
+    if owns_txn:
+        cursor.execute('BEGIN')
+    try:
+        yield from _iter_search(cursor, query, file_type, limit, after)
+    finally:
+        if owns_txn and conn.in_transaction:
+            conn.commit()
+
+def _iter_search(cursor, query, file_type, limit, after):
+    type_join = 'JOIN documents d ON d.id = knowledge.rowid' if file_type else ''
+    type_filter = 'AND d.type = ?' if file_type else ''
+
+    remaining = limit
+    while remaining > 0:
+        batch = min(remaining, PAGE_BATCH)
+        params = [query] + ([file_type] if file_type else [])
+        keyset = ''
+        if after:
+            keyset = 'WHERE score > ? OR (score = ? AND id > ?)'
+            params += [after[0], after[0], after[1]]
+
+        cursor.execute(f'''
+            SELECT id, score FROM (
+                SELECT knowledge.rowid AS id, bm25(knowledge) AS score
+                FROM knowledge
+                {type_join}
+                WHERE knowledge MATCH ? {type_filter}
+            )
+            {keyset}
+            ORDER BY score, id
+            LIMIT ?
+        ''', params + [batch])
+        page = cursor.fetchall()
+        if not page:
+            return
+
+        placeholders = ','.join('?' * len(page))
+        cursor.execute(f'''
+            SELECT
+                d.id,
+                d.path,
+                d.name,
+                d.type,
+                snippet(knowledge, 3, '**', '**', '...', 64) as snippet,
+                d.modified
+            FROM knowledge
+            JOIN documents d ON d.id = knowledge.rowid
+            WHERE knowledge MATCH ? AND knowledge.rowid IN ({placeholders})
+        ''', [query] + [row[0] for row in page])
+        details = {row[0]: row for row in cursor.fetchall()}
+
+        for rowid, score in page:
+            row = details[rowid]
+            yield (score, rowid), {
+                'path': row[1],
+                'name': row[2],
+                'type': row[3],
+                'snippet': row[4],
+                'modified': row[5],
+                'score': round(abs(score), 3)
+            }
+
+        if len(page) < batch:
+            return
+        remaining -= len(page)
+        after = (page[-1][1], page[-1][0])
+
+def iter_recent(cursor, limit, after=None):
+    """Yield ((modified, id), file) newest first, PAGE_BATCH rows per query"""
+    remaining = limit
+    while remaining > 0:
+        batch = min(remaining, PAGE_BATCH)
+        if after:
+            cursor.execute('''
+                SELECT id, path, name, type, preview, modified
+                FROM documents
+                WHERE modified < ? OR (modified = ? AND id < ?)
+                ORDER BY modified DESC, id DESC
+                LIMIT ?
+            ''', (after[0], after[0], after[1], batch))
+        else:
+            cursor.execute('''
+                SELECT id, path, name, type, preview, modified
+                FROM documents
+                ORDER BY modified DESC, id DESC
+                LIMIT ?
+            ''', (batch,))
+        page = cursor.fetchall()
+
+        for row in page:
+            yield (row[5], row[0]), {
+                'path': row[1],
+                'name': row[2],
+                'type': row[3],
+                'preview': (row[4] or '')[:200],
+                'modified': row[5]
+            }
+
+        if len(page) < batch:
+            return
+        remaining -= len(page)
+        after = (page[-1][5], page[-1][0])
+
+def rank_passages(cursor, query, limit):
+    """Best-matching passages, at most one per overlapping region of a file
+
+    Ranks on rowid/bm25 over the passage index, then builds snippets only for
+    the winners. Overlapping windows of the same file collapse to the best one.
+    """
+    cursor.execute('''
+        SELECT c.id, c.doc_id, c.start, c.end, bm25(passages) AS score
+        FROM passages
+        JOIN chunks c ON c.id = passages.rowid
+        WHERE passages MATCH ?
+        ORDER BY score
+        LIMIT ?
+    ''', (query, limit * 3))
+
+    picked = []
+    for chunk_id, doc_id, start, end, score in cursor.fetchall():
+        if any(p[1] == doc_id and start < p[3] and p[2] < end for p in picked):
+            continue
+        picked.append((chunk_id, doc_id, start, end, score))
+        if len(picked) == limit:
+            break
+    if not picked:
+        return []
+
+    placeholders = ','.join('?' * len(picked))
+    cursor.execute(f'''
+        SELECT
+            passages.rowid,
+            d.path,
+            d.name,
+            c.heading,
+            snippet(passages, 1, '>>>', '<<<', '...', 64) as snippet
+        FROM passages
+        JOIN chunks c ON c.id = passages.rowid
+        JOIN documents d ON d.id = c.doc_id
+        WHERE passages MATCH ? AND passages.rowid IN ({placeholders})
+    ''', [query] + [p[0] for p in picked])
+    details = {row[0]: row for row in cursor.fetchall()}
+
+    results = []
+    for chunk_id, _, start, end, score in picked:
+        row = details[chunk_id]
+        results.append({
+            'source': row[2],
+            'path': row[1],
+            'heading': row[3],
+            'answer': row[4],
+            'offset': start,
+            'length': end - start,
+            'relevance': round(abs(score), 3)
+        })
+    return results
+
+def paginate(rows, limit):
+    """Collect (key, item) rows into a list plus the cursor for the next page"""
+    items = []
+    last_key = None
+    for key, item in rows:
+        items.append(item)
+        last_key = key
+    next_cursor = encode_cursor(*last_key) if last_key is not None and len(items) == limit else None
+    return items, next_cursor
+
+pool = ConnectionPool(DB_PATH)
+query_cache = QueryCache()
+
 def get_db():
-    """Get database connection"""
+    """Get a pooled read-only database connection (return it with release_db)"""
     if not DB_PATH.exists():
         return None
-    return sqlite3.connect(str(DB_PATH))
+    return pool.acquire()
+
+def release_db(conn):
+    """Return a connection from get_db() to the pool"""
+    pool.release(conn)
 
 @app.route('/api/search', methods=['GET'])
 def api_search():
@@ -32,6 +381,8 @@ def api_search():
       q: search query (required)
       type: filter by file type
       limit: max results (default 20)
+      cursor: next_cursor from a previous page
+      format: 'ndjson' to stream one result per line
     """
     query = request.args.get('q', '')
     file_type = request.args.get('type', None)
@@ -40,71 +391,66 @@ def api_search():
     if not query:
         return jsonify({'error': 'Query required', 'hint': 'Use ?q=your+search+terms'}), 400
 
+    try:
+        after = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     conn = get_db()
     if not conn:
         return jsonify({'error': 'Database not found', 'hint': 'Run CYCLOTRON_CONTENT_INDEXER.py first'}), 404
 
     cursor = conn.cursor()
+    streaming = False
 
     try:
-        # Build query with optional type filter
-        if file_type:
-            cursor.execute('''
-                SELECT
-                    path,
-                    name,
-                    type,
-                    snippet(knowledge, 3, '**', '**', '...', 64) as snippet,
-                    modified,
-                    bm25(knowledge) as score
-                FROM knowledge
-                WHERE knowledge MATCH ? AND type = ?
-                ORDER BY score
-                LIMIT ?
-            ''', (query, file_type, limit))
-        else:
-            cursor.execute('''
-                SELECT
-                    path,
-                    name,
-                    type,
-                    snippet(knowledge, 3, '**', '**', '...', 64) as snippet,
-                    modified,
-                    bm25(knowledge) as score
-                FROM knowledge
-                WHERE knowledge MATCH ?
-                ORDER BY score
-                LIMIT ?
-            ''', (query, limit))
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'path': row[0],
-                'name': row[1],
-                'type': row[2],
-                'snippet': row[3],
-                'modified': row[4],
-                'score': round(abs(row[5]), 3)
-            })
+        if wants_ndjson():
+            rows = iter_search(cursor, query, file_type, limit, after)
+            state = {'count': 0, 'last': None}
+
+            def results():
+                for key, result in rows:
+                    state['count'] += 1
+                    state['last'] = key
+                    yield result
+
+            def tail():
+                full = state['last'] is not None and state['count'] == limit
+                return {'next_cursor': encode_cursor(*state['last']) if full else None}
+
+            streaming = True
+            return ndjson_response(conn, results(), tail)
+
+        generation = get_generation(cursor)
+        cache_key = ('search', normalize_query(query), file_type, limit, request.args.get('cursor'))
+        cached = query_cache.get(cache_key, generation)
+
+        if cached is None:
+            cached = paginate(iter_search(cursor, query, file_type, min(limit, MAX_PAGE_SIZE), after),
+                              min(limit, MAX_PAGE_SIZE))
+            query_cache.put(cache_key, generation, cached)
+        results, next_cursor = cached
 
         return jsonify({
             'query': query,
             'count': len(results),
-            'results': results
+            'results': results,
+            'next_cursor': next_cursor
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        if not streaming:
+            release_db(conn)
 
 @app.route('/api/ask', methods=['GET'])
 def api_ask():
     """
-    Natural language query - returns the most relevant knowledge
+    Natural language query - returns the most relevant passages
 
     This is for questions like "What do I know about manipulation immunity?"
+    Each answer carries offset/length for fetching the passage via /api/file.
     """
     question = request.args.get('q', '')
     limit = int(request.args.get('limit', 5))
@@ -125,26 +471,13 @@ def api_ask():
         terms = [w for w in question.lower().split() if w not in stopwords and len(w) > 2]
         search_query = ' OR '.join(terms) if terms else question
 
-        cursor.execute('''
-            SELECT
-                path,
-                name,
-                snippet(knowledge, 3, '>>>', '<<<', '...', 100) as snippet,
-                bm25(knowledge) as score
-            FROM knowledge
-            WHERE knowledge MATCH ?
-            ORDER BY score
-            LIMIT ?
-        ''', (search_query, limit))
+        generation = get_generation(cursor)
+        cache_key = ('ask', search_query, limit)
+        results = query_cache.get(cache_key, generation)
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'source': row[1],
-                'path': row[0],
-                'answer': row[2],
-                'relevance': round(abs(row[3]), 3)
-            })
+        if results is None:
+            results = rank_passages(cursor, search_query, limit)
+            query_cache.put(cache_key, generation, results)
 
         return jsonify({
             'question': question,
@@ -155,7 +488,7 @@ def api_ask():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        release_db(conn)
 
 @app.route('/api/stats', methods=['GET'])
 def api_stats():
@@ -174,7 +507,7 @@ def api_stats():
         # Get type breakdown
         cursor.execute('''
             SELECT type, COUNT(*)
-            FROM knowledge
+            FROM documents
             GROUP BY type
             ORDER BY COUNT(*) DESC
         ''')
@@ -185,57 +518,78 @@ def api_stats():
             'last_indexed': meta.get('last_indexed', 'Never'),
             'total_files': int(meta.get('total_files', 0)),
             'total_characters': int(meta.get('total_chars', 0)),
-            'files_by_type': types
+            'files_by_type': types,
+            'cache': query_cache.stats()
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        release_db(conn)
 
 @app.route('/api/recent', methods=['GET'])
 def api_recent():
-    """Get most recently modified files"""
+    """Get most recently modified files (paginate with cursor, stream with format=ndjson)"""
     limit = int(request.args.get('limit', 20))
 
+    try:
+        after = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     conn = get_db()
     if not conn:
         return jsonify({'error': 'Database not found'}), 404
 
     cursor = conn.cursor()
+    streaming = False
 
     try:
-        cursor.execute('''
-            SELECT path, name, type, preview, modified
-            FROM knowledge
-            ORDER BY modified DESC
-            LIMIT ?
-        ''', (limit,))
-
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'path': row[0],
-                'name': row[1],
-                'type': row[2],
-                'preview': row[3][:200],
-                'modified': row[4]
-            })
+        if wants_ndjson():
+            rows = iter_recent(cursor, limit, after)
+            state = {'count': 0, 'last': None}
+
+            def files():
+                for key, item in rows:
+                    state['count'] += 1
+                    state['last'] = key
+                    yield item
+
+            def tail():
+                full = state['last'] is not None and state['count'] == limit
+                return {'next_cursor': encode_cursor(*state['last']) if full else None}
+
+            streaming = True
+            return ndjson_response(conn, files(), tail)
+
+        limit = min(limit, MAX_PAGE_SIZE)
+        results, next_cursor = paginate(iter_recent(cursor, limit, after), limit)
 
         return jsonify({
             'count': len(results),
-            'files': results
+            'files': results,
+            'next_cursor': next_cursor
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        if not streaming:
+            release_db(conn)
 
 @app.route('/api/file', methods=['GET'])
 def api_file():
-    """Get full content of a specific file"""
+    """
+    Get content of a specific file
+
+    Query params:
+      path: indexed file path (required)
+      offset: first character to return (default 0)
+      length: number of characters (default: rest of file)
+    """
     filepath = request.args.get('path', '')
+    offset = max(0, int(request.args.get('offset', 0)))
+    length = request.args.get('length')
 
     if not filepath:
         return jsonify({'error': 'Path required'}), 400
@@ -247,27 +601,41 @@ def api_file():
     cursor = conn.cursor()
 
     try:
-        cursor.execute('''
-            SELECT name, type, content, modified
-            FROM knowledge
-            WHERE path = ?
-        ''', (filepath,))
+        # substr() slices inside SQLite so only the requested range reaches Python
+        if length is not None:
+            cursor.execute('''
+                SELECT name, type, substr(content, ? + 1, ?), modified, length(content)
+                FROM documents
+                WHERE path = ?
+            ''', (offset, max(0, int(length)), filepath))
+        else:
+            cursor.execute('''
+                SELECT name, type, substr(content, ? + 1), modified, length(content)
+                FROM documents
+                WHERE path = ?
+            ''', (offset, filepath))
 
         row = cursor.fetchone()
         if not row:
             return jsonify({'error': 'File not found in index'}), 404
 
+        content = row[2] or ''
+        end = offset + len(content)
         return jsonify({
             'name': row[0],
             'type': row[1],
-            'content': row[2],
-            'modified': row[3]
+            'content': content,
+            'modified': row[3],
+            'offset': offset,
+            'length': len(content),
+            'total_length': row[4],
+            'next_offset': end if end < row[4] else None
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        release_db(conn)
 
 @app.route('/api/health', methods=['GET'])
 def api_health():
@@ -275,7 +643,7 @@ def api_health():
     conn = get_db()
     db_exists = conn is not None
     if conn:
-        conn.close()
+        release_db(conn)
 
     return jsonify({
         'status': 'healthy' if db_exists else 'no database',
@@ -283,17 +651,28 @@ def api_health():
         'database_exists': db_exists
     })
 
+def serve(host='0.0.0.0', port=PORT, workers=WORKERS):
+    """Production entry point: waitress if installed, else threaded werkzeug"""
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        print(f"waitress not installed - using threaded Flask server on :{port}")
+        app.run(host=host, port=port, threaded=True)
+        return
+    print(f"Serving on :{port} with {workers} worker threads")
+    waitress_serve(app, host=host, port=port, threads=workers)
+
 if __name__ == '__main__':
     print("=" * 60)
     print("🌀 CYCLOTRON SEARCH V2 - Full Content Search")
     print("=" * 60)
     print()
     print("Endpoints:")
-    print("  /api/search?q=<query>     - Search file contents")
-    print("  /api/ask?q=<question>     - Ask a question")
+    print("  /api/search?q=<query>     - Search file contents (&cursor=, &format=ndjson)")
+    print("  /api/ask?q=<question>     - Ask a question (ranked passages)")
     print("  /api/stats                - Index statistics")
-    print("  /api/recent               - Recently modified")
-    print("  /api/file?path=<path>     - Get file content")
+    print("  /api/recent               - Recently modified (&cursor=, &format=ndjson)")
+    print("  /api/file?path=<path>     - Get file content (&offset=, &length=)")
     print("  /api/health               - Health check")
     print()
     print("Examples:")
@@ -301,4 +680,4 @@ if __name__ == '__main__':
     print("  /api/ask?q=What+do+I+know+about+Trinity")
     print()
 
-    app.run(host='0.0.0.0', port=6669, debug=True)
+    serve()
@@ -12,6 +12,10 @@ Endpoints:
 - GET /api/stats - Engine statistics
 - GET /health - Health check
 
+/api/semantic, /api/similar and /api/ask accept nprobe=N (IVF lists scanned,
+higher = better recall, slower) or exact=1 to scan every vector. A background
+thread syncs the vector store from the cyclotron.db change feed.
+
 Usage:
     python CYCLOTRON_SEMANTIC_API.py
 """
@@ -20,6 +24,8 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import sys
 import os
+import threading
+import time
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -32,13 +38,38 @@ CORS(app)
 # Initialize engine on startup
 print("Initializing Semantic API...")
 engine = None
+engine_lock = threading.Lock()
+SYNC_INTERVAL = 30  # seconds between change-feed syncs
+
+def sync_loop(eng):
+    """Keep the vector store current with the Cyclotron index"""
+    while True:
+        time.sleep(SYNC_INTERVAL)
+        try:
+            eng.sync()
+        except Exception as e:
+            print(f"Semantic sync failed: {e}")
 
 def get_engine():
     global engine
-    if engine is None:
-        engine = SemanticVectorEngine()
+    with engine_lock:
+        if engine is None:
+            engine = SemanticVectorEngine()
+            threading.Thread(target=sync_loop, args=(engine,), daemon=True).start()
     return engine
 
+def ann_args():
+    """Per-query recall/latency knobs for the IVF index; raises ValueError on a bad nprobe"""
+    nprobe = request.args.get('nprobe')
+    if nprobe:
+        if not nprobe.isdigit() or int(nprobe) < 1:
+            raise ValueError('nprobe must be an integer >= 1')
+        nprobe = int(nprobe)
+    return {
+        'nprobe': nprobe or None,
+        'exact': request.args.get('exact', '').lower() in ('1', 'true', 'yes')
+    }
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check"""
@@ -62,9 +93,14 @@ def semantic_search():
     if not query:
         return jsonify({'error': 'Query parameter q is required'}), 400
 
+    try:
+        knobs = ann_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         eng = get_engine()
-        results = eng.search(query, n_results=limit)
+        results = eng.search(query, n_results=limit, **knobs)
 
         return jsonify({
             'query': query,
@@ -83,15 +119,23 @@ def find_similar():
     if not path:
         return jsonify({'error': 'Parameter path is required'}), 400
 
+    try:
+        knobs = ann_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         eng = get_engine()
-        results = eng.find_similar(path, n_results=limit)
+        results = eng.find_similar(path, n_results=limit, **knobs)
 
         return jsonify({
             'source_file': path,
             'similar_files': results,
             'count': len(results)
         })
+    except KeyError as e:
+        # Path not in the vector store
+        return jsonify({'error': e.args[0] if e.args else str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -139,9 +183,14 @@ def ask_semantic():
     if not question:
         return jsonify({'error': 'Query parameter q is required'}), 400
 
+    try:
+        knobs = ann_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         eng = get_engine()
-        results = eng.search(question, n_results=limit)
+        results = eng.search(question, n_results=limit, **knobs)
 
         # Format as answers
         answers = []
@@ -7,12 +7,21 @@ Creates non-standard attack surface that hackers don't know.
 
 import hashlib
 import hmac
+import io
 import json
 import os
+import sqlite3
+import struct
+from datetime import datetime
 from math import sin, cos, pi
 from typing import Optional
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Domain frequencies based on harmonic series with golden ratio
 DOMAIN_FREQUENCIES = {
     "media": 1.0,
@@ -30,6 +39,99 @@ TIME_MODIFIERS = {
     "future": 1.5
 }
 
+# Scramble shift tables depend only on position and frequency, so the
+# first SHIFT_CACHE_MAX positions are cached per frequency
+SHIFT_CACHE_MAX = 4 * 1024 * 1024
+SCRAMBLE_BLOCK = 1024 * 1024
+_shift_tables = {}
+
+# Binary container (version 2): header, then fixed-size chunk records of
+# ciphertext + MAC. Each chunk has its own counter so any chunk can be
+# decrypted on its own.
+CONTAINER_MAGIC = b"HARM"
+CONTAINER_VERSION = 2
+CONTAINER_HEADER = struct.Struct(">4sBI16s")   # magic, version, chunk size, nonce
+CHUNK_SIZE = 1024 * 1024
+MAC_SIZE = 32
+
+
+def _shift(i: int, frequency: float) -> int:
+    """Scramble shift for one position (the reference definition)."""
+    return int((sin(i * frequency * 0.01) + 1) * 128) % 256
+
+
+def _compute_shifts(frequency: float, start: int, length: int) -> bytes:
+    """Shift table for positions start..start+length."""
+    if np is None:
+        return bytes(_shift(i, frequency) for i in range(start, start + length))
+
+    positions = np.arange(start, start + length, dtype=np.float64)
+    values = (np.sin(positions * frequency * 0.01) + 1) * 128
+    shifts = values.astype(np.int64) % 256
+
+    # np.sin may differ from libm in the last ulp; redo values sitting on an
+    # integer boundary with math.sin so ciphertexts stay byte-identical
+    for k in np.nonzero(np.abs(values - np.rint(values)) < 1e-6)[0]:
+        shifts[k] = _shift(start + int(k), frequency)
+
+    return shifts.astype(np.uint8).tobytes()
+
+
+def harmonic_shifts(frequency: float, length: int, start: int = 0) -> bytes:
+    """Scramble shifts for positions start..start+length, cached per frequency."""
+    end = start + length
+    if end > SHIFT_CACHE_MAX:
+        return _compute_shifts(frequency, start, length)
+
+    table = _shift_tables.get(frequency, b"")
+    if len(table) < end:
+        size = min(SHIFT_CACHE_MAX, max(end, 2 * len(table), 4096))
+        table = table + _compute_shifts(frequency, len(table), size - len(table))
+        _shift_tables[frequency] = table
+    return table[start:end]
+
+
+def xor_bytes(a: bytes, b: bytes) -> bytes:
+    """XOR two equal-length byte strings."""
+    if np is not None:
+        return np.bitwise_xor(np.frombuffer(a, np.uint8), np.frombuffer(b, np.uint8)).tobytes()
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def shift_bytes(data: bytes, frequency: float, sign: int = 1, start: int = 0) -> bytes:
+    """Add (sign=1) or subtract (sign=-1) the harmonic shifts mod 256."""
+    out = bytearray(len(data))
+    view = memoryview(data)
+
+    for offset in range(0, len(data), SCRAMBLE_BLOCK):
+        block = view[offset:offset + SCRAMBLE_BLOCK]
+        shifts = harmonic_shifts(frequency, len(block), start + offset)
+        if np is not None:
+            a = np.frombuffer(block, np.uint8)
+            b = np.frombuffer(shifts, np.uint8)
+            mixed = (a + b) if sign > 0 else (a - b)
+            out[offset:offset + len(block)] = mixed.tobytes()
+        else:
+            out[offset:offset + len(block)] = bytes(
+                (x + sign * s) & 0xFF for x, s in zip(block, shifts))
+
+    return bytes(out)
+
+
+def expand_key(key: bytes, iv: bytes, length: int, counter: int = 0) -> bytes:
+    """HMAC-SHA256 keystream over iv + 4-byte counter, starting at counter."""
+    base = hmac.new(key, digestmod=hashlib.sha256)
+    blocks = (length + 31) // 32
+    stream = bytearray(blocks * 32)
+
+    for n in range(blocks):
+        mac = base.copy()
+        mac.update(iv + (counter + n).to_bytes(4, 'big'))
+        stream[n * 32:n * 32 + 32] = mac.digest()
+
+    del stream[length:]
+    return bytes(stream)
+
 def derive_harmonic_key(master_key: bytes, domain: str, time_layer: str = "present") -> bytes:
     """
     Derive encryption key using domain harmonics.
@@ -81,6 +183,71 @@ def derive_cross_domain_key(master_key: bytes, domains: list, time_layer: str =
 
     return combined
 
+
+def _read_exact(f, size: int) -> bytes:
+    """Read up to size bytes, looping over short reads."""
+    parts = []
+    while size > 0:
+        part = f.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b"".join(parts)
+
+
+def _container_keys(master_key: bytes, domain: str, time_layer: str) -> tuple:
+    """Separate encryption and MAC keys for the binary container."""
+    key = derive_harmonic_key(master_key, domain, time_layer)
+    mac_key = hmac.new(key, b"harmonic-container-mac", hashlib.sha256).digest()
+    return key, mac_key
+
+
+class ContainerHeader:
+    """Parsed header of a version 2 binary container."""
+
+    def __init__(self, domain: str, time_layer: str, chunk_size: int, nonce: bytes):
+        self.domain = domain
+        self.time_layer = time_layer
+        self.chunk_size = chunk_size
+        self.nonce = nonce
+
+    def pack(self) -> bytes:
+        domain = self.domain.encode()
+        time_layer = self.time_layer.encode()
+        return (CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, self.chunk_size, self.nonce)
+                + bytes([len(domain)]) + domain + bytes([len(time_layer)]) + time_layer)
+
+    @classmethod
+    def read(cls, f) -> "ContainerHeader":
+        raw = _read_exact(f, CONTAINER_HEADER.size)
+        if len(raw) < CONTAINER_HEADER.size:
+            raise ValueError("Not a harmonic container (truncated header)")
+        magic, version, chunk_size, nonce = CONTAINER_HEADER.unpack(raw)
+        if magic != CONTAINER_MAGIC:
+            raise ValueError("Not a harmonic container (bad magic)")
+        if version != CONTAINER_VERSION:
+            raise ValueError(f"Unsupported container version {version}")
+        if not 0 < chunk_size <= SHIFT_CACHE_MAX:
+            raise ValueError(f"Invalid chunk size {chunk_size}")
+
+        fields = []
+        for _ in range(2):
+            size = _read_exact(f, 1)
+            value = _read_exact(f, size[0]) if size else b""
+            if not size or len(value) < size[0]:
+                raise ValueError("Not a harmonic container (truncated header)")
+            fields.append(value.decode())
+        return cls(fields[0], fields[1], chunk_size, nonce)
+
+    @property
+    def size(self) -> int:
+        return len(self.pack())
+
+    @property
+    def digest(self) -> bytes:
+        return hashlib.sha256(self.pack()).digest()
+
 class HarmonicEncryption:
     """Seven Domain Harmonic Encryption System."""
 
@@ -161,7 +328,7 @@ class HarmonicEncryption:
         """XOR-based encryption with key expansion."""
         # Expand key to match plaintext length
         key_stream = self._expand_key(key, iv, len(plaintext))
-        return bytes(p ^ k for p, k in zip(plaintext, key_stream))
+        return xor_bytes(plaintext, key_stream)
 
     def _xor_decrypt(self, ciphertext: bytes, key: bytes, iv: bytes) -> bytes:
         """XOR decryption (same as encryption)."""
@@ -169,40 +336,15 @@ class HarmonicEncryption:
 
     def _expand_key(self, key: bytes, iv: bytes, length: int) -> bytes:
         """Expand key to required length using HMAC."""
-        result = b""
-        counter = 0
-
-        while len(result) < length:
-            block = hmac.new(
-                key,
-                iv + counter.to_bytes(4, 'big'),
-                hashlib.sha256
-            ).digest()
-            result += block
-            counter += 1
-
-        return result[:length]
+        return expand_key(key, iv, length)
 
     def _harmonic_scramble(self, data: bytes, frequency: float) -> bytes:
         """Apply harmonic-based byte scrambling."""
-        result = bytearray(len(data))
-
-        for i, byte in enumerate(data):
-            # Position shift based on harmonic
-            shift = int((sin(i * frequency * 0.01) + 1) * 128) % 256
-            result[i] = (byte + shift) % 256
-
-        return bytes(result)
+        return shift_bytes(data, frequency, 1)
 
     def _harmonic_unscramble(self, data: bytes, frequency: float) -> bytes:
         """Reverse harmonic scrambling."""
-        result = bytearray(len(data))
-
-        for i, byte in enumerate(data):
-            shift = int((sin(i * frequency * 0.01) + 1) * 128) % 256
-            result[i] = (byte - shift) % 256
-
-        return bytes(result)
+        return shift_bytes(data, frequency, -1)
 
     def encrypt_string(self, text: str, domain: str, time_layer: str = "present") -> str:
         """Convenience method for string encryption."""
@@ -215,6 +357,128 @@ class HarmonicEncryption:
         plaintext = self.decrypt(encrypted)
         return plaintext.decode('utf-8')
 
+    def _seal_chunk(self, keys: tuple, header: ContainerHeader, index: int,
+                    data: bytes, final: bool) -> bytes:
+        """Encrypt one chunk and append its MAC."""
+        key, mac_key = keys
+        counter = index.to_bytes(8, 'big')
+        ciphertext = xor_bytes(data, expand_key(key, header.nonce + counter, len(data)))
+        ciphertext = shift_bytes(ciphertext, DOMAIN_FREQUENCIES.get(header.domain, 1.0))
+        mac = hmac.new(mac_key, header.digest + counter + bytes([final]) + ciphertext,
+                       hashlib.sha256).digest()
+        return ciphertext + mac
+
+    def _open_chunk(self, keys: tuple, header: ContainerHeader, index: int,
+                    record: bytes, final: bool) -> bytes:
+        """Verify one chunk record and return its plaintext."""
+        key, mac_key = keys
+        if len(record) < MAC_SIZE:
+            raise ValueError(f"Chunk {index} is truncated")
+        counter = index.to_bytes(8, 'big')
+        ciphertext, mac = record[:-MAC_SIZE], record[-MAC_SIZE:]
+        expected = hmac.new(mac_key, header.digest + counter + bytes([final]) + ciphertext,
+                            hashlib.sha256).digest()
+        if not hmac.compare_digest(mac, expected):
+            raise ValueError(f"Chunk {index} failed authentication")
+        data = shift_bytes(ciphertext, DOMAIN_FREQUENCIES.get(header.domain, 1.0), -1)
+        return xor_bytes(data, expand_key(key, header.nonce + counter, len(data)))
+
+    def encrypt_stream(self, src, dst, domain: str, time_layer: str = "present",
+                       chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Encrypt a binary stream into the version 2 container format.
+        Memory use is bounded by two chunks. Returns the number of chunks.
+        """
+        if not 0 < chunk_size <= SHIFT_CACHE_MAX:
+            raise ValueError(f"Invalid chunk size {chunk_size}")
+        header = ContainerHeader(domain.lower(), time_layer.lower(), chunk_size, os.urandom(16))
+        keys = _container_keys(self.master_key, header.domain, header.time_layer)
+        dst.write(header.pack())
+
+        index = 0
+        chunk = _read_exact(src, chunk_size)
+        while True:
+            following = _read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+            final = not following
+            dst.write(self._seal_chunk(keys, header, index, chunk, final))
+            index += 1
+            if final:
+                return index
+            chunk = following
+
+    def decrypt_stream(self, src, dst) -> int:
+        """Decrypt a version 2 container stream. Returns the number of chunks."""
+        header = ContainerHeader.read(src)
+        keys = _container_keys(self.master_key, header.domain, header.time_layer)
+        record_size = header.chunk_size + MAC_SIZE
+
+        index = 0
+        record = _read_exact(src, record_size)
+        while True:
+            following = _read_exact(src, record_size) if len(record) == record_size else b""
+            final = not following
+            dst.write(self._open_chunk(keys, header, index, record, final))
+            index += 1
+            if final:
+                return index
+            record = following
+
+    def decrypt_chunk(self, src, index: int) -> bytes:
+        """Decrypt a single chunk from a seekable version 2 container."""
+        src.seek(0)
+        header = ContainerHeader.read(src)
+        keys = _container_keys(self.master_key, header.domain, header.time_layer)
+        record_size = header.chunk_size + MAC_SIZE
+
+        end = src.seek(0, io.SEEK_END)
+        offset = header.size + index * record_size
+        if index < 0 or offset >= end:
+            raise IndexError(f"Chunk {index} out of range")
+        src.seek(offset)
+        record = _read_exact(src, record_size)
+        return self._open_chunk(keys, header, index, record, offset + len(record) >= end)
+
+    def encrypt_bytes(self, plaintext: bytes, domain: str, time_layer: str = "present") -> bytes:
+        """Encrypt bytes into the binary container format."""
+        out = io.BytesIO()
+        self.encrypt_stream(io.BytesIO(plaintext), out, domain, time_layer)
+        return out.getvalue()
+
+    def decrypt_bytes(self, container: bytes) -> bytes:
+        """Decrypt bytes from the binary container format."""
+        out = io.BytesIO()
+        self.decrypt_stream(io.BytesIO(container), out)
+        return out.getvalue()
+
+    def encrypt_file(self, src_path: Path, dst_path: Path, domain: str,
+                     time_layer: str = "present", chunk_size: int = CHUNK_SIZE) -> int:
+        """Encrypt a file at rest, writing the container atomically."""
+        dst_path = Path(dst_path)
+        tmp_path = dst_path.with_name(dst_path.name + ".tmp")
+        try:
+            with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                chunks = self.encrypt_stream(src, dst, domain, time_layer, chunk_size)
+                dst.flush()
+                os.fsync(dst.fileno())
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, dst_path)
+        return chunks
+
+    def decrypt_file(self, src_path: Path, dst_path: Path) -> int:
+        """Decrypt a container file, writing the plaintext atomically."""
+        dst_path = Path(dst_path)
+        tmp_path = dst_path.with_name(dst_path.name + ".tmp")
+        try:
+            with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                chunks = self.decrypt_stream(src, dst)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, dst_path)
+        return chunks
+
 class SecureKeyStore:
     """Store API keys with domain-based encryption."""
 
@@ -274,6 +538,96 @@ class SecureKeyStore:
         with open(self.store_path, 'w') as f:
             json.dump(store, f, indent=2)
 
+class SqliteKeyStore(SecureKeyStore):
+    """
+    SecureKeyStore backed by SQLite, one row per key.
+    Storing a key updates only its row; values use the binary container.
+    Entries from a legacy secure_keys.json next to the database are imported once.
+    """
+
+    def __init__(self, master_key: bytes, store_path: Optional[Path] = None):
+        store_path = store_path or Path.home() / ".consciousness" / "secure_keys.db"
+        super().__init__(master_key, store_path)
+        self._init_db()
+        self._import_json(self.store_path.with_suffix(".json"))
+
+    def _connect(self):
+        return sqlite3.connect(self.store_path)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS keys (
+                name TEXT PRIMARY KEY,
+                domain TEXT,
+                value BLOB,
+                updated_at TEXT
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+        conn.close()
+
+    def _import_json(self, json_path: Path):
+        """Import legacy entries in one transaction, recorded in meta so it never repeats."""
+        conn = self._connect()
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                return
+
+            # Stores created before the meta row existed imported when the table was empty
+            already = conn.execute("SELECT 1 FROM keys LIMIT 1").fetchone()
+            if json_path.exists() and not already:
+                with open(json_path) as f:
+                    legacy = json.load(f)
+                for key_name, encrypted in legacy.items():
+                    plaintext = self.crypto.decrypt(encrypted)
+                    self._upsert(conn, key_name, encrypted["domain"], plaintext)
+
+            conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                         (datetime.now().isoformat(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _upsert(self, conn, key_name: str, domain: str, plaintext: bytes):
+        value = self.crypto.encrypt_bytes(plaintext, domain, "present")
+        conn.execute("""
+            INSERT INTO keys (name, domain, value, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                domain = excluded.domain, value = excluded.value, updated_at = excluded.updated_at
+        """, (key_name, domain, value, datetime.now().isoformat()))
+
+    def _write(self, key_name: str, domain: str, plaintext: bytes):
+        conn = self._connect()
+        self._upsert(conn, key_name, domain, plaintext)
+        conn.commit()
+        conn.close()
+
+    def store_key(self, key_name: str, key_value: str):
+        """Store an API key with domain encryption."""
+        domain = self.KEY_DOMAINS.get(key_name, "digital")
+        self._write(key_name, domain, key_value.encode('utf-8'))
+        print(f"Stored {key_name} encrypted with {domain} domain")
+
+    def retrieve_key(self, key_name: str) -> Optional[str]:
+        """Retrieve and decrypt an API key."""
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM keys WHERE name = ?", (key_name,)).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+        return self.crypto.decrypt_bytes(row[0]).decode('utf-8')
+
+    def delete_key(self, key_name: str) -> bool:
+        """Remove a stored key. Returns True if it existed."""
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM keys WHERE name = ?", (key_name,)).rowcount
+        conn.commit()
+        conn.close()
+        return deleted > 0
+
 def demo():
     """Demonstrate harmonic encryption."""
     print("=" * 50)
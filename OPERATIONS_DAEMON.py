@@ -5,19 +5,367 @@ Background service that coordinates all Consciousness Revolution automation.
 Runs scheduled tasks, monitors health, and manages data lifecycle.
 """
 
+import importlib.util
+import io
 import json
+import sqlite3
+import sys
 import time
-import subprocess
 import schedule
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import threading
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 # Paths
 HOME = Path.home()
 DEPLOYMENT = HOME / "100X_DEPLOYMENT"
 CONSCIOUSNESS = HOME / ".consciousness"
 LOG_PATH = CONSCIOUSNESS / "daemon_log.json"
+RUN_DB = CONSCIOUSNESS / "daemon_runs.db"
+
+TASK_WORKERS = 4       # automation tasks running at once
+JOB_WORKERS = 4        # scheduled jobs running at once
+SCHEDULER_TICK = 1     # seconds between schedule checks
+OUTPUT_TAIL = 500      # characters of task output kept in results
+RUN_RETENTION_DAYS = 365
+PERF_RECENT = 10       # runs compared against the previous PERF_RECENT for trends
+
+def peak_rss_kb():
+    """Process peak RSS in KB (tasks share the process, so this is a high-water mark)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+class RunStore:
+    """SQLite time series of every task and job run."""
+
+    def __init__(self, path=RUN_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task TEXT NOT NULL,
+                kind TEXT,
+                started REAL,
+                ended REAL,
+                duration REAL,
+                status TEXT,
+                returncode INTEGER,
+                peak_rss_kb INTEGER,
+                output_bytes INTEGER,
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_task ON runs(task, started)")
+        conn.execute("DELETE FROM runs WHERE started < ?",
+                     (time.time() - RUN_RETENTION_DAYS * 86400,))
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, run: dict, kind: str = "task"):
+        with self.lock:
+            conn = self._connect()
+            conn.execute("""
+                INSERT INTO runs (task, kind, started, ended, duration, status, returncode,
+                                  peak_rss_kb, output_bytes, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (run["task"], kind, run.get("started"), run.get("ended"), run.get("duration"),
+                  run.get("status"), run.get("returncode"), run.get("peak_rss_kb"),
+                  run.get("output_bytes"), run.get("error")))
+            conn.commit()
+            conn.close()
+
+    def perf(self, days: int = 30) -> list:
+        """Per-task run counts, p50/p95 durations and trend of recent vs earlier runs.
+        Busy and skipped entries never executed, so they are left out."""
+        conn = self._connect()
+        rows = conn.execute("""
+            SELECT task, kind, duration, status, peak_rss_kb FROM runs
+            WHERE started >= ? AND status NOT IN ('busy', 'skipped')
+            ORDER BY task, started
+        """, (time.time() - days * 86400,)).fetchall()
+        conn.close()
+
+        by_task = {}
+        for task, kind, duration, status, rss in rows:
+            entry = by_task.setdefault(task, {"task": task, "kind": kind, "runs": 0, "errors": 0,
+                                              "durations": [], "peak_rss_kb": None})
+            entry["runs"] += 1
+            if status != "success":
+                entry["errors"] += 1
+            if duration is not None:
+                entry["durations"].append(duration)
+            if rss is not None:
+                entry["peak_rss_kb"] = max(entry["peak_rss_kb"] or 0, rss)
+
+        report = []
+        for entry in by_task.values():
+            durations = entry.pop("durations")
+            ordered = sorted(durations)
+            recent = sorted(durations[-PERF_RECENT:])
+            earlier = sorted(durations[-2 * PERF_RECENT:-PERF_RECENT])
+            trend = None
+            if recent and earlier and percentile(earlier, 50):
+                trend = round((percentile(recent, 50) / percentile(earlier, 50) - 1) * 100, 1)
+            entry.update(
+                p50=percentile(ordered, 50),
+                p95=percentile(ordered, 95),
+                last=durations[-1] if durations else None,
+                trend_pct=trend
+            )
+            report.append(entry)
+        return report
+
+class Task:
+    """An automation entry point, called in-process from its module."""
+
+    def __init__(self, name, module, call, timeout=120, after=(), limit=1):
+        self.name = name
+        self.module = module      # script name in DEPLOYMENT, without .py
+        self.call = call          # function(module) -> result
+        self.timeout = timeout
+        self.after = tuple(after)  # tasks that must succeed first when run together
+        self.slots = threading.BoundedSemaphore(limit)
+
+TASKS = [
+    Task("scorecard", "SCORECARD_AUTOMATOR", lambda m: m.update_scorecard(), timeout=120),
+    Task("scorecard_report", "SCORECARD_AUTOMATOR", lambda m: m.generate_report(),
+         timeout=120, after=("scorecard",)),
+    Task("rotation", "TEMPORAL_DATA_ROTATION", lambda m: m.main(), timeout=300),
+    Task("l10_agenda", "L10_MEETING_AUTOMATION", lambda m: m.L10Meeting().generate_agenda(),
+         timeout=120, after=("scorecard",)),
+]
+
+class TaskRun:
+    """One submission of a task; decides whether a queued run may still start."""
+
+    def __init__(self, task, deadline):
+        self.task = task
+        self.deadline = deadline
+        self.lock = threading.Lock()
+        self.started = False
+        self.expired = False
+        self.finished = False
+
+    def begin(self) -> bool:
+        """Claim the run for the worker, unless its deadline has already passed."""
+        with self.lock:
+            if self.expired or time.time() >= self.deadline:
+                self.expired = True
+                return False
+            self.started = True
+            return True
+
+    def finish(self) -> bool:
+        """Mark the run finished. Returns True if its deadline had already passed."""
+        with self.lock:
+            self.finished = True
+            return self.expired
+
+    def expire(self) -> str:
+        """Mark the deadline as passed; returns 'queued', 'running' or 'finished'."""
+        with self.lock:
+            if self.finished:
+                return "finished"
+            self.expired = True
+            return "running" if self.started else "queued"
+
+class ThreadOutput(io.TextIOBase):
+    """stdout that sends each thread's writes to its own capture buffer, if any."""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.default).write(text)
+
+    def flush(self):
+        self.default.flush()
+
+    @property
+    def encoding(self):
+        return self.default.encoding
+
+    def isatty(self):
+        return self.default.isatty()
+
+    def fileno(self):
+        return self.default.fileno()
+
+    @contextmanager
+    def capture(self, buffer):
+        self.local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self.local.buffer = None
+
+class TaskExecutor:
+    """
+    Runs automation tasks in-process on a worker pool.
+    Modules are imported once; tasks in one run are ordered by their `after` deps.
+    """
+
+    def __init__(self, tasks=TASKS, workers=TASK_WORKERS, store=None):
+        self.tasks = {task.name: task for task in tasks}
+        self.store = store
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task")
+        self.modules = {}
+        self.import_lock = threading.Lock()
+        if not isinstance(sys.stdout, ThreadOutput):
+            sys.stdout = ThreadOutput(sys.stdout)
+        self.output = sys.stdout
+
+    def module(self, name: str):
+        """Import a deployment script once and reuse it."""
+        with self.import_lock:
+            if name not in self.modules:
+                spec = importlib.util.spec_from_file_location(name, DEPLOYMENT / f"{name}.py")
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self.modules[name] = module
+            return self.modules[name]
+
+    def _record(self, result: dict) -> dict:
+        if self.store:
+            try:
+                self.store.record(result)
+            except sqlite3.Error as e:
+                print(f"Could not record run of {result['task']}: {e}")
+        return result
+
+    def _outcome(self, name: str, status: str, error: str, duration: float = 0.0) -> dict:
+        """Result for a run that did not produce output (busy, skipped, timeout)."""
+        now = time.time()
+        return {"task": name, "status": status, "returncode": None, "error": error,
+                "started": now - duration, "ended": now, "duration": duration,
+                "output": "", "stdout_lines": 0, "output_bytes": 0, "peak_rss_kb": None}
+
+    def _timed_out(self, run: TaskRun) -> dict:
+        timeout = run.task.timeout
+        return self._record(self._outcome(run.task.name, "timeout", f"exceeded {timeout}s", timeout))
+
+    def _execute(self, run: TaskRun):
+        """Run a task; returns None if its deadline passed while it was queued."""
+        task = run.task
+        result = {"task": task.name, "status": "success", "returncode": 0, "error": None}
+
+        # Per-task concurrency limit, e.g. two rotations never overlap; a run that
+        # finds every slot taken is reported busy rather than queued behind it
+        if not task.slots.acquire(blocking=False):
+            return self._record(self._outcome(task.name, "busy", "previous run still active"))
+        if not run.begin():
+            task.slots.release()
+            return None
+
+        started = time.time()
+        buffer = io.StringIO()
+        try:
+            with self.output.capture(buffer):
+                task.call(self.module(task.module))
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if code:
+                result.update(status="error", returncode=code, error=f"exit {code}")
+        except Exception as e:
+            result.update(status="error", returncode=1, error=str(e))
+        finally:
+            task.slots.release()
+
+        # Past the deadline run_graph already reported a timeout without recording
+        # it; the single row for this run carries the timeout and the real outcome
+        if run.finish():
+            outcome = result["status"]
+            result.update(status="timeout", error=f"exceeded {task.timeout}s; finished with {outcome}"
+                          + (f": {result['error']}" if result["error"] else ""))
+
+        ended = time.time()
+        output = buffer.getvalue()
+        result.update(
+            started=started,
+            ended=ended,
+            duration=round(ended - started, 3),
+            output=output[-OUTPUT_TAIL:],
+            stdout_lines=len(output.split('\n')),
+            output_bytes=len(output.encode('utf-8')),
+            peak_rss_kb=peak_rss_kb()
+        )
+        return self._record(result)
+
+    def run(self, name: str) -> dict:
+        """Run one task and wait for it."""
+        return self.run_graph([name])[name]
+
+    def run_graph(self, names) -> dict:
+        """
+        Run tasks concurrently, starting each once its deps in `names` succeed.
+        A task past its timeout is reported as such. If it had not started yet it
+        never will; if it had, its thread cannot be killed and keeps its
+        concurrency slot until it returns.
+        """
+        names = list(names)
+        pending = {name: self.tasks[name] for name in names}
+        running = {}  # future -> TaskRun
+        results = {}
+
+        while pending or running:
+            for name, task in list(pending.items()):
+                deps = [dep for dep in task.after if dep in names]
+                if any(dep in results and results[dep]["status"] != "success" for dep in deps):
+                    results[name] = self._record(self._outcome(name, "skipped", "dependency failed"))
+                    del pending[name]
+                elif all(dep in results for dep in deps):
+                    run = TaskRun(task, time.time() + task.timeout)
+                    running[self.pool.submit(self._execute, run)] = run
+                    del pending[name]
+
+            if not running:
+                continue
+
+            timeout = max(0, min(run.deadline for run in running.values()) - time.time())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                run = running.pop(future)
+                result = future.result()
+                results[run.task.name] = result or self._timed_out(run)
+            for future, run in list(running.items()):
+                if time.time() >= run.deadline:
+                    del running[future]
+                    state = run.expire()
+                    if state == "finished":
+                        results[run.task.name] = future.result()
+                    elif state == "running":
+                        # Recorded once by _execute when the thread returns
+                        timeout = run.task.timeout
+                        results[run.task.name] = self._outcome(
+                            run.task.name, "timeout", f"exceeded {timeout}s", timeout)
+                    else:
+                        future.cancel()
+                        results[run.task.name] = self._timed_out(run)
+
+        return results
 
 class OperationsDaemon:
     """Central operations coordinator."""
@@ -31,6 +379,11 @@ class OperationsDaemon:
             "errors": 0,
             "last_run": {}
         }
+        self.lock = threading.RLock()
+        self.store = RunStore()
+        self.executor = TaskExecutor(store=self.store)
+        self.jobs = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+        self.active = set()
 
     def start(self):
         """Start the daemon."""
@@ -46,14 +399,15 @@ class OperationsDaemon:
         # Schedule tasks
         self._setup_schedule()
 
-        # Main loop
+        # Main loop; jobs run on the pool so a slow one never delays the next
         while self.running:
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            time.sleep(SCHEDULER_TICK)
 
     def stop(self):
         """Stop the daemon."""
         self.running = False
+        self.jobs.shutdown(wait=True)
         self._save_log()
         print("\nDaemon stopped.")
 
@@ -61,22 +415,22 @@ class OperationsDaemon:
         """Set up all scheduled tasks."""
 
         # Every hour
-        schedule.every().hour.do(self._run_task, "health_check", self.health_check)
+        schedule.every().hour.do(self._submit, "health_check", self.health_check)
 
         # Every 6 hours
-        schedule.every(6).hours.do(self._run_task, "data_rotation", self.data_rotation)
+        schedule.every(6).hours.do(self._submit, "data_rotation", self.data_rotation)
 
         # Daily at 6 AM
-        schedule.every().day.at("06:00").do(self._run_task, "daily_automation", self.daily_automation)
+        schedule.every().day.at("06:00").do(self._submit, "daily_automation", self.daily_automation)
 
         # Daily at 9 AM
-        schedule.every().day.at("09:00").do(self._run_task, "scorecard_update", self.scorecard_update)
+        schedule.every().day.at("09:00").do(self._submit, "scorecard_update", self.scorecard_update)
 
         # Monday at 8 AM (weekly)
-        schedule.every().monday.at("08:00").do(self._run_task, "weekly_automation", self.weekly_automation)
+        schedule.every().monday.at("08:00").do(self._submit, "weekly_automation", self.weekly_automation)
 
         # Monday at 9 AM (L10 prep)
-        schedule.every().monday.at("09:00").do(self._run_task, "l10_prep", self.l10_prep)
+        schedule.every().monday.at("09:00").do(self._submit, "l10_prep", self.l10_prep)
 
         print("Scheduled tasks:")
         print("  - Health check: Every hour")
@@ -87,28 +441,52 @@ class OperationsDaemon:
         print("  - L10 prep: Monday 9:00 AM")
         print()
 
+    def _submit(self, name: str, task_func):
+        """Hand a scheduled job to the pool unless its previous run is still going."""
+        with self.lock:
+            if name in self.active:
+                self._log(f"Skipping task {name}: previous run still active", error=True)
+                return
+            self.active.add(name)
+        self.jobs.submit(self._run_task, name, task_func)
+
     def _run_task(self, name: str, task_func):
         """Run a task with logging."""
         start_time = datetime.now()
+        started = time.time()
+        run = {"task": name, "started": started, "status": "success", "returncode": 0}
 
         try:
             self._log(f"Starting task: {name}")
             result = task_func()
             self._log(f"Completed task: {name}", result)
-            self.stats["tasks_run"] += 1
-            self.stats["last_run"][name] = {
-                "time": start_time.isoformat(),
-                "status": "success",
-                "result": result
-            }
+            with self.lock:
+                self.stats["tasks_run"] += 1
+                self.stats["last_run"][name] = {
+                    "time": start_time.isoformat(),
+                    "status": "success",
+                    "result": result
+                }
         except Exception as e:
+            run.update(status="error", returncode=1, error=str(e))
             self._log(f"Error in task {name}: {str(e)}", error=True)
-            self.stats["errors"] += 1
-            self.stats["last_run"][name] = {
-                "time": start_time.isoformat(),
-                "status": "error",
-                "error": str(e)
-            }
+            with self.lock:
+                self.stats["errors"] += 1
+                self.stats["last_run"][name] = {
+                    "time": start_time.isoformat(),
+                    "status": "error",
+                    "error": str(e)
+                }
+        finally:
+            with self.lock:
+                self.active.discard(name)
+
+        run.update(ended=time.time(), peak_rss_kb=peak_rss_kb())
+        run["duration"] = round(run["ended"] - started, 3)
+        try:
+            self.store.record(run, kind="job")
+        except sqlite3.Error as e:
+            self._log(f"Could not record run of {name}: {e}", error=True)
 
         self._save_log()
 
@@ -120,24 +498,26 @@ class OperationsDaemon:
             "data": data,
             "error": error
         }
-        self.log.append(entry)
+        with self.lock:
+            self.log.append(entry)
+
+            # Keep log manageable
+            if len(self.log) > 1000:
+                self.log = self.log[-500:]
 
         # Print to console
         prefix = "❌" if error else "✅"
         print(f"{prefix} [{datetime.now().strftime('%H:%M:%S')}] {message}")
 
-        # Keep log manageable
-        if len(self.log) > 1000:
-            self.log = self.log[-500:]
-
     def _save_log(self):
         """Save log to disk."""
-        output = {
-            "stats": self.stats,
-            "log": self.log[-100:]  # Last 100 entries
-        }
-        with open(LOG_PATH, 'w') as f:
-            json.dump(output, f, indent=2)
+        with self.lock:
+            output = {
+                "stats": self.stats,
+                "log": self.log[-100:]  # Last 100 entries
+            }
+            with open(LOG_PATH, 'w') as f:
+                json.dump(output, f, indent=2)
 
     # Task implementations
 
@@ -177,70 +557,73 @@ class OperationsDaemon:
 
     def data_rotation(self) -> dict:
         """Run temporal data rotation."""
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "TEMPORAL_DATA_ROTATION.py")],
-            capture_output=True, text=True, timeout=300
-        )
+        result = self.executor.run("rotation")
         return {
-            "returncode": result.returncode,
-            "stdout_lines": len(result.stdout.split('\n'))
+            "returncode": result["returncode"],
+            "stdout_lines": result["stdout_lines"]
         }
 
     def daily_automation(self) -> dict:
-        """Run daily automation suite."""
-        results = {}
-
-        # Scorecard
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "SCORECARD_AUTOMATOR.py")],
-            capture_output=True, text=True, timeout=120
-        )
-        results["scorecard"] = result.returncode == 0
-
-        # Data rotation
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "TEMPORAL_DATA_ROTATION.py")],
-            capture_output=True, text=True, timeout=300
-        )
-        results["rotation"] = result.returncode == 0
-
-        return results
+        """Run daily automation suite (scorecard and rotation in parallel)."""
+        runs = self.executor.run_graph(["scorecard", "rotation"])
+        return {
+            "scorecard": runs["scorecard"]["status"] == "success",
+            "rotation": runs["rotation"]["status"] == "success",
+            "durations": {name: run["duration"] for name, run in runs.items()}
+        }
 
     def scorecard_update(self) -> dict:
         """Update scorecard metrics."""
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "SCORECARD_AUTOMATOR.py")],
-            capture_output=True, text=True, timeout=120
-        )
+        result = self.executor.run("scorecard")
         return {
-            "returncode": result.returncode,
-            "output": result.stdout[-500:] if result.stdout else ""
+            "returncode": result["returncode"],
+            "output": result["output"]
         }
 
     def weekly_automation(self) -> dict:
         """Run weekly automation suite."""
         # Generate scorecard report
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "SCORECARD_AUTOMATOR.py"), "report"],
-            capture_output=True, text=True, timeout=120
-        )
-        return {"report_generated": result.returncode == 0}
+        result = self.executor.run("scorecard_report")
+        return {"report_generated": result["status"] == "success"}
 
     def l10_prep(self) -> dict:
         """Prepare L10 meeting materials."""
-        result = subprocess.run(
-            ["python", str(DEPLOYMENT / "L10_MEETING_AUTOMATION.py"), "agenda"],
-            capture_output=True, text=True, timeout=120
-        )
+        result = self.executor.run("l10_agenda")
         return {
-            "agenda_generated": result.returncode == 0
+            "agenda_generated": result["status"] == "success"
         }
 
+def show_perf(days: int = 30):
+    """Print p50/p95 durations and trends per task from the run store."""
+    if not RUN_DB.exists():
+        print("No runs recorded yet.")
+        return
+
+    report = RunStore().perf(days)
+    print(f"\n📈 TASK PERFORMANCE (last {days} days)\n")
+    print(f"  {'task':<20} {'kind':<5} {'runs':>5} {'err':>4} {'p50 s':>8} {'p95 s':>8} "
+          f"{'last s':>8} {'trend':>8} {'peak MB':>8}")
+
+    def fmt(value):
+        return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+    for entry in sorted(report, key=lambda e: (e["kind"] or "", e["task"])):
+        trend = entry["trend_pct"]
+        trend_text = f"{trend:+.1f}%" if trend is not None else "-"
+        flag = " ⚠️" if trend is not None and trend > 20 else ""
+        rss = entry["peak_rss_kb"]
+        print(f"  {entry['task']:<20} {entry['kind'] or '':<5} {entry['runs']:>5} {entry['errors']:>4} "
+              f"{fmt(entry['p50'])} {fmt(entry['p95'])} {fmt(entry['last'])} {trend_text:>8} "
+              f"{fmt(rss / 1024 if rss else None)}{flag}")
+    print(f"\nTrend: median of the last {PERF_RECENT} runs vs the {PERF_RECENT} before.")
+
 def main():
     """Run the operations daemon."""
     import sys
 
-    if len(sys.argv) > 1 and sys.argv[1] == "status":
+    if len(sys.argv) > 1 and sys.argv[1] == "status" and "--perf" in sys.argv:
+        show_perf()
+    elif len(sys.argv) > 1 and sys.argv[1] == "status":
         # Show daemon status
         if LOG_PATH.exists():
             with open(LOG_PATH) as f:
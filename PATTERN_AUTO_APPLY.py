@@ -25,6 +25,10 @@ from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from PATTERN_CROSS_POLLINATOR import PatternScanner
+
+AUTO_APPLY_DETECTOR = "auto_apply"  # key in ScanResult.detected
+
 # =============================================================================
 # AUTO-APPLY PATTERN DEFINITIONS
 # Each pattern has injection_point and code_snippet
@@ -288,40 +292,84 @@ function hideLoading() {
 # =============================================================================
 
 class BackupManager:
+    """
+    Content-addressed backups: each original is stored once under
+    objects/<sha256>, and backup/rollback records are appended to
+    manifest.log. A manifest.json from older versions is still read.
+    """
+
     def __init__(self, base_path):
         self.base_path = Path(base_path)
         self.backup_dir = self.base_path / ".pattern_backups"
         self.backup_dir.mkdir(exist_ok=True)
+        self.objects_dir = self.backup_dir / "objects"
+        self.objects_dir.mkdir(exist_ok=True)
         self.manifest_path = self.backup_dir / "manifest.json"
+        self.log_path = self.backup_dir / "manifest.log"
         self.manifest = self._load_manifest()
 
     def _load_manifest(self):
         if self.manifest_path.exists():
-            return json.loads(self.manifest_path.read_text())
-        return {"backups": [], "rollback_stack": []}
-
-    def _save_manifest(self):
-        self.manifest_path.write_text(json.dumps(self.manifest, indent=2))
-
-    def backup_file(self, filepath, session_id):
-        """Backup a file before modification."""
+            manifest = json.loads(self.manifest_path.read_text())
+        else:
+            manifest = {"backups": [], "rollback_stack": []}
+
+        # Replay the append-only log on top of the legacy manifest
+        if self.log_path.exists():
+            with open(self.log_path, encoding='utf-8') as log:
+                for line in log:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from an interrupted write
+                    if record.get("op") == "rollback":
+                        manifest["rollback_stack"] = [
+                            r for r in manifest["rollback_stack"] if r["session"] != record["session"]
+                        ]
+                    else:
+                        manifest["backups"].append(record)
+                        manifest["rollback_stack"].append(record)
+        return manifest
+
+    def _append_log(self, record):
+        with open(self.log_path, "a", encoding='utf-8') as log:
+            log.write(json.dumps(record) + "\n")
+
+    def _store_object(self, data):
+        """Store bytes under their hash (once); returns the object name."""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self.objects_dir / digest
+        if not object_path.exists():
+            tmp_path = self.objects_dir / f".{digest}.{os.getpid()}.tmp"
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, object_path)
+        return digest
+
+    def backup_file(self, filepath, session_id, data=None):
+        """Backup a file before modification (data: its current bytes, if already read)."""
         rel_path = filepath.relative_to(self.base_path)
-        backup_name = f"{session_id}_{rel_path.name}_{datetime.now().strftime('%H%M%S')}"
-        backup_path = self.backup_dir / backup_name
-
-        shutil.copy2(filepath, backup_path)
+        if data is None:
+            data = filepath.read_bytes()
 
         backup_record = {
+            "op": "backup",
             "original": str(rel_path),
-            "backup": backup_name,
+            "object": self._store_object(data),
             "session": session_id,
             "timestamp": datetime.now().isoformat()
         }
+        self._append_log(backup_record)
         self.manifest["backups"].append(backup_record)
         self.manifest["rollback_stack"].append(backup_record)
-        self._save_manifest()
 
-        return backup_path
+        return self.objects_dir / backup_record["object"]
+
+    def _backup_path(self, record):
+        if "object" in record:
+            return self.objects_dir / record["object"]
+        return self.backup_dir / record["backup"]  # legacy per-copy backup
 
     def rollback_last_session(self):
         """Rollback all changes from last session."""
@@ -331,19 +379,42 @@ class BackupManager:
         last_session = self.manifest["rollback_stack"][-1]["session"]
         rolled_back = []
 
+        # Newest first, so a file backed up twice ends at its oldest state
         for record in reversed(self.manifest["rollback_stack"]):
             if record["session"] == last_session:
-                backup_path = self.backup_dir / record["backup"]
+                backup_path = self._backup_path(record)
                 original_path = self.base_path / record["original"]
 
                 if backup_path.exists():
-                    shutil.copy2(backup_path, original_path)
+                    atomic_write_bytes(original_path, backup_path.read_bytes())
                     rolled_back.append(record["original"])
-                    self.manifest["rollback_stack"].remove(record)
 
-        self._save_manifest()
+        self._append_log({"op": "rollback", "session": last_session, "timestamp": datetime.now().isoformat()})
+        self.manifest["rollback_stack"] = [
+            r for r in self.manifest["rollback_stack"] if r["session"] != last_session
+        ]
         return rolled_back
 
+def atomic_write_bytes(path, data):
+    """Replace path with data via a temp file + rename, keeping its permissions."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    if path.exists():
+        shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+
+def decode_text(data):
+    """bytes -> str as read_text(encoding='utf-8', errors='ignore') would give it."""
+    text = data.decode('utf-8', errors='ignore')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def encode_text(text):
+    """str -> bytes as write_text(encoding='utf-8') would write them."""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode('utf-8')
+
 # =============================================================================
 # AUTO-APPLY ENGINE
 # =============================================================================
@@ -387,18 +458,8 @@ class PatternAutoApply:
 
         return True
 
-    def apply_pattern(self, filepath, pattern_id, pattern):
-        """Apply a single pattern to a file."""
-        try:
-            content = filepath.read_text(encoding='utf-8', errors='ignore')
-        except Exception as e:
-            self.errors.append({"file": str(filepath), "error": str(e)})
-            return False
-
-        if not self.check_pattern_needed(content, pattern):
-            return False
-
-        # Determine injection method
+    def inject(self, content, pattern):
+        """(new content, lines added) for one pattern, or None if it has no injection method."""
         injection = pattern.get("injection_point", "")
         new_content = content
 
@@ -406,102 +467,145 @@ class PatternAutoApply:
             # Find and replace patterns
             for find, replace in pattern.get("find_replace", []):
                 new_content = re.sub(find, replace, new_content)
+            return new_content, 0
 
         elif "insert_after" in pattern:
             # Insert after a pattern
-            insert_point = pattern["insert_after"]
             snippet = pattern["code_snippet"]
-            match = re.search(insert_point, new_content)
+            match = re.search(pattern["insert_after"], new_content)
             if match:
                 pos = match.end()
                 new_content = new_content[:pos] + "\n" + snippet + new_content[pos:]
+            return new_content, snippet.count('\n')
 
         elif "insert_before" in pattern:
             # Insert before a pattern
-            insert_point = pattern["insert_before"]
             snippet = pattern["code_snippet"]
-            match = re.search(insert_point, new_content)
+            match = re.search(pattern["insert_before"], new_content)
             if match:
                 pos = match.start()
                 new_content = new_content[:pos] + snippet + "\n" + new_content[pos:]
+            return new_content, snippet.count('\n')
 
-        else:
-            # Unknown injection method
-            self.skipped.append({
-                "file": str(filepath),
-                "pattern": pattern_id,
-                "reason": f"Unknown injection point: {injection}"
-            })
-            return False
+        return None
 
-        # Check if content changed
-        if new_content == content:
-            return False
+    def apply_patterns(self, filepath, patterns, limit=None):
+        """
+        Apply patterns (in order) to one file in memory: one read, one backup
+        and one atomic write however many apply. Returns the number applied.
+        """
+        try:
+            original = filepath.read_bytes()
+        except Exception as e:
+            self.errors.append({"file": str(filepath), "error": str(e)})
+            return 0
 
-        # Record the change
-        change = {
-            "file": str(filepath.relative_to(self.base_path)),
-            "pattern_id": pattern_id,
-            "pattern_name": pattern["name"],
-            "category": pattern["category"],
-            "safety": pattern.get("safety", "review"),
-            "lines_added": snippet.count('\n') if 'snippet' in dir() else 0
-        }
+        content = decode_text(original)
+        file_changes = []
+
+        for pattern_id, pattern in patterns:
+            if limit is not None and len(file_changes) >= limit:
+                break
+            if not self.check_pattern_needed(content, pattern):
+                continue
+
+            injected = self.inject(content, pattern)
+            if injected is None:
+                # Unknown injection method
+                self.skipped.append({
+                    "file": str(filepath),
+                    "pattern": pattern_id,
+                    "reason": f"Unknown injection point: {pattern.get('injection_point', '')}"
+                })
+                continue
+
+            new_content, lines_added = injected
+            # Check if content changed
+            if new_content == content:
+                continue
+            content = new_content
+
+            file_changes.append({
+                "file": str(filepath.relative_to(self.base_path)),
+                "pattern_id": pattern_id,
+                "pattern_name": pattern["name"],
+                "category": pattern["category"],
+                "safety": pattern.get("safety", "review"),
+                "lines_added": lines_added
+            })
+
+        if not file_changes:
+            return 0
 
         if self.dry_run:
-            change["status"] = "would_apply"
-            self.changes.append(change)
-            return True
+            status = "would_apply"
         else:
             # Backup and apply
-            self.backup.backup_file(filepath, self.session_id)
-            filepath.write_text(new_content, encoding='utf-8')
-            change["status"] = "applied"
-            self.changes.append(change)
-            return True
-
-    def scan_and_apply(self, pattern_filter=None, file_filter=None, safe_only=True):
-        """Scan codebase and apply patterns."""
-        print("=" * 60)
-        print(f"   PATTERN AUTO-APPLY - {'DRY RUN' if self.dry_run else 'APPLYING'}")
-        print("=" * 60)
-        print()
-
-        # Sort patterns by priority
-        sorted_patterns = sorted(
-            AUTO_APPLY_PATTERNS.items(),
-            key=lambda x: x[1]["priority"],
-            reverse=True
-        )
+            try:
+                self.backup.backup_file(filepath, self.session_id, original)
+                atomic_write_bytes(filepath, encode_text(content))
+            except Exception as e:
+                self.errors.append({"file": str(filepath), "error": str(e)})
+                return 0
+            status = "applied"
+
+        for change in file_changes:
+            change["status"] = status
+        self.changes.extend(file_changes)
+        return len(file_changes)
 
-        for filepath in self.base_path.rglob("*"):
-            if not filepath.is_file():
-                continue
-            if not self.should_process_file(filepath):
+    def apply_pattern(self, filepath, pattern_id, pattern):
+        """Apply a single pattern to a file."""
+        return self.apply_patterns(filepath, [(pattern_id, pattern)]) > 0
+
+    def applicable_patterns(self, filepath, pattern_filter=None, safe_only=True):
+        """Patterns (priority order) that may apply to this file."""
+        applicable = []
+        for pattern_id, pattern in sorted(AUTO_APPLY_PATTERNS.items(), key=lambda x: x[1]["priority"], reverse=True):
+            # Filter by pattern name if specified
+            if pattern_filter and pattern_filter != pattern_id:
                 continue
-            if file_filter and file_filter not in str(filepath):
+
+            # Skip unsafe patterns in safe mode
+            if safe_only and pattern.get("safety") != "safe":
                 continue
 
-            for pattern_id, pattern in sorted_patterns:
-                # Filter by pattern name if specified
-                if pattern_filter and pattern_filter != pattern_id:
-                    continue
+            # Check file type match
+            if any(filepath.match(glob) for glob in pattern.get("applies_to", [])):
+                applicable.append((pattern_id, pattern))
+        return applicable
 
-                # Skip unsafe patterns in safe mode
-                if safe_only and pattern.get("safety") != "safe":
-                    continue
+    def detector(self, pattern_filter=None, file_filter=None, safe_only=True):
+        """Scan detector for PatternScanner.scan(), judged on the scanner's buffer instead of a re-read."""
+        return AutoApplyDetector(self, pattern_filter, file_filter, safe_only)
 
-                # Check file type match
-                applies = False
-                for glob in pattern.get("applies_to", []):
-                    if filepath.match(glob):
-                        applies = True
-                        break
+    def scan_and_apply(self, pattern_filter=None, file_filter=None, safe_only=True, scan=None, max_changes=None):
+        """
+        Scan codebase and apply patterns.
 
-                if not applies:
-                    continue
+        scan is a ScanResult that already ran detector(); without one the tree
+        is walked here. Only flagged files are read again to apply patterns.
+        """
+        print("=" * 60)
+        print(f"   PATTERN AUTO-APPLY - {'DRY RUN' if self.dry_run else 'APPLYING'}")
+        print("=" * 60)
+        print()
 
-                self.apply_pattern(filepath, pattern_id, pattern)
+        if scan is None:
+            scan = PatternScanner(self.base_path).scan(
+                patterns=False,
+                weeds=False,
+                detectors={AUTO_APPLY_DETECTOR: self.detector(pattern_filter, file_filter, safe_only)}
+            )
+
+        for rel_path, pattern_ids in scan.detected.get(AUTO_APPLY_DETECTOR, {}).items():
+            limit = None
+            if max_changes is not None:
+                limit = max_changes - len(self.changes)
+                if limit <= 0:
+                    break
+            patterns = [(pattern_id, AUTO_APPLY_PATTERNS[pattern_id]) for pattern_id in pattern_ids]
+            self.apply_patterns(self.base_path / rel_path, patterns, limit)
 
         return self.generate_report()
 
@@ -534,6 +638,29 @@ class PatternAutoApply:
 
         return report
 
+class AutoApplyDetector:
+    """Flags files where at least one auto-apply pattern is needed (picklable for --jobs scans)."""
+
+    def __init__(self, engine, pattern_filter=None, file_filter=None, safe_only=True):
+        self.engine = engine
+        self.pattern_filter = pattern_filter
+        self.file_filter = file_filter
+        self.safe_only = safe_only
+        # Cached detector outputs are only valid for these definitions and filters
+        self.fingerprint = hashlib.md5(json.dumps(
+            [AUTO_APPLY_PATTERNS, pattern_filter, file_filter, safe_only], sort_keys=True
+        ).encode()).hexdigest()
+
+    def __call__(self, filepath, content, lowered):
+        if not self.engine.should_process_file(filepath):
+            return None
+        if self.file_filter and self.file_filter not in str(filepath):
+            return None
+        applicable = self.engine.applicable_patterns(filepath, self.pattern_filter, self.safe_only)
+        if any(self.engine.check_pattern_needed(content, pattern) for _, pattern in applicable):
+            return [pattern_id for pattern_id, _ in applicable]
+        return None
+
 # =============================================================================
 # CLI INTERFACE
 # =============================================================================
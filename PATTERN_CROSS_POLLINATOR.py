@@ -15,15 +15,24 @@ Usage:
     python PATTERN_CROSS_POLLINATOR.py star          # Star loop optimization
     python PATTERN_CROSS_POLLINATOR.py report        # Generate full report
     python PATTERN_CROSS_POLLINATOR.py auto          # Auto-fix safe patterns
+    python PATTERN_CROSS_POLLINATOR.py report --jobs 16   # Scan with 16 processes
 """
 
 import os
 import re
 import json
+import stat
+import sqlite3
+import heapq
 import hashlib
-from pathlib import Path
+from bisect import bisect_right
+from itertools import islice
+from pathlib import Path, PurePath
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from REGEX_PREFILTER import required_literals
 
 # =============================================================================
 # PATTERN DEFINITIONS - The DNA of good code
@@ -535,6 +544,84 @@ ANTI_PATTERNS = {
     }
 }
 
+# =============================================================================
+# COMPILED MATCHERS - Compile once, prefilter on literals, one lowered buffer
+# =============================================================================
+
+WEED_MATCH_LIMIT = 5  # matches reported per weed per file
+
+class Matcher:
+    """A compiled regex guarded by a cheap substring prefilter."""
+
+    def __init__(self, pattern, flags):
+        self.regex = re.compile(pattern, flags)
+        self.literals = required_literals(pattern)
+
+    def possible(self, lowered):
+        return self.literals is None or any(lit in lowered for lit in self.literals)
+
+    def search(self, content, lowered):
+        return self.possible(lowered) and self.regex.search(content) is not None
+
+    def finditer(self, content, lowered):
+        return self.regex.finditer(content) if self.possible(lowered) else iter(())
+
+class LineIndex:
+    """Line numbers for match offsets via bisect over newline positions."""
+
+    def __init__(self, content):
+        self.content = content
+        self.starts = None
+
+    def line_of(self, pos):
+        if self.starts is None:
+            self.starts = [0] + [m.end() for m in re.finditer("\n", self.content)]
+        return bisect_right(self.starts, pos)
+
+    def line_text(self, line_num):
+        start = self.starts[line_num - 1]
+        end = self.content.find("\n", start)
+        return self.content[start:end] if end >= 0 else self.content[start:]
+
+class CompiledPatterns:
+    """PATTERNS and ANTI_PATTERNS compiled once, with PATTERNS grouped by file suffix."""
+
+    def __init__(self):
+        self.by_suffix = {}
+        self.weeds = [
+            (weed_id, weed, Matcher(weed["pattern"], re.IGNORECASE | re.MULTILINE))
+            for weed_id, weed in ANTI_PATTERNS.items()
+            if weed.get("pattern")
+        ]
+
+    def for_file(self, filepath):
+        """(pattern_id, pattern, signature matcher, anti-pattern matcher) applying to filepath."""
+        # applies_to globs are all "*.ext", so the suffix decides applicability
+        suffix = filepath.suffix
+        group = self.by_suffix.get(suffix)
+        if group is None:
+            probe = PurePath("_" + suffix)
+            group = self.by_suffix[suffix] = [
+                (
+                    pattern_id,
+                    pattern,
+                    Matcher(pattern["signature"], re.IGNORECASE) if pattern.get("signature") else None,
+                    Matcher(pattern["anti_pattern"], re.IGNORECASE) if pattern.get("anti_pattern") else None
+                )
+                for pattern_id, pattern in PATTERNS.items()
+                if any(probe.match(glob) for glob in pattern.get("applies_to", []))
+            ]
+        return group
+
+_compiled = None
+
+def get_compiled_patterns():
+    """Shared CompiledPatterns, built on first use."""
+    global _compiled
+    if _compiled is None:
+        _compiled = CompiledPatterns()
+    return _compiled
+
 # =============================================================================
 # STAR PATTERN - Lug nut optimization order
 # =============================================================================
@@ -576,11 +663,163 @@ def get_star_order(items):
 # SCANNER - Find all patterns in codebase
 # =============================================================================
 
+# =============================================================================
+# SCAN CACHE - Per-file results keyed by content hash
+# =============================================================================
+
+SCAN_CACHE_VERSION = 1  # bump when scanner logic changes what a file yields
+
+def scan_fingerprint(detectors):
+    """Version of everything that decides a file's scan output."""
+    definitions = json.dumps(
+        [SCAN_CACHE_VERSION, PATTERNS, ANTI_PATTERNS,
+         sorted((name, getattr(d, "fingerprint", None) or getattr(d, "__qualname__", type(d).__qualname__)) for name, d in detectors.items())],
+        sort_keys=True, default=str
+    )
+    return hashlib.md5(definitions.encode()).hexdigest()
+
+class ScanCache:
+    """
+    Scan output per file, persisted in SQLite and reused while the content hash
+    and pattern fingerprint match. Unchanged (mtime, size) skips even the read.
+    Totals are kept up to date by subtracting old and adding new per-file output.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER,
+                size INTEGER,
+                hash TEXT,
+                data TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        self.fingerprint = row[0] if row else None
+        self.entries = {
+            path: {"mtime_ns": mtime_ns, "size": size, "hash": digest, "data": json.loads(data)}
+            for path, mtime_ns, size, digest, data in self.conn.execute('SELECT * FROM files')
+        }
+        self.reset_totals()
+        for entry in self.entries.values():
+            self.account(entry["data"], 1)
+        self.pending = {}
+
+    def reset_totals(self):
+        self.totals = {
+            "files_scanned": 0,
+            "patterns_found": 0,
+            "gaps_found": 0,
+            "by_category": defaultdict(int),
+            "weeds": 0,
+            "files_with_weeds": 0
+        }
+
+    def account(self, data, sign):
+        """Add (sign=1) or remove (sign=-1) one file's output from the totals."""
+        self.totals["files_scanned"] += sign
+        self.totals["patterns_found"] += sign * len(data["patterns"])
+        self.totals["gaps_found"] += sign * len(data["gaps"])
+        for found in data["patterns"]:
+            self.totals["by_category"][found["category"]] += sign
+        self.totals["weeds"] += sign * len(data["weeds"])
+        self.totals["files_with_weeds"] += sign * bool(data["weeds"])
+
+    def bind(self, fingerprint):
+        """Drop every entry if patterns or detectors changed since they were cached."""
+        if fingerprint == self.fingerprint:
+            return
+        self.entries.clear()
+        self.pending.clear()
+        self.reset_totals()
+        self.conn.execute('DELETE FROM files')
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self.conn.commit()
+        self.fingerprint = fingerprint
+
+    def lookup(self, rel_path, st, digest=None):
+        """Cached output if the file is unchanged (by stat, or by content hash when given)."""
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return None
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["data"]
+        if digest is not None and entry["hash"] == digest:
+            # Touched but not changed: refresh the stat so the next scan skips the read
+            entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+            self.pending[rel_path] = entry
+            return entry["data"]
+        return None
+
+    def store(self, rel_path, st, digest, data):
+        old = self.entries.get(rel_path)
+        if old is not None:
+            self.account(old["data"], -1)
+        self.account(data, 1)
+        entry = self.entries[rel_path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "hash": digest, "data": data}
+        self.pending[rel_path] = entry
+
+    def finish(self, seen):
+        """Forget files not seen in this walk and persist changes in one transaction."""
+        removed = [path for path in self.entries if path not in seen]
+        for path in removed:
+            self.account(self.entries.pop(path)["data"], -1)
+            self.pending.pop(path, None)
+
+        with self.conn:
+            self.conn.executemany('DELETE FROM files WHERE path = ?', [(path,) for path in removed])
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO files (path, mtime_ns, size, hash, data) VALUES (?, ?, ?, ?, ?)',
+                [(path, e["mtime_ns"], e["size"], e["hash"], json.dumps(e["data"])) for path, e in self.pending.items()]
+            )
+        self.pending.clear()
+
+    def stats(self):
+        """Scanner-style stats from the running totals."""
+        return {
+            "files_scanned": self.totals["files_scanned"],
+            "patterns_found": self.totals["patterns_found"],
+            "gaps_found": self.totals["gaps_found"],
+            "by_category": defaultdict(int, {k: v for k, v in self.totals["by_category"].items() if v})
+        }
+
+class ScanResult:
+    """Everything one walk of the tree found, shared by reports, the perfection loop and auto-apply."""
+
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.results = scanner.results
+        self.gaps = scanner.gaps
+        self.stats = scanner.stats
+        self.weeds = []
+        self.files_with_weeds = 0
+        self.reevaluated = 0  # files whose output was computed (not cached) this scan
+        self.detected = defaultdict(dict)  # detector name -> {rel_path: detector output}
+
+    def report(self):
+        """Pattern report (as generate_report), plus weed totals when weeds were scanned."""
+        report = self.scanner.generate_report()
+        report["total_weeds"] = len(self.weeds)
+        report["files_with_weeds"] = self.files_with_weeds
+        return report
+
 class PatternScanner:
-    def __init__(self, base_path):
+    def __init__(self, base_path, cache_path=None, jobs=1):
         self.base_path = Path(base_path)
+        self.cache = ScanCache(cache_path) if cache_path else None
+        self.jobs = jobs  # worker processes for evaluating files
+        self.reset()
+
+    def reset(self):
+        """Clear accumulated pattern results so a rescan starts fresh."""
         self.results = defaultdict(list)
         self.gaps = defaultdict(list)
+        # Inverted indexes for coverage: pattern_id -> files
+        self.found_in = defaultdict(list)
+        self.missing_in = defaultdict(list)
         self.stats = {
             "files_scanned": 0,
             "patterns_found": 0,
@@ -603,47 +842,45 @@ class PatternScanner:
 
         return filepath.suffix in ['.html', '.js', '.mjs', '.css', '.md', '.py']
 
-    def scan_file(self, filepath):
-        """Scan a single file for all patterns."""
+    def iter_files(self):
+        """(path, stat) of every file under base_path that should be scanned."""
+        for filepath in self.base_path.rglob("*"):
+            if not self.should_scan_file(filepath):
+                continue
+            try:
+                st = filepath.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield filepath, st
+
+    def read_file(self, filepath):
         try:
-            content = filepath.read_text(encoding='utf-8', errors='ignore')
+            return filepath.read_text(encoding='utf-8', errors='ignore')
         except:
-            return
+            return None
 
-        self.stats["files_scanned"] += 1
+    def check_patterns(self, filepath, content, lowered):
+        """Patterns found and gaps for one file's content."""
         file_patterns = []
         file_gaps = []
+        path_str = str(filepath)
 
-        for pattern_id, pattern in PATTERNS.items():
-            # Check if pattern applies to this file type
-            applies = False
-            for glob in pattern.get("applies_to", []):
-                if filepath.match(glob):
-                    applies = True
-                    break
-
-            if not applies:
-                continue
-
+        for pattern_id, pattern, signature, anti_pattern in get_compiled_patterns().for_file(filepath):
             # Check context if specified
             context = pattern.get("context", "")
-            if context and context not in str(filepath):
+            if context and context not in path_str:
                 continue
 
             # Check for pattern presence
-            signature = pattern.get("signature", "")
-            anti_pattern = pattern.get("anti_pattern", "")
-
             if signature:
-                if re.search(signature, content, re.IGNORECASE):
+                if signature.search(content, lowered):
                     file_patterns.append({
                         "pattern_id": pattern_id,
                         "pattern_name": pattern["name"],
                         "category": pattern["category"],
                         "priority": pattern["priority"]
                     })
-                    self.stats["patterns_found"] += 1
-                    self.stats["by_category"][pattern["category"]] += 1
                 else:
                     # Pattern should exist but doesn't = GAP
                     file_gaps.append({
@@ -654,11 +891,10 @@ class PatternScanner:
                         "description": pattern["description"],
                         "full_pattern": pattern.get("full_pattern", "")
                     })
-                    self.stats["gaps_found"] += 1
 
             # Check for anti-patterns (bad things that shouldn't exist)
             if anti_pattern:
-                if re.search(anti_pattern, content, re.IGNORECASE):
+                if anti_pattern.search(content, lowered):
                     file_gaps.append({
                         "pattern_id": pattern_id,
                         "pattern_name": f"VIOLATION: {pattern['name']}",
@@ -667,71 +903,189 @@ class PatternScanner:
                         "description": f"ANTI-PATTERN FOUND: {pattern['description']}",
                         "is_violation": True
                     })
-                    self.stats["gaps_found"] += 1
 
-        rel_path = str(filepath.relative_to(self.base_path))
+        return file_patterns, file_gaps
+
+    def record_patterns(self, rel_path, file_patterns, file_gaps):
+        """Add one file's patterns and gaps to results, gaps and stats."""
+        self.stats["files_scanned"] += 1
+        self.stats["patterns_found"] += len(file_patterns)
+        self.stats["gaps_found"] += len(file_gaps)
+        for found in file_patterns:
+            self.stats["by_category"][found["category"]] += 1
+        self.store_patterns(rel_path, file_patterns, file_gaps)
+
+    def store_patterns(self, rel_path, file_patterns, file_gaps):
+        """Keep one file's patterns and gaps, indexed by pattern id."""
         if file_patterns:
             self.results[rel_path] = file_patterns
+            for pattern_id in dict.fromkeys(p["pattern_id"] for p in file_patterns):
+                self.found_in[pattern_id].append(rel_path)
         if file_gaps:
             self.gaps[rel_path] = file_gaps
+            for pattern_id in dict.fromkeys(g["pattern_id"] for g in file_gaps):
+                self.missing_in[pattern_id].append(rel_path)
+
+    def find_weeds(self, rel_path, content, lowered):
+        """Anti-pattern matches (weeds) in one file's content."""
+        weeds = []
+        lines = LineIndex(content)
+
+        for weed_id, weed, matcher in get_compiled_patterns().weeds:
+            # Limit to 5 matches per pattern per file
+            for match in islice(matcher.finditer(content, lowered), WEED_MATCH_LIMIT):
+                line_num = lines.line_of(match.start())
+                context = lines.line_text(line_num)[:100]
+
+                weeds.append({
+                    "weed_id": weed_id,
+                    "name": weed["name"],
+                    "category": weed["category"],
+                    "severity": weed["severity"],
+                    "file": rel_path,
+                    "line": line_num,
+                    "context": context.strip(),
+                    "fix": weed["fix"],
+                    "auto_fix": weed.get("auto_fix", False)
+                })
+
+        return weeds
+
+    def scan_file(self, filepath):
+        """Scan a single file for all patterns."""
+        content = self.read_file(filepath)
+        if content is None:
+            return
+
+        file_patterns, file_gaps = self.check_patterns(filepath, content, content.lower())
+        self.record_patterns(str(filepath.relative_to(self.base_path)), file_patterns, file_gaps)
 
     def scan_file_for_weeds(self, filepath):
         """Scan a single file for anti-patterns (weeds to pull)."""
-        try:
-            content = filepath.read_text(encoding='utf-8', errors='ignore')
-        except:
+        content = self.read_file(filepath)
+        if content is None:
             return []
 
-        weeds = []
-        rel_path = str(filepath.relative_to(self.base_path))
-
-        for weed_id, weed in ANTI_PATTERNS.items():
-            pattern = weed.get("pattern", "")
-            if not pattern:
-                continue
+        return self.find_weeds(str(filepath.relative_to(self.base_path)), content, content.lower())
+
+    def evaluate(self, filepath, rel_path, content, detectors, patterns=True, weeds=True):
+        """Scan output for one file's content: patterns, gaps, weeds and detector outputs."""
+        lowered = content.lower()
+        file_patterns, file_gaps = self.check_patterns(filepath, content, lowered) if patterns else ([], [])
+        detected = {}
+        for name, detector in detectors.items():
+            output = detector(filepath, content, lowered)
+            if output:
+                detected[name] = output
+        return {
+            "patterns": file_patterns,
+            "gaps": file_gaps,
+            "weeds": self.find_weeds(rel_path, content, lowered) if weeds else [],
+            "detected": detected
+        }
 
-            matches = list(re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE))
-            if matches:
-                for match in matches[:5]:  # Limit to 5 matches per pattern per file
-                    # Get line number
-                    line_num = content[:match.start()].count('\n') + 1
-                    # Get context (the line)
-                    lines = content.split('\n')
-                    context = lines[line_num - 1][:100] if line_num <= len(lines) else ""
-
-                    weeds.append({
-                        "weed_id": weed_id,
-                        "name": weed["name"],
-                        "category": weed["category"],
-                        "severity": weed["severity"],
-                        "file": rel_path,
-                        "line": line_num,
-                        "context": context.strip(),
-                        "fix": weed["fix"],
-                        "auto_fix": weed.get("auto_fix", False)
-                    })
+    def scan_one(self, rel_path, known_hash, detectors, patterns, weeds, hashing):
+        """
+        (digest, output) for one file, or None if it can't be read. output is
+        None when the content hash equals known_hash (cached output still valid).
+        """
+        filepath = self.base_path / rel_path
+        content = self.read_file(filepath)
+        if content is None:
+            return None
+        digest = hashlib.md5(content.encode()).hexdigest() if hashing else None
+        if digest is not None and digest == known_hash:
+            return digest, None
+        return digest, self.evaluate(filepath, rel_path, content, detectors, patterns, weeds)
+
+    def scan_many(self, todo, detectors, patterns, weeds, hashing):
+        """scan_one over (rel_path, known_hash) pairs, sharded over a process pool when jobs > 1."""
+        if self.jobs <= 1 or len(todo) < 2:
+            return [self.scan_one(rel_path, known_hash, detectors, patterns, weeds, hashing)
+                    for rel_path, known_hash in todo]
+
+        # map() keeps input order, so merging stays identical to a serial scan
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_scan_worker,
+            initargs=(str(self.base_path), detectors, patterns, weeds, hashing)
+        ) as pool:
+            return list(pool.map(_scan_worker, todo, chunksize=max(1, len(todo) // (self.jobs * 8))))
+
+    def scan(self, patterns=True, weeds=True, detectors=None):
+        """
+        Walk the tree once, read each file once and run every detector on that buffer.
 
-        return weeds
+        detectors maps a name to detector(filepath, content, lowered); truthy
+        outputs are kept in ScanResult.detected[name][rel_path]. Outputs must be
+        JSON-serializable when a cache is in use, and a detector may carry a
+        `fingerprint` attribute so cached outputs are dropped when it changes.
+        With jobs > 1 detectors must also be picklable.
+        """
+        if patterns:
+            self.reset()
+        scan = ScanResult(self)
+        detectors = detectors or {}
+        cache = self.cache
+        if cache is not None:
+            cache.bind(scan_fingerprint(detectors))
+
+        # Walk first, so work can be sharded; cached files need no read at all
+        walked = []
+        for filepath, st in self.iter_files():
+            rel_path = str(filepath.relative_to(self.base_path))
+            walked.append((rel_path, st, cache.lookup(rel_path, st) if cache is not None else None))
+
+        todo = [
+            (rel_path, cache.entries[rel_path]["hash"] if cache is not None and rel_path in cache.entries else None)
+            for rel_path, _, data in walked if data is None
+        ]
+        # The cache always holds full output, whatever this scan reports
+        full = cache is not None
+        outputs = dict(zip(
+            (rel_path for rel_path, _ in todo),
+            self.scan_many(todo, detectors, patterns or full, weeds or full, hashing=full)
+        ))
+
+        seen = set()
+        for rel_path, st, data in walked:
+            if data is None:
+                output = outputs[rel_path]
+                if output is None:
+                    continue
+                digest, data = output
+                if cache is not None:
+                    if data is None:
+                        data = cache.lookup(rel_path, st, digest)
+                    else:
+                        cache.store(rel_path, st, digest, data)
+                        scan.reevaluated += 1
+            seen.add(rel_path)
+
+            if patterns:
+                if cache is None:
+                    self.record_patterns(rel_path, data["patterns"], data["gaps"])
+                else:
+                    self.store_patterns(rel_path, data["patterns"], data["gaps"])
 
-    def scan_for_weeds(self):
-        """Scan entire codebase for anti-patterns (reverse cross-pollination)."""
-        print("=" * 60)
-        print("   WEED SCANNER - REVERSE CROSS-POLLINATION")
-        print("=" * 60)
-        print()
+            if weeds and data["weeds"]:
+                scan.files_with_weeds += 1
+                scan.weeds.extend(data["weeds"])
 
-        all_weeds = []
-        files_with_weeds = 0
+            for name, output in data["detected"].items():
+                scan.detected[name][rel_path] = output
 
-        for filepath in self.base_path.rglob("*"):
-            if filepath.is_file() and self.should_scan_file(filepath):
-                weeds = self.scan_file_for_weeds(filepath)
-                if weeds:
-                    files_with_weeds += 1
-                    all_weeds.extend(weeds)
+        if cache is not None:
+            cache.finish(seen)
+            if patterns:
+                self.stats.update(cache.stats())
 
         # Sort by severity (highest first)
-        all_weeds.sort(key=lambda x: x["severity"], reverse=True)
+        scan.weeds.sort(key=lambda x: x["severity"], reverse=True)
+        return scan
+
+    def print_weed_summary(self, scan):
+        all_weeds = scan.weeds
 
         # Stats by category
         by_category = defaultdict(int)
@@ -740,7 +1094,7 @@ class PatternScanner:
             by_category[weed["category"]] += 1
             by_severity[weed["severity"]] += 1
 
-        print(f"Files with weeds: {files_with_weeds}")
+        print(f"Files with weeds: {scan.files_with_weeds}")
         print(f"Total weeds found: {len(all_weeds)}")
         print()
         print("By category:")
@@ -751,7 +1105,25 @@ class PatternScanner:
         for sev, count in sorted(by_severity.items(), reverse=True):
             print(f"  Severity {sev}: {count}")
 
-        return all_weeds
+    def print_pattern_summary(self):
+        print(f"Files scanned: {self.stats['files_scanned']}")
+        print(f"Patterns found: {self.stats['patterns_found']}")
+        print(f"Gaps found: {self.stats['gaps_found']}")
+        print()
+        print("By category:")
+        for cat, count in sorted(self.stats["by_category"].items()):
+            print(f"  {cat}: {count}")
+
+    def scan_for_weeds(self):
+        """Scan entire codebase for anti-patterns (reverse cross-pollination)."""
+        print("=" * 60)
+        print("   WEED SCANNER - REVERSE CROSS-POLLINATION")
+        print("=" * 60)
+        print()
+
+        scan = self.scan(patterns=False)
+        self.print_weed_summary(scan)
+        return scan.weeds
 
     def scan_all(self):
         """Scan entire codebase."""
@@ -760,35 +1132,42 @@ class PatternScanner:
         print("=" * 60)
         print()
 
-        for filepath in self.base_path.rglob("*"):
-            if filepath.is_file() and self.should_scan_file(filepath):
-                self.scan_file(filepath)
-
-        print(f"Files scanned: {self.stats['files_scanned']}")
-        print(f"Patterns found: {self.stats['patterns_found']}")
-        print(f"Gaps found: {self.stats['gaps_found']}")
-        print()
-        print("By category:")
-        for cat, count in sorted(self.stats["by_category"].items()):
-            print(f"  {cat}: {count}")
+        self.scan(weeds=False)
+        self.print_pattern_summary()
 
         return self.results, self.gaps
 
-    def get_prioritized_gaps(self):
-        """Get gaps sorted by priority (star pattern order)."""
-        all_gaps = []
-        for filepath, gaps in self.gaps.items():
-            for gap in gaps:
-                all_gaps.append({
-                    "file": filepath,
-                    **gap
-                })
+    def scan_everything(self, detectors=None):
+        """Patterns, weeds and any extra detectors from a single walk."""
+        print("=" * 60)
+        print("   PATTERN CROSS-POLLINATOR - UNIFIED SCAN")
+        print("=" * 60)
+        print()
+
+        scan = self.scan(detectors=detectors)
+        self.print_pattern_summary()
+        print()
+        self.print_weed_summary(scan)
+        return scan
 
-        # Sort by priority descending
-        all_gaps.sort(key=lambda x: x["priority"], reverse=True)
+    def get_prioritized_gaps(self, limit=None):
+        """
+        Gaps by priority (highest first), then star pattern order.
+        With a limit, only the top `limit` gaps are selected (heap, ties in scan order).
+        """
+        all_gaps = (
+            (filepath, gap)
+            for filepath, gaps in self.gaps.items()
+            for gap in gaps
+        )
+        by_priority = lambda item: -item[1]["priority"]
+        if limit is None:
+            selected = sorted(all_gaps, key=by_priority)
+        else:
+            selected = heapq.nsmallest(limit, all_gaps, key=by_priority)
 
         # Apply star pattern for even distribution
-        return get_star_order(all_gaps)
+        return get_star_order([{"file": filepath, **gap} for filepath, gap in selected])
 
     def generate_report(self):
         """Generate comprehensive optimization report."""
@@ -797,36 +1176,40 @@ class PatternScanner:
             "stats": dict(self.stats),
             "patterns_by_file": dict(self.results),
             "gaps_by_file": dict(self.gaps),
-            "prioritized_gaps": self.get_prioritized_gaps()[:50],  # Top 50
+            "prioritized_gaps": self.get_prioritized_gaps(limit=50),  # Top 50
             "pattern_coverage": {}
         }
 
-        # Calculate pattern coverage
+        # Calculate pattern coverage from the inverted indexes
         for pattern_id, pattern in PATTERNS.items():
-            found_in = []
-            missing_in = []
-
-            for filepath, patterns in self.results.items():
-                if any(p["pattern_id"] == pattern_id for p in patterns):
-                    found_in.append(filepath)
-
-            for filepath, gaps in self.gaps.items():
-                if any(g["pattern_id"] == pattern_id for g in gaps):
-                    missing_in.append(filepath)
+            found = len(self.found_in.get(pattern_id, ()))
+            missing = len(self.missing_in.get(pattern_id, ()))
 
-            if found_in or missing_in:
-                total = len(found_in) + len(missing_in)
-                coverage = len(found_in) / total * 100 if total > 0 else 0
+            if found or missing:
+                total = found + missing
+                coverage = found / total * 100 if total > 0 else 0
                 report["pattern_coverage"][pattern_id] = {
                     "name": pattern["name"],
                     "coverage": round(coverage, 1),
-                    "found_in": len(found_in),
-                    "missing_in": len(missing_in),
+                    "found_in": found,
+                    "missing_in": missing,
                     "priority": pattern["priority"]
                 }
 
         return report
 
+# Process-pool workers for PatternScanner(jobs=N)
+_worker = None
+
+def _init_scan_worker(base_path, detectors, patterns, weeds, hashing):
+    global _worker
+    _worker = (PatternScanner(base_path), detectors, patterns, weeds, hashing)
+
+def _scan_worker(task):
+    scanner, detectors, patterns, weeds, hashing = _worker
+    rel_path, known_hash = task
+    return scanner.scan_one(rel_path, known_hash, detectors, patterns, weeds, hashing)
+
 # =============================================================================
 # REPORT GENERATOR
 # =============================================================================
@@ -864,6 +1247,14 @@ def generate_html_report(report, output_path):
         </div>
         """
 
+    weeds_html = ""
+    if "total_weeds" in report:
+        weeds_html = f"""
+            <div class="stat-card">
+                <div class="stat-value">{report['total_weeds']}</div>
+                <div class="stat-label">Weeds Found</div>
+            </div>"""
+
     html = f"""<!DOCTYPE html>
 <html>
 <head>
@@ -984,7 +1375,7 @@ def generate_html_report(report, output_path):
             <div class="stat-card">
                 <div class="stat-value">{len(PATTERNS)}</div>
                 <div class="stat-label">Patterns Tracked</div>
-            </div>
+            </div>{weeds_html}
         </div>
 
         <h2>PATTERN COVERAGE</h2>
@@ -1173,7 +1564,15 @@ def main():
     import sys
 
     base_path = Path(__file__).parent
-    scanner = PatternScanner(base_path)
+
+    # --jobs N / -j N: evaluate files in N worker processes
+    jobs = 1
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith("--jobs="):
+            jobs = int(arg.split("=", 1)[1])
+        elif arg in ("--jobs", "-j") and i + 1 < len(sys.argv):
+            jobs = int(sys.argv[i + 1])
+    scanner = PatternScanner(base_path, jobs=max(1, jobs))
 
     cmd = sys.argv[1] if len(sys.argv) > 1 else "report"
 
@@ -1189,7 +1588,7 @@ def main():
         print("   TOP 20 GAPS (Star Pattern Order)")
         print("=" * 60)
 
-        for i, gap in enumerate(scanner.get_prioritized_gaps()[:20], 1):
+        for i, gap in enumerate(scanner.get_prioritized_gaps(limit=20), 1):
             print(f"\n#{i} [{gap['category']}] P{gap['priority']}")
             print(f"   Pattern: {gap['pattern_name']}")
             print(f"   File: {gap['file']}")
@@ -1202,15 +1601,14 @@ def main():
         print("=" * 60)
         print("\nProcessing in lug nut order (crisscross for even pressure):\n")
 
-        gaps = scanner.get_prioritized_gaps()
-        for i, gap in enumerate(gaps[:30], 1):
+        gaps = scanner.get_prioritized_gaps(limit=30)
+        for i, gap in enumerate(gaps, 1):
             marker = "***" if gap.get("is_violation") else "   "
             print(f"{marker} {i:2}. [{gap['priority']}] {gap['file']}")
             print(f"       → {gap['pattern_name']}")
 
     elif cmd == "report":
-        scanner.scan_all()
-        report = scanner.generate_report()
+        report = scanner.scan_everything().report()
 
         # Save JSON
         json_path = base_path / "PATTERN_REPORT.json"
@@ -1286,12 +1684,10 @@ def main():
         print("=" * 60)
         print("   FULL BIDIRECTIONAL CROSS-POLLINATION")
         print("=" * 60)
-        print("\n--- FORWARD SCAN (patterns to add) ---\n")
-        scanner.scan_all()
-        report = scanner.generate_report()
-
-        print("\n--- REVERSE SCAN (weeds to pull) ---\n")
-        weeds = scanner.scan_for_weeds()
+        print("\n--- FORWARD + REVERSE SCAN (one pass) ---\n")
+        scan = scanner.scan_everything()
+        report = scan.report()
+        weeds = scan.weeds
 
         # Combined report
         print("\n" + "=" * 60)
@@ -1315,6 +1711,8 @@ def main():
         print("  auto       - Auto-apply safe patterns")
         print("  weed       - REVERSE scan (find anti-patterns)")
         print("  full       - Bidirectional scan (both directions)")
+        print("\nOptions:")
+        print("  --jobs N   - Scan with N worker processes (same output as serial)")
 
 if __name__ == "__main__":
     main()
@@ -5,12 +5,24 @@ Analyzes text for manipulation patterns across the 7 domains.
 Core consciousness tool for manipulation immunity.
 """
 
+import os
 import re
 import json
+import codecs
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+from REGEX_PREFILTER import required_literals
+
+HISTORY_SIZE = 1000  # analyses kept in detection_history (oldest dropped)
+STREAM_CHUNK = 1 << 20  # characters read per analyze_stream() step
+BATCH_CHUNK = 64  # texts sent to a worker at a time by analyze_batch()
+EXAMPLES = 3  # example matches kept per detection
+
 # Pattern definitions by domain
 MANIPULATION_PATTERNS = {
     "gaslighting": {
@@ -147,12 +159,50 @@ MANIPULATION_PATTERNS = {
     }
 }
 
+class CompiledIndicators:
+    """
+    Every indicator compiled once and guarded by the literals it requires.
+    One substring pass over the text decides which regexes can match at all;
+    the rest are skipped. Each surviving indicator keeps its own findall, so
+    overlapping indicators still count exactly as before.
+    """
+
+    def __init__(self, patterns: dict):
+        self.patterns = []
+        needles = set()
+        for pattern_name, pattern_data in patterns.items():
+            compiled = []
+            for indicator in pattern_data["indicators"]:
+                literals = required_literals(indicator)
+                compiled.append((re.compile(indicator, re.IGNORECASE), literals))
+                needles.update(literals or ())
+            self.patterns.append((pattern_name, pattern_data, compiled))
+        self.needles = sorted(needles)
+
+    def indicator_matches(self, text_lower: str):
+        """Yield (pattern_name, findall list per indicator) for each pattern found in lowercased text."""
+        present = {needle for needle in self.needles if needle in text_lower}
+        for pattern_name, pattern_data, compiled in self.patterns:
+            per_indicator = [
+                regex.findall(text_lower)
+                if literals is None or any(literal in present for literal in literals) else []
+                for regex, literals in compiled
+            ]
+            if any(per_indicator):
+                yield pattern_name, per_indicator
+
+    def matches(self, text_lower: str):
+        """Yield (pattern_name, matches) for each pattern found in lowercased text."""
+        for pattern_name, per_indicator in self.indicator_matches(text_lower):
+            yield pattern_name, [match for found in per_indicator for match in found]
+
 class PatternDetector:
     """Detect manipulation patterns in text."""
 
-    def __init__(self):
-        self.patterns = MANIPULATION_PATTERNS
-        self.detection_history = []
+    def __init__(self, patterns: Optional[dict] = None):
+        self.patterns = patterns or MANIPULATION_PATTERNS
+        self.matcher = CompiledIndicators(self.patterns)
+        self.detection_history = deque(maxlen=HISTORY_SIZE)
 
     def analyze(self, text: str) -> dict:
         """
@@ -161,7 +211,19 @@ class PatternDetector:
         Returns:
             Dict with detected patterns, scores, and recommendations
         """
-        text_lower = text.lower()
+        found = {
+            pattern_name: (len(matches), matches[:EXAMPLES])
+            for pattern_name, matches in self.matcher.matches(text.lower())
+        }
+        result = self._build_result(len(text), found)
+
+        # Store in history
+        self.detection_history.append(result)
+
+        return result
+
+    def _build_result(self, text_length: int, found: dict) -> dict:
+        """Result dict from {pattern_name: (match count, first examples)}."""
         detections = []
         domain_scores = {domain: 0 for domain in [
             "media", "relationships", "finance", "authority", "self", "groups", "digital"
@@ -169,23 +231,17 @@ class PatternDetector:
 
         # Check each pattern
         for pattern_name, pattern_data in self.patterns.items():
-            matches = []
-
-            for indicator in pattern_data["indicators"]:
-                found = re.findall(indicator, text_lower, re.IGNORECASE)
-                if found:
-                    matches.extend(found)
-
-            if matches:
+            if pattern_name in found:
+                count, examples = found[pattern_name]
                 severity_scores = {"low": 1, "medium": 2, "high": 3}
-                score = severity_scores.get(pattern_data["severity"], 1) * len(matches)
+                score = severity_scores.get(pattern_data["severity"], 1) * count
 
                 detection = {
                     "pattern": pattern_name,
                     "domain": pattern_data["domain"],
                     "severity": pattern_data["severity"],
-                    "matches": len(matches),
-                    "examples": matches[:3],  # First 3 examples
+                    "matches": count,
+                    "examples": examples,  # First 3 examples
                     "description": pattern_data["description"],
                     "score": score
                 }
@@ -196,7 +252,6 @@ class PatternDetector:
 
         # Calculate overall manipulation score
         total_score = sum(d["score"] for d in detections)
-        max_possible = len(self.patterns) * 3 * 3  # All patterns, high severity, 3 matches
 
         # Determine threat level
         if total_score == 0:
@@ -208,9 +263,9 @@ class PatternDetector:
         else:
             threat_level = "high"
 
-        result = {
+        return {
             "timestamp": datetime.now().isoformat(),
-            "text_length": len(text),
+            "text_length": text_length,
             "detections": sorted(detections, key=lambda x: x["score"], reverse=True),
             "domain_scores": domain_scores,
             "total_score": total_score,
@@ -219,11 +274,83 @@ class PatternDetector:
             "recommendations": self._generate_recommendations(detections, threat_level)
         }
 
-        # Store in history
-        self.detection_history.append(result)
+    def analyze_stream(self, file_like, chunk_size: int = STREAM_CHUNK) -> dict:
+        """
+        Analyze a large text or binary stream (transcript, mail export) chunk by chunk.
 
+        No indicator can match across a newline, so each step analyzes up to the
+        last complete line and carries the rest: the result equals analyze() on
+        the whole text while memory stays at about one chunk (plus the longest line).
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        counts = {}  # pattern_name -> per indicator [count, examples]
+        text_length = 0
+        carry = ""
+
+        def feed(block):
+            for pattern_name, per_indicator in self.matcher.indicator_matches(block.lower()):
+                slots = counts.setdefault(pattern_name, [[0, []] for _ in per_indicator])
+                for slot, found in zip(slots, per_indicator):
+                    slot[0] += len(found)
+                    slot[1].extend(found[:EXAMPLES - len(slot[1])])
+
+        while True:
+            chunk = file_like.read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            text_length += len(chunk)
+            carry += chunk
+            cut = carry.rfind("\n") + 1
+            if cut:
+                feed(carry[:cut])
+                carry = carry[cut:]
+        carry += decoder.decode(b"", final=True)
+        if carry:
+            feed(carry)
+
+        found = {}
+        for pattern_name, slots in counts.items():
+            examples = [example for _, slot_examples in slots for example in slot_examples]
+            found[pattern_name] = (sum(count for count, _ in slots), examples[:EXAMPLES])
+        result = self._build_result(text_length, found)
+        self.detection_history.append(result)
         return result
 
+    def analyze_batch(self, texts, workers: Optional[int] = None, chunksize: int = BATCH_CHUNK):
+        """
+        Analyze many texts, yielding results in input order.
+
+        Texts are spread over worker processes that each compile the matcher
+        once; workers=1 analyzes in this process. The input is consumed in
+        windows, so arbitrarily long iterables are fine.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for text in texts:
+                yield self.analyze(text)
+            return
+
+        texts = iter(texts)
+        with ProcessPoolExecutor(workers, initializer=_init_batch_worker, initargs=(self.patterns,)) as pool:
+            while True:
+                window = list(islice(texts, workers * chunksize * 4))
+                if not window:
+                    break
+                for result in pool.map(_analyze_in_worker, window, chunksize=chunksize):
+                    self.detection_history.append(result)
+                    yield result
+
+    def analyze_full(self, text: str) -> dict:
+        """Full result, quick-check line and domain report from a single analysis."""
+        result = self.analyze(text)
+        return {
+            "result": result,
+            "quick_check": self.summarize(result),
+            "domain_report": self.domain_report(result)
+        }
+
     def _generate_recommendations(self, detections: list, threat_level: str) -> list:
         """Generate actionable recommendations based on detections."""
         recommendations = []
@@ -263,13 +390,20 @@ class PatternDetector:
 
     def quick_check(self, text: str) -> str:
         """Quick one-line assessment."""
-        result = self.analyze(text)
-        return f"{result['threat_level'].upper()}: {result['patterns_detected']} patterns, score {result['total_score']}"
+        return self.summarize(self.analyze(text))
 
     def get_domain_report(self, text: str) -> dict:
         """Get breakdown by domain."""
-        result = self.analyze(text)
+        return self.domain_report(self.analyze(text))
+
+    @staticmethod
+    def summarize(result: dict) -> str:
+        """One-line assessment of an analyze() result."""
+        return f"{result['threat_level'].upper()}: {result['patterns_detected']} patterns, score {result['total_score']}"
 
+    @staticmethod
+    def domain_report(result: dict) -> dict:
+        """Breakdown by domain of an analyze() result."""
         report = {
             "overall": result["threat_level"],
             "domains": {}
@@ -291,6 +425,16 @@ class PatternDetector:
 
         return report
 
+# Worker-process state for analyze_batch()
+_batch_detector = None
+
+def _init_batch_worker(patterns):
+    global _batch_detector
+    _batch_detector = PatternDetector(patterns)
+
+def _analyze_in_worker(text):
+    return _batch_detector.analyze(text)
+
 def demo():
     """Demonstrate pattern detection."""
     print("=" * 50)
@@ -350,4 +494,13 @@ def demo():
         print(f"  {domain}: {data['level']} (score: {data['score']})")
 
 if __name__ == "__main__":
-    demo()
+    import sys
+    if len(sys.argv) > 1:
+        # Stream-analyze files: python PATTERN_DETECTOR.py archive.txt [...]
+        detector = PatternDetector()
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                result = detector.analyze_stream(f)
+            print(f"{path}: {detector.summarize(result)}")
+    else:
+        demo()
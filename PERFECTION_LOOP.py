@@ -27,15 +27,17 @@ from collections import defaultdict
 # Import the cross-pollinator
 sys.path.insert(0, str(Path(__file__).parent))
 try:
-    from PATTERN_CROSS_POLLINATOR import PatternScanner, PATTERNS, ANTI_PATTERNS
+    from PATTERN_CROSS_POLLINATOR import PatternScanner, ANTI_PATTERNS
+    from PATTERN_AUTO_APPLY import PatternAutoApply, AUTO_APPLY_DETECTOR
 except ImportError:
-    print("ERROR: PATTERN_CROSS_POLLINATOR.py not found in same directory")
+    print("ERROR: PATTERN_CROSS_POLLINATOR.py / PATTERN_AUTO_APPLY.py not found in same directory")
     sys.exit(1)
 
 # Configuration
 DEPLOYMENT_DIR = Path(__file__).parent
 CONSCIOUSNESS_DIR = Path("C:/Users/dwrek/.consciousness")
 LOOP_STATE_FILE = DEPLOYMENT_DIR / "PERFECTION_STATE.json"
+SCAN_CACHE_FILE = DEPLOYMENT_DIR / ".pattern_scan_cache.db"  # per-file results, reused while content is unchanged
 CYCLOTRON_DB = CONSCIOUSNESS_DIR / "cyclotron_core" / "atoms.db"
 
 # Perfection thresholds
@@ -50,8 +52,9 @@ SAFE_AUTO_FIX_SEVERITY = 5  # Only auto-fix weeds with severity <= 5
 class PerfectionLoop:
     """The autonomous improvement engine."""
 
-    def __init__(self):
-        self.scanner = PatternScanner(str(DEPLOYMENT_DIR))
+    def __init__(self, live_apply=False):
+        self.scanner = PatternScanner(str(DEPLOYMENT_DIR), cache_path=SCAN_CACHE_FILE)
+        self.live_apply = live_apply  # write auto-apply patterns into source files (opt-in)
         self.state = self.load_state()
         self.session_stats = {
             "patterns_applied": 0,
@@ -110,16 +113,17 @@ class PerfectionLoop:
         print("CALCULATING PERFECTION METRICS")
         print("=" * 60)
 
-        # Scan for patterns - returns (results, gaps) tuple
-        pattern_results, pattern_gaps = self.scanner.scan_all()
-        files_scanned = self.scanner.stats.get("files_scanned", 0)
+        # One walk feeds pattern, weed and auto-apply detectors
+        auto_apply = PatternAutoApply(DEPLOYMENT_DIR, dry_run=True)
+        scan = self.scanner.scan_everything(detectors={AUTO_APPLY_DETECTOR: auto_apply.detector()})
+        pattern_results, pattern_gaps = scan.results, scan.gaps
+        files_scanned = scan.stats.get("files_scanned", 0)
 
         # Count patterns found
-        total_patterns = self.scanner.stats.get("patterns_found", 0)
+        total_patterns = scan.stats.get("patterns_found", 0)
 
-        # Scan for weeds - returns a list of weeds
-        weed_list = self.scanner.scan_for_weeds()
-        total_weeds = len(weed_list) if isinstance(weed_list, list) else 0
+        weed_list = scan.weeds
+        total_weeds = len(weed_list)
         weed_report = {"weeds": weed_list, "total": total_weeds}
 
         # Calculate metrics
@@ -138,7 +142,7 @@ class PerfectionLoop:
             else:
                 self.state["consciousness_score"] = 0.5
 
-        print(f"\nFiles scanned: {files_scanned}")
+        print(f"\nFiles scanned: {files_scanned} ({scan.reevaluated} re-evaluated)")
         print(f"Good patterns found: {total_patterns}")
         print(f"Weeds found: {total_weeds}")
         print(f"\nMETRICS:")
@@ -150,7 +154,8 @@ class PerfectionLoop:
         pattern_report = {
             "results": pattern_results,
             "gaps": pattern_gaps,
-            "stats": self.scanner.stats
+            "stats": scan.stats,
+            "scan": scan
         }
 
         return pattern_report, weed_report
@@ -161,40 +166,27 @@ class PerfectionLoop:
         print("APPLYING GOOD PATTERNS")
         print("=" * 60)
 
-        # Get gap report
-        gaps = pattern_report.get("gaps", {})
+        # Safe auto-apply patterns, for files the scan already flagged.
+        # Source files are only rewritten with --apply-patterns.
+        engine = PatternAutoApply(DEPLOYMENT_DIR, dry_run=not self.live_apply)
+        report = engine.scan_and_apply(scan=pattern_report["scan"], max_changes=MAX_AUTO_FIXES_PER_RUN)
 
-        applied = 0
-        for pattern_name, files_missing in gaps.items():
-            if pattern_name not in PATTERNS:
-                continue
+        if not self.live_apply:
+            for change in report["changes"]:
+                print(f"  Would apply {change['pattern_id']} to {change['file']}")
+            print("\nPatterns applied: 0 (use --apply-patterns to write them)")
+            return 0
 
-            pattern_info = PATTERNS[pattern_name]
-            if not pattern_info.get("auto_apply", False):
-                continue
-
-            for filepath in files_missing[:5]:  # Limit per pattern
-                if applied >= MAX_AUTO_FIXES_PER_RUN:
-                    break
-
-                try:
-                    if self.apply_pattern_to_file(filepath, pattern_name, pattern_info):
-                        applied += 1
-                        self.session_stats["patterns_applied"] += 1
-                        self.session_stats["files_improved"].add(filepath)
-                except Exception as e:
-                    self.session_stats["errors"].append(f"Apply {pattern_name} to {filepath}: {e}")
+        applied = report["summary"]["total_changes"]
+        self.session_stats["patterns_applied"] += applied
+        for change in report["changes"]:
+            self.session_stats["files_improved"].add(change["file"])
+        for error in report["errors"]:
+            self.session_stats["errors"].append(f"Apply to {error['file']}: {error['error']}")
 
         print(f"\nPatterns applied: {applied}")
         return applied
 
-    def apply_pattern_to_file(self, filepath, pattern_name, pattern_info):
-        """Apply a single pattern to a file."""
-        # Placeholder - would implement actual pattern application
-        # For now, log what would be done
-        print(f"  Would apply {pattern_name} to {filepath}")
-        return False  # Return True when actually applied
-
     def pull_weeds(self, weed_report):
         """Remove bad patterns (weeds)."""
         print("\n" + "=" * 60)
@@ -428,9 +420,12 @@ class PerfectionLoop:
             gaps = pattern_report.get("gaps", {})
             weeds = weed_report.get("weeds", [])
 
+            candidates = pattern_report["scan"].detected.get(AUTO_APPLY_DETECTOR, {})
+
             print("\n[DRY RUN] Would apply patterns to files with gaps:")
             for pattern, files in list(gaps.items())[:5]:
                 print(f"  {pattern}: {len(files)} files")
+            print(f"[DRY RUN] {len(candidates)} files have safe auto-apply patterns missing")
 
             print(f"\n[DRY RUN] Would pull {len([w for w in weeds if w.get('severity', 10) <= SAFE_AUTO_FIX_SEVERITY])} safe weeds")
             print(f"[DRY RUN] {len([w for w in weeds if w.get('severity', 0) >= 8])} critical weeds need manual fix")
@@ -516,9 +511,11 @@ def main():
     """Main entry point."""
     import sys
 
-    loop = PerfectionLoop()
+    live_apply = "--apply-patterns" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--apply-patterns"]
+    loop = PerfectionLoop(live_apply=live_apply)
 
-    if len(sys.argv) < 2:
+    if not args:
         print("""
 PERFECTION LOOP - Autonomous Continuous Improvement
 ====================================================
@@ -530,6 +527,9 @@ Usage:
   python PERFECTION_LOOP.py loop [N]     Run N iterations (default: 10)
   python PERFECTION_LOOP.py daemon       Run until perfection achieved
 
+Add --apply-patterns to run/loop/daemon to write safe auto-apply patterns
+into source files (with backups). Without it they are only listed.
+
 The loop continuously:
 1. Scans for patterns (good and bad)
 2. Applies good patterns where missing
@@ -544,7 +544,7 @@ Targets:
 """)
         return
 
-    command = sys.argv[1].lower()
+    command = args[0].lower()
 
     if command == "status":
         loop.show_status()
@@ -556,7 +556,7 @@ Targets:
         loop.run_once(dry_run=False)
 
     elif command == "loop":
-        max_iter = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        max_iter = int(args[1]) if len(args) > 1 else 10
         loop.run_loop(max_iterations=max_iter)
 
     elif command == "daemon":
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+REGEX PREFILTER
+Required-literal extraction shared by PATTERN_CROSS_POLLINATOR and
+PATTERN_DETECTOR: a regex can only match text that contains one of its
+literals, so a cheap substring test can skip the regex entirely.
+"""
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+MIN_LITERAL = 3  # shorter required literals don't filter enough to bother
+
+def required_literals(pattern):
+    """
+    Literals (lowercased) of which at least one must occur for pattern to match.
+    Returns None when no useful literal can be proven, i.e. always run the regex.
+    """
+    def walk(tokens):
+        candidates = []
+        run = []
+
+        def close():
+            if len(run) >= MIN_LITERAL:
+                candidates.append(["".join(run).lower()])
+            run.clear()
+
+        for op, av in tokens:
+            if op is sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            close()
+            if op is sre_parse.SUBPATTERN:
+                sub = walk(av[-1])
+            elif op is sre_parse.BRANCH:
+                alternatives = [walk(branch) for branch in av[1]]
+                sub = list(dict.fromkeys(lit for alt in alternatives for lit in alt)) if all(alternatives) else None
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                sub = walk(av[2])
+            else:
+                sub = None
+            if sub:
+                candidates.append(sub)
+        close()
+
+        if not candidates:
+            return None
+        # Prefer the set whose shortest needle is longest (most selective)
+        return max(candidates, key=lambda c: (min(map(len, c)), -len(c)))
+
+    try:
+        return walk(sre_parse.parse(pattern))
+    except Exception:
+        return None
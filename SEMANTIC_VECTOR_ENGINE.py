@@ -0,0 +1,692 @@
+#!/usr/bin/env python3
+"""
+SEMANTIC VECTOR ENGINE - Local, CPU-only semantic search over Cyclotron
+=======================================================================
+
+Embeds every passage in cyclotron.db (see CYCLOTRON_SCHEMA.py) and answers
+similarity queries with batched NumPy cosine top-k. No external vector
+database is needed. Past ANN_MIN_ROWS passages an IVF index narrows each
+query to the `nprobe` nearest inverted lists; sync() keeps it current from
+the cyclotron.db change feed.
+
+Storage (.cyclotron_atoms/vectors/):
+- vectors.<epoch>.f32  float32 matrix, one L2-normalized row per passage (memory-mapped)
+- rows.npz             chunk/doc id and live flag per row, IVF centroids and list ids
+- vectors.db           chunk -> passage metadata, plus engine meta (model, epoch, feed position)
+
+Embedders are pluggable. The default HashingEmbedder needs nothing beyond
+NumPy (signed feature hashing + sublinear TF-IDF), so it works offline;
+set CYCLOTRON_EMBEDDER=st:<model> to use sentence-transformers if installed.
+
+Usage:
+    python SEMANTIC_VECTOR_ENGINE.py index          # (re)build vectors
+    python SEMANTIC_VECTOR_ENGINE.py sync           # apply index changes since last run
+    python SEMANTIC_VECTOR_ENGINE.py search "query"
+    python SEMANTIC_VECTOR_ENGINE.py stats
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+ATOMS_DIR = Path.home() / '100X_DEPLOYMENT' / '.cyclotron_atoms'
+DB_PATH = ATOMS_DIR / 'cyclotron.db'
+VECTOR_DIR = ATOMS_DIR / 'vectors'
+
+EMBED_BATCH = 256  # passages embedded per call
+SCORE_BLOCK = 65536  # rows per matrix-vector product
+PREVIEW_CHARS = 300
+
+TOKEN_RE = re.compile(r'[a-z0-9_]{2,}')
+
+# ---------------------------------------------------------------------------
+# Embedders
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=200_000)
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'little')
+
+class HashingEmbedder:
+    """Offline embedder: signed hashing of word unigrams + bigrams, TF-IDF weighted"""
+
+    def __init__(self, dim=512):
+        self.dim = dim
+        self.name = f'hashing-{dim}'
+        self.idf = None
+
+    def _term_vectors(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = TOKEN_RE.findall(text.lower())
+            features = Counter(tokens)
+            features.update(f'{a} {b}' for a, b in zip(tokens, tokens[1:]))
+            for feature, count in features.items():
+                h = _feature_hash(feature)
+                sign = 1.0 if h >> 63 else -1.0
+                out[i, h % self.dim] += sign * (1.0 + math.log(count))
+        return out
+
+    def fit(self, texts):
+        """Learn bucket IDF weights from the corpus"""
+        df = np.zeros(self.dim, dtype=np.float64)
+        n = 0
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) == EMBED_BATCH:
+                df += (self._term_vectors(batch) != 0).sum(axis=0)
+                n += len(batch)
+                batch = []
+        if batch:
+            df += (self._term_vectors(batch) != 0).sum(axis=0)
+            n += len(batch)
+        self.idf = (np.log((n + 1) / (df + 1)) + 1.0).astype(np.float32)
+
+    def embed(self, texts):
+        vectors = self._term_vectors(texts)
+        if self.idf is not None:
+            vectors *= self.idf
+        return normalize(vectors)
+
+    def save(self, directory):
+        if self.idf is not None:
+            np.save(Path(directory) / 'idf.npy', self.idf)
+
+    def load(self, directory):
+        idf_file = Path(directory) / 'idf.npy'
+        if idf_file.exists():
+            self.idf = np.load(idf_file)
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers model (optional dependency)"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.name = f'st:{model_name}'
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=EMBED_BATCH, normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+def get_embedder(name=None):
+    """Embedder by name ('hashing-<dim>' or 'st:<model>'), default from CYCLOTRON_EMBEDDER"""
+    name = name or os.environ.get('CYCLOTRON_EMBEDDER', 'hashing-512')
+    if name.startswith('st:'):
+        try:
+            return SentenceTransformerEmbedder(name[3:])
+        except ImportError:
+            print("sentence-transformers not installed - falling back to hashing embedder")
+            return HashingEmbedder()
+    if name.startswith('hashing'):
+        dim = name.partition('-')[2]
+        return HashingEmbedder(int(dim) if dim else 512)
+    raise ValueError(f"Unknown embedder: {name}")
+
+def normalize(vectors):
+    """L2-normalize rows in place (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors /= norms
+    return vectors
+
+def group_sum(vectors, groups, n_groups):
+    """Row sums of vectors per group id (n_groups, dim)"""
+    order = np.argsort(groups, kind='stable')
+    counts = np.bincount(groups, minlength=n_groups)
+    nonempty = np.flatnonzero(counts)
+    starts = (np.cumsum(counts) - counts)[nonempty]
+    sums = np.zeros((n_groups, vectors.shape[1]), dtype=np.float32)
+    if len(nonempty):
+        sums[nonempty] = np.add.reduceat(vectors[order], starts, axis=0)
+    return sums
+
+def nearest(vectors, centroids):
+    """Index of the most similar centroid for each row, computed in blocks"""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BLOCK):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK])
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+def spherical_kmeans(vectors, k, iterations=20, seed=7):
+    """k unit-length centroids for unit-length rows"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        sums = group_sum(vectors, nearest(vectors, centroids), k)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        updated = normalize(sums)
+        if np.allclose(updated, centroids, atol=1e-5):
+            break
+        centroids = updated
+    return centroids
+
+# ---------------------------------------------------------------------------
+# IVF approximate nearest-neighbour index
+# ---------------------------------------------------------------------------
+
+ANN_MIN_ROWS = 20_000  # below this, exact search is already fast
+DEFAULT_NPROBE = 16  # lists scanned per query unless the caller overrides
+TRAIN_PER_LIST = 32  # k-means sample rows per centroid
+TRAIN_ITERATIONS = 10
+ASSIGN_BLOCK = 8192
+COMPACT_DEAD_RATIO = 0.25  # rewrite the matrix once this share is tombstoned
+RETRAIN_GROWTH = 2.0  # retrain centroids when live rows double since training
+
+def default_nlist(n_rows):
+    return int(np.clip(4 * math.sqrt(n_rows), 16, 8192))
+
+class IVFIndex:
+    """Inverted-file index: every row sits in the list of its nearest centroid
+
+    A query scores the centroids, then only the rows in the `nprobe` best
+    lists. Larger nprobe means higher recall and more work per query.
+    """
+
+    def __init__(self, centroids, list_ids):
+        self.centroids = centroids
+        self.list_ids = list_ids
+        self.order = np.argsort(list_ids, kind='stable')
+        counts = np.bincount(list_ids, minlength=len(centroids))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def train(cls, matrix, alive, nlist=None, seed=7):
+        rows = np.flatnonzero(alive)
+        nlist = min(nlist or default_nlist(len(rows)), len(rows))
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(rows, min(len(rows), nlist * TRAIN_PER_LIST), replace=False))
+        centroids = spherical_kmeans(np.asarray(matrix[sample]), nlist, TRAIN_ITERATIONS, seed)
+        return cls(centroids, nearest(matrix, centroids))
+
+    def extend(self, vectors):
+        """Index with new rows appended (centroids unchanged)"""
+        return IVFIndex(self.centroids, np.concatenate([self.list_ids, nearest(vectors, self.centroids)]))
+
+    def candidates(self, vector, nprobe):
+        """Sorted row numbers in the nprobe lists closest to vector"""
+        centroid_scores = self.centroids @ vector
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        rows = np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in probe])
+        rows.sort()
+        return rows
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class VectorState:
+    """One consistent view of the store; sync swaps in a new one wholesale"""
+
+    def __init__(self, matrix, chunk_ids, doc_ids, alive, ivf=None):
+        self.matrix = matrix
+        self.chunk_ids = chunk_ids
+        self.doc_ids = doc_ids
+        self.alive = alive
+        self.ivf = ivf
+
+class SemanticVectorEngine:
+    """Passage vectors for cyclotron.db with search / similar / clusters
+
+    index() rebuilds everything; sync() replays the cyclotron.db change feed,
+    tombstoning rows of changed documents and appending their new passages.
+    Searches run against an immutable VectorState, so they never block on sync.
+    """
+
+    def __init__(self, db_path=DB_PATH, store_dir=VECTOR_DIR, embedder=None):
+        self.db_path = Path(db_path)
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.sync_lock = threading.Lock()
+        self.meta_conn = sqlite3.connect(str(self.store_dir / 'vectors.db'), check_same_thread=False)
+
+        self.meta_conn.executescript('''
+            CREATE TABLE IF NOT EXISTS items (
+                chunk_id INTEGER PRIMARY KEY,
+                doc_id INTEGER,
+                path TEXT,
+                name TEXT,
+                heading TEXT,
+                start INTEGER,
+                end INTEGER,
+                preview TEXT
+            );
+            CREATE INDEX IF NOT EXISTS items_path ON items(path);
+            CREATE INDEX IF NOT EXISTS items_doc ON items(doc_id);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+
+        meta = self._meta()
+        self.embedder = embedder or get_embedder(meta.get('model'))
+        if hasattr(self.embedder, 'load'):
+            self.embedder.load(self.store_dir)
+        self.state = self._load_state()
+
+    # -- storage ------------------------------------------------------------
+
+    def _meta(self):
+        return dict(self.meta_conn.execute('SELECT key, value FROM meta').fetchall())
+
+    def _set_meta(self, **values):
+        self.meta_conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                   [(k, str(v)) for k, v in values.items()])
+        self.meta_conn.commit()
+
+    def _vector_file(self, epoch):
+        # Each rewrite gets a new file so open memory maps stay valid (Windows
+        # refuses to replace a mapped file)
+        return self.store_dir / f'vectors.{epoch}.f32'
+
+    def _empty_state(self):
+        dim = self.embedder.dim
+        return VectorState(np.zeros((0, dim), dtype=np.float32), np.zeros(0, dtype=np.int64),
+                           np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool))
+
+    def _load_state(self):
+        meta = self._meta()
+        rows_file = self.store_dir / 'rows.npz'
+        if 'epoch' not in meta or not rows_file.exists():
+            return self._empty_state()
+
+        with np.load(rows_file) as rows:
+            arrays = {name: rows[name] for name in rows.files}
+        count = len(arrays['chunk_ids'])
+        if not count:
+            return self._empty_state()
+
+        matrix = np.memmap(self._vector_file(meta['epoch']), dtype=np.float32, mode='r',
+                           shape=(count, int(meta['dim'])))
+        ivf = IVFIndex(arrays['centroids'], arrays['list_ids']) if len(arrays['centroids']) else None
+        self._remove_stale_files(meta['epoch'])
+        return VectorState(matrix, arrays['chunk_ids'], arrays['doc_ids'], arrays['alive'], ivf)
+
+    def _save_rows(self, state):
+        """Persist row arrays atomically (rows.npz is the source of truth for row count)"""
+        tmp_file = self.store_dir / 'rows.npz.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.savez(
+                f,
+                chunk_ids=state.chunk_ids,
+                doc_ids=state.doc_ids,
+                alive=state.alive,
+                centroids=state.ivf.centroids if state.ivf else np.zeros((0, self.embedder.dim), dtype=np.float32),
+                list_ids=state.ivf.list_ids if state.ivf else np.zeros(0, dtype=np.int32)
+            )
+        os.replace(tmp_file, self.store_dir / 'rows.npz')
+
+    def _remove_stale_files(self, epoch):
+        for old in self.store_dir.glob('vectors.*.f32'):
+            if old != self._vector_file(epoch):
+                try:
+                    old.unlink()
+                except OSError:
+                    pass  # still mapped somewhere; retried on next load
+
+    def _source(self):
+        """Read-only connection to cyclotron.db inside one snapshot transaction"""
+        conn = sqlite3.connect(f"file:{self.db_path.as_posix()}?mode=ro", uri=True, isolation_level=None)
+        conn.execute('BEGIN')
+        return conn
+
+    def _feed_position(self, conn):
+        seq = conn.execute('SELECT MAX(seq) FROM changes').fetchone()[0]
+        generation = conn.execute("SELECT value FROM index_meta WHERE key = 'generation'").fetchone()
+        return seq or 0, generation[0] if generation else '0'
+
+    def _passages(self, conn, doc_ids=None):
+        """(chunk_id, doc_id, path, name, heading, start, end, text), all or for some documents"""
+        query = '''
+            SELECT c.id, d.id, d.path, d.name, c.heading, c.start, c.end,
+                   substr(d.content, c.start + 1, c.end - c.start)
+            FROM chunks c JOIN documents d ON d.id = c.doc_id
+        '''
+        if doc_ids is None:
+            yield from conn.execute(query + ' ORDER BY c.id')
+            return
+        for start in range(0, len(doc_ids), 500):
+            batch = doc_ids[start:start + 500]
+            yield from conn.execute(query + f" WHERE c.doc_id IN ({','.join('?' * len(batch))}) ORDER BY c.id", batch)
+
+    def _write_vectors(self, out, passages):
+        """Embed passages into an open file; returns (chunk_ids, doc_ids, item rows)"""
+        chunk_ids, doc_ids, items = [], [], []
+        batch = []
+
+        def flush():
+            out.write(self.embedder.embed([r[7] or '' for r in batch]).tobytes())
+            batch.clear()
+
+        for row in passages:
+            batch.append(row)
+            chunk_ids.append(row[0])
+            doc_ids.append(row[1])
+            items.append(row[:7] + ((row[7] or '')[:PREVIEW_CHARS].replace('\n', ' ').strip(),))
+            if len(batch) == EMBED_BATCH:
+                flush()
+        if batch:
+            flush()
+        return np.asarray(chunk_ids, dtype=np.int64), np.asarray(doc_ids, dtype=np.int64), items
+
+    def _insert_items(self, items):
+        self.meta_conn.executemany('''
+            INSERT OR REPLACE INTO items (chunk_id, doc_id, path, name, heading, start, end, preview)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', items)
+
+    def index(self):
+        """Rebuild all vectors from cyclotron.db; returns number of passages"""
+        with self.sync_lock:
+            return self._rebuild()
+
+    def _rebuild(self):
+        """Full rebuild (caller holds sync_lock)"""
+        conn = self._source()
+        seq, generation = self._feed_position(conn)
+
+        if hasattr(self.embedder, 'fit'):
+            self.embedder.fit(row[7] or '' for row in self._passages(conn))
+
+        epoch = int(self._meta().get('epoch', 0)) + 1
+        with open(self._vector_file(epoch), 'wb') as out:
+            chunk_ids, doc_ids, items = self._write_vectors(out, self._passages(conn))
+        conn.close()
+
+        matrix = np.memmap(self._vector_file(epoch), dtype=np.float32, mode='r',
+                           shape=(len(chunk_ids), self.embedder.dim)) if len(chunk_ids) else self._empty_state().matrix
+        state = VectorState(matrix, chunk_ids, doc_ids, np.ones(len(chunk_ids), dtype=bool))
+
+        self.meta_conn.execute('DELETE FROM items')
+        self._insert_items(items)
+        if hasattr(self.embedder, 'save'):
+            self.embedder.save(self.store_dir)
+        self._save_rows(state)
+        self._set_meta(model=self.embedder.name, dim=self.embedder.dim, epoch=epoch,
+                       change_seq=seq, generation=generation, trained_rows=0)
+        self.state = state
+
+        if len(chunk_ids) >= ANN_MIN_ROWS:
+            self._compact(retrain=True)
+        self._remove_stale_files(self._meta()['epoch'])
+        return len(chunk_ids)
+
+    def sync(self):
+        """Apply cyclotron.db changes since the last sync; returns documents touched"""
+        with self.sync_lock:
+            meta = self._meta()
+            if 'change_seq' not in meta:
+                return self._rebuild()
+
+            last_seq = int(meta['change_seq'])
+            conn = self._source()
+            min_seq, max_seq = conn.execute('SELECT MIN(seq), MAX(seq) FROM changes').fetchone()
+            if max_seq is None or max_seq <= last_seq:
+                conn.close()
+                return 0
+            if min_seq > last_seq + 1:
+                # Feed was pruned past our position
+                conn.close()
+                return self._rebuild()
+
+            seq, generation = self._feed_position(conn)
+            changed = [row[0] for row in conn.execute(
+                'SELECT DISTINCT doc_id FROM changes WHERE seq > ?', (last_seq,))]
+
+            state = self.state
+            alive = state.alive.copy()
+            alive[np.isin(state.doc_ids, changed)] = False
+
+            # Append new passage vectors after the last row rows.npz knows about.
+            # The file is mapped by live searches, so it only ever grows: bytes
+            # left past that row by an interrupted sync are ignored (the row
+            # count bounds the memmap) and overwritten here.
+            vector_file = self._vector_file(meta['epoch'])
+            with open(vector_file, 'r+b' if vector_file.exists() else 'wb') as out:
+                out.seek(len(state.chunk_ids) * self.embedder.dim * 4)
+                chunk_ids, doc_ids, items = self._write_vectors(out, self._passages(conn, changed))
+            conn.close()
+
+            count = len(state.chunk_ids) + len(chunk_ids)
+            matrix = np.memmap(vector_file, dtype=np.float32, mode='r',
+                               shape=(count, self.embedder.dim)) if count else state.matrix
+            ivf = state.ivf.extend(matrix[len(state.chunk_ids):]) if state.ivf else None
+            new_state = VectorState(
+                matrix,
+                np.concatenate([state.chunk_ids, chunk_ids]),
+                np.concatenate([state.doc_ids, doc_ids]),
+                np.concatenate([alive, np.ones(len(chunk_ids), dtype=bool)]),
+                ivf
+            )
+
+            for start in range(0, len(changed), 500):
+                batch = changed[start:start + 500]
+                self.meta_conn.execute(f"DELETE FROM items WHERE doc_id IN ({','.join('?' * len(batch))})", batch)
+            self._insert_items(items)
+            self._save_rows(new_state)
+            self._set_meta(change_seq=seq, generation=generation)
+            self.state = new_state
+
+            # Keep the ANN index healthy as the corpus churns
+            live = int(new_state.alive.sum())
+            trained = int(self._meta().get('trained_rows', 0))
+            if count and 1 - live / count > COMPACT_DEAD_RATIO:
+                self._compact(retrain=live >= ANN_MIN_ROWS and (ivf is None or live > trained * RETRAIN_GROWTH))
+            elif live >= ANN_MIN_ROWS and (ivf is None or live > trained * RETRAIN_GROWTH):
+                self._compact(retrain=True)
+            return len(changed)
+
+    def _compact(self, retrain=False):
+        """Rewrite live rows into a new file, grouped by IVF list (caller holds sync_lock)"""
+        state = self.state
+        ivf = IVFIndex.train(state.matrix, state.alive) if retrain else state.ivf
+        rows = np.flatnonzero(state.alive)
+        if ivf is not None:
+            rows = rows[np.argsort(ivf.list_ids[rows], kind='stable')]
+
+        epoch = int(self._meta()['epoch']) + 1
+        with open(self._vector_file(epoch), 'wb') as out:
+            for start in range(0, len(rows), ASSIGN_BLOCK):
+                out.write(np.asarray(state.matrix[rows[start:start + ASSIGN_BLOCK]]).tobytes())
+
+        matrix = np.memmap(self._vector_file(epoch), dtype=np.float32, mode='r',
+                           shape=(len(rows), self.embedder.dim)) if len(rows) else self._empty_state().matrix
+        new_state = VectorState(
+            matrix,
+            state.chunk_ids[rows],
+            state.doc_ids[rows],
+            np.ones(len(rows), dtype=bool),
+            IVFIndex(ivf.centroids, ivf.list_ids[rows]) if ivf is not None else None
+        )
+        self._save_rows(new_state)
+        updates = {'epoch': epoch}
+        if retrain:
+            updates['trained_rows'] = len(rows)
+        self._set_meta(**updates)
+        self.state = new_state
+        self._remove_stale_files(epoch)
+
+    # -- scoring ------------------------------------------------------------
+
+    def _candidates(self, state, vector, nprobe=None, exact=False):
+        """(rows, scores) of live rows to rank: probed IVF lists, or every row"""
+        if state.ivf is not None and not exact:
+            rows = state.ivf.candidates(vector, max(1, min(nprobe or DEFAULT_NPROBE, state.ivf.nlist)))
+            rows = rows[state.alive[rows]]
+            return rows, np.asarray(state.matrix[rows]) @ vector
+
+        scores = np.empty(len(state.matrix), dtype=np.float32)
+        for start in range(0, len(state.matrix), SCORE_BLOCK):
+            block = state.matrix[start:start + SCORE_BLOCK]
+            scores[start:start + len(block)] = block @ vector
+        rows = np.flatnonzero(state.alive)
+        return rows, scores[rows]
+
+    def _top_rows(self, state, rows, scores, n_results, exclude_doc=None):
+        """(row, score) of the best passage for each of the n_results best documents"""
+        docs = state.doc_ids[rows]
+        if exclude_doc is not None:
+            keep = docs != exclude_doc
+            rows, scores, docs = rows[keep], scores[keep], docs[keep]
+        if not len(rows):
+            return []
+
+        k = min(len(scores), max(n_results * 8, 32))
+        while True:
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            picked, seen = [], set()
+            for i in top:
+                if docs[i] in seen:
+                    continue
+                seen.add(docs[i])
+                picked.append((int(rows[i]), float(scores[i])))
+                if len(picked) == n_results:
+                    return picked
+            if k >= len(scores):
+                return picked
+            k = min(len(scores), k * 4)
+
+    def _results(self, state, picked):
+        if not picked:
+            return []
+        chunk_ids = [int(state.chunk_ids[row]) for row, _ in picked]
+        placeholders = ','.join('?' * len(chunk_ids))
+        items = {r[0]: r for r in self.meta_conn.execute(f'''
+            SELECT chunk_id, path, name, heading, start, end, preview
+            FROM items WHERE chunk_id IN ({placeholders})
+        ''', chunk_ids).fetchall()}
+
+        results = []
+        for chunk_id, (_, score) in zip(chunk_ids, picked):
+            item = items.get(chunk_id)
+            if item is None:
+                continue  # removed by a concurrent sync
+            results.append({
+                'path': item[1],
+                'name': item[2],
+                'heading': item[3],
+                'offset': item[4],
+                'length': item[5] - item[4],
+                'preview': item[6],
+                'similarity': round(score, 4)
+            })
+        return results
+
+    # -- API surface ----------------------------------------------------------
+
+    def search(self, query, n_results=10, nprobe=None, exact=False):
+        """Files most similar to the query, each with its best passage
+
+        nprobe trades latency for recall on the IVF index; exact=True scans
+        every vector.
+        """
+        state = self.state
+        if not state.alive.any():
+            return []
+        vector = self.embedder.embed([query])[0]
+        rows, scores = self._candidates(state, vector, nprobe, exact)
+        return self._results(state, self._top_rows(state, rows, scores, n_results))
+
+    def find_similar(self, path, n_results=10, nprobe=None, exact=False):
+        """Files most similar to an indexed file (mean of its passage vectors)"""
+        state = self.state
+        row = self.meta_conn.execute('SELECT doc_id FROM items WHERE path = ? LIMIT 1', (path,)).fetchone()
+        if row is None:
+            raise KeyError(f"File not in vector index: {path}")
+        doc_id = row[0]
+
+        vector = np.asarray(state.matrix[(state.doc_ids == doc_id) & state.alive]).sum(axis=0)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        rows, scores = self._candidates(state, vector, nprobe, exact)
+        return self._results(state, self._top_rows(state, rows, scores, n_results, exclude_doc=doc_id))
+
+    def _document_vectors(self, state):
+        """(doc_ids, normalized mean vector per live document)"""
+        live = np.flatnonzero(state.alive)
+        docs, inverse = np.unique(state.doc_ids[live], return_inverse=True)
+        sums = np.zeros((len(docs), state.matrix.shape[1]), dtype=np.float32)
+        for start in range(0, len(live), SCORE_BLOCK):
+            block_rows = live[start:start + SCORE_BLOCK]
+            sums += group_sum(np.asarray(state.matrix[block_rows]), inverse[start:start + len(block_rows)], len(docs))
+        return docs, normalize(sums)
+
+    def cluster_concepts(self, n_clusters=7, iterations=25, seed=7):
+        """Spherical k-means over documents: {cluster_id: [files closest first]}"""
+        state = self.state
+        if not state.alive.any():
+            return {}
+        docs, vectors = self._document_vectors(state)
+        n_clusters = min(n_clusters, len(docs))
+
+        centroids = spherical_kmeans(vectors, n_clusters, iterations, seed)
+        similarity = vectors @ centroids.T
+        assign = np.argmax(similarity, axis=1)
+        names = dict(self.meta_conn.execute('SELECT doc_id, path FROM items GROUP BY doc_id').fetchall())
+
+        clusters = {}
+        for cluster_id in range(n_clusters):
+            members = np.flatnonzero(assign == cluster_id)
+            members = members[np.argsort(-similarity[members, cluster_id])]
+            clusters[cluster_id] = [{
+                'path': names.get(int(docs[i])),
+                'name': Path(names.get(int(docs[i])) or '').name,
+                'similarity': round(float(similarity[i, cluster_id]), 4)
+            } for i in members]
+        return clusters
+
+    def get_stats(self):
+        state = self.state
+        meta = self._meta()
+        live = state.doc_ids[state.alive]
+        return {
+            'vector_chunks': int(len(live)),
+            'files': int(len(np.unique(live))),
+            'tombstones': int(len(state.alive) - len(live)),
+            'model': self.embedder.name,
+            'dim': int(state.matrix.shape[1]),
+            'ann': {'type': 'ivf', 'nlist': state.ivf.nlist, 'default_nprobe': DEFAULT_NPROBE} if state.ivf else None,
+            'change_seq': int(meta.get('change_seq', 0)),
+            'index_generation': int(meta.get('generation', 0)),
+            'store': str(self.store_dir)
+        }
+
+if __name__ == '__main__':
+    cmd = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    engine = SemanticVectorEngine()
+
+    if cmd == 'index':
+        print(f"Embedding passages from {engine.db_path} with {engine.embedder.name}...")
+        print(f"Indexed {engine.index():,} passages into {engine.store_dir}")
+
+    elif cmd == 'sync':
+        print(f"Synced {engine.sync():,} changed documents")
+
+    elif cmd == 'search' and len(sys.argv) > 2:
+        for r in engine.search(' '.join(sys.argv[2:]), n_results=10):
+            print(f"  {r['similarity']:.3f}  {r['name']}  [{r['heading']}]")
+            print(f"         {r['preview'][:100]}")
+
+    elif cmd == 'stats':
+        print(json.dumps(engine.get_stats(), indent=2))
+
+    else:
+        print("Usage: python SEMANTIC_VECTOR_ENGINE.py [index|sync|search <query>|stats]")
@@ -0,0 +1,108 @@
+"""
+TEST: CYCLOTRON SCHEMA MIGRATION
+Runs init_schema against a database in the original standalone-FTS layout
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from CYCLOTRON_SCHEMA import init_schema, upsert_document
+
+LEGACY_DOCS = [
+    ('/kb/alpha.md', 'alpha.md', 'md', '# Alpha\nharmonic resonance notes', 'harmonic', '2025-01-01', 'h1'),
+    ('/kb/beta.py', 'beta.py', 'py', 'def beta():\n    return "resonance"', 'def beta', '2025-01-02', 'h2'),
+]
+
+def legacy_db():
+    """Database as the original CYCLOTRON_CONTENT_INDEXER.py created it"""
+    path = Path(tempfile.mkdtemp()) / 'cyclotron.db'
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE VIRTUAL TABLE knowledge USING fts5(
+            path, name, type, content, preview, modified, hash,
+            tokenize='porter unicode61'
+        )
+    ''')
+    conn.executemany('INSERT INTO knowledge VALUES (?, ?, ?, ?, ?, ?, ?)', LEGACY_DOCS)
+    conn.commit()
+    return conn
+
+def match(conn, table, query):
+    return conn.execute(f'SELECT COUNT(*) FROM {table} WHERE {table} MATCH ?', (query,)).fetchone()[0]
+
+def test_legacy_migration():
+    """Legacy rows land in documents and are searchable through the new FTS tables"""
+    print("\n🧬 Testing legacy migration...")
+    conn = legacy_db()
+    init_schema(conn)
+
+    paths = [row[0] for row in conn.execute('SELECT path FROM documents ORDER BY path')]
+    print(f"   Documents: {paths}")
+    legacy_left = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'knowledge_legacy'").fetchone()
+    hits = match(conn, 'knowledge', 'resonance')
+    passages = match(conn, 'passages', 'harmonic')
+    print(f"   knowledge hits: {hits}, passage hits: {passages}, legacy table left: {bool(legacy_left)}")
+    return paths == ['/kb/alpha.md', '/kb/beta.py'] and hits == 2 and passages == 1 and not legacy_left
+
+def test_idempotent():
+    """Running init_schema again changes nothing"""
+    print("\n🔁 Testing repeat init...")
+    conn = legacy_db()
+    init_schema(conn)
+    before = conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0]
+    init_schema(conn)
+    after = conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0]
+    print(f"   Chunks: {before} -> {after}")
+    return before == after and match(conn, 'knowledge', 'resonance') == 2
+
+def test_upsert_after_migration():
+    """Updating a migrated document replaces its FTS entries"""
+    print("\n✏️ Testing upsert after migration...")
+    conn = legacy_db()
+    init_schema(conn)
+    upsert_document(conn.cursor(), {
+        'path': '/kb/alpha.md', 'name': 'alpha.md', 'type': 'md',
+        'content': '# Alpha\ncompletely rewritten', 'preview': '', 'modified': '2025-02-01',
+        'hash': 'h3', 'mtime': 0.0, 'size': 0
+    })
+    conn.commit()
+    old_hits = match(conn, 'knowledge', 'harmonic') + match(conn, 'passages', 'harmonic')
+    new_hits = match(conn, 'knowledge', 'rewritten') + match(conn, 'passages', 'rewritten')
+    print(f"   Old text hits: {old_hits}, new text hits: {new_hits}")
+    return old_hits == 0 and new_hits == 2
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("CYCLOTRON SCHEMA - TEST SUITE")
+    print("=" * 60)
+
+    tests = [
+        ("Legacy Migration", test_legacy_migration),
+        ("Repeat Init", test_idempotent),
+        ("Upsert After Migration", test_upsert_after_migration),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((name, passed))
+        except Exception as e:
+            print(f"   ❌ Exception: {e}")
+            results.append((name, False))
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("TEST RESULTS:")
+    print("=" * 60)
+    for name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+    print(f"\n{passed_count}/{total_count} tests passed")
+    print("=" * 60)
+    sys.exit(0 if passed_count == total_count else 1)
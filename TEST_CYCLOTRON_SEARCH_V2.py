@@ -0,0 +1,131 @@
+"""
+TEST: CYCLOTRON SEARCH V2 PAGING
+Runs keyset cursor paging against a generated database through the Flask test client
+"""
+
+import sys
+import json
+import base64
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import CYCLOTRON_SEARCH_V2 as search
+from CYCLOTRON_SCHEMA import init_schema, upsert_document
+
+DOCS = 450  # more than two PAGE_BATCHes
+
+def build_db():
+    path = Path(tempfile.mkdtemp()) / 'cyclotron.db'
+    conn = sqlite3.connect(path)
+    init_schema(conn)
+    cursor = conn.cursor()
+    for i in range(DOCS):
+        upsert_document(cursor, {
+            'path': f'/kb/doc{i:03}.md', 'name': f'doc{i:03}.md', 'type': 'md' if i % 3 else 'py',
+            'content': 'resonance ' * (i % 9 + 1) + f'filler text {i}', 'preview': '',
+            'modified': f'2025-01-{i % 28 + 1:02}', 'hash': str(i), 'mtime': 0.0, 'size': 0
+        })
+    conn.commit()
+    conn.close()
+
+    search.DB_PATH = path
+    search.pool = search.ConnectionPool(path)
+    return search.app.test_client()
+
+client = build_db()
+
+def walk(url, key, limit):
+    """Follow next_cursor to the end; returns (items, pages)"""
+    items, pages, cursor = [], 0, None
+    while True:
+        page_url = f"{url}&limit={limit}" + (f"&cursor={cursor}" if cursor else '')
+        body = client.get(page_url).get_json()
+        items += body[key]
+        pages += 1
+        cursor = body['next_cursor']
+        if not cursor:
+            return items, pages
+
+def test_search_paging():
+    """Search pages cover every match once, in rank order"""
+    print("\n📄 Testing search paging...")
+    items, pages = walk('/api/search?q=resonance', 'results', 120)
+    paths = [item['path'] for item in items]
+    scores = [item['score'] for item in items]
+    print(f"   {len(items)} results over {pages} pages")
+    return len(paths) == DOCS and len(set(paths)) == DOCS and scores == sorted(scores, reverse=True)
+
+def test_search_type_filter():
+    """The type filter applies on every page"""
+    print("\n🏷️ Testing type filter paging...")
+    items, pages = walk('/api/search?q=resonance&type=py', 'results', 50)
+    expected = len(range(0, DOCS, 3))
+    print(f"   {len(items)} py results over {pages} pages (expected {expected})")
+    return len(items) == expected and all(item['type'] == 'py' for item in items)
+
+def test_search_ndjson():
+    """NDJSON streams the same rows as JSON paging, with a cursor in the tail"""
+    print("\n🌊 Testing NDJSON stream...")
+    lines = client.get('/api/search?q=resonance&limit=300&format=ndjson').get_data(as_text=True).splitlines()
+    rows = [json.loads(line) for line in lines]
+    tail = rows.pop()
+    rest = client.get(f"/api/search?q=resonance&limit=1000&cursor={tail['next_cursor']}").get_json()
+    paths = {row['path'] for row in rows} | {item['path'] for item in rest['results']}
+    print(f"   Streamed {len(rows)}, remaining {rest['count']}")
+    return len(rows) == 300 and len(paths) == DOCS and rest['next_cursor'] is None
+
+def test_recent_paging():
+    """Recent pages walk newest first without repeats"""
+    print("\n🕒 Testing recent paging...")
+    items, pages = walk('/api/recent?', 'files', 100)
+    modified = [item['modified'] for item in items]
+    print(f"   {len(items)} files over {pages} pages")
+    return len({item['path'] for item in items}) == DOCS and modified == sorted(modified, reverse=True)
+
+def test_bad_cursors():
+    """Malformed and wrong-shape cursors are rejected with 400"""
+    print("\n🚫 Testing bad cursors...")
+    shapes = [[1], [1, 2, 3], [1, 'x'], [True, 1], {'a': 1}, [None, 1]]
+    tokens = ['not-base64!', base64.urlsafe_b64encode(b'not json').decode()]
+    tokens += [base64.urlsafe_b64encode(json.dumps(shape).encode()).decode() for shape in shapes]
+    codes = [client.get(f'/api/search?q=resonance&cursor={token}').status_code for token in tokens]
+    codes += [client.get(f'/api/recent?cursor={token}').status_code for token in tokens]
+    print(f"   Status codes: {sorted(set(codes))}")
+    return set(codes) == {400}
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("CYCLOTRON SEARCH V2 - TEST SUITE")
+    print("=" * 60)
+
+    tests = [
+        ("Search Paging", test_search_paging),
+        ("Type Filter Paging", test_search_type_filter),
+        ("NDJSON Stream", test_search_ndjson),
+        ("Recent Paging", test_recent_paging),
+        ("Bad Cursors", test_bad_cursors),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((name, passed))
+        except Exception as e:
+            print(f"   ❌ Exception: {e}")
+            results.append((name, False))
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("TEST RESULTS:")
+    print("=" * 60)
+    for name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+    print(f"\n{passed_count}/{total_count} tests passed")
+    print("=" * 60)
+    sys.exit(0 if passed_count == total_count else 1)
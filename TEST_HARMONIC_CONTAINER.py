@@ -0,0 +1,157 @@
+"""
+TEST: HARMONIC ENCRYPTION CONTAINER
+Runs tests against the version 2 binary container and SqliteKeyStore
+"""
+
+import io
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from HARMONIC_ENCRYPTION import HarmonicEncryption, SqliteKeyStore, ContainerHeader, MAC_SIZE
+
+MASTER_KEY = b"consciousness_revolution_key_32"
+CHUNK = 64  # small chunks keep the pure-Python cipher fast
+
+crypto = HarmonicEncryption(MASTER_KEY)
+
+def seal(plaintext, chunk_size=CHUNK):
+    out = io.BytesIO()
+    crypto.encrypt_stream(io.BytesIO(plaintext), out, "digital", "present", chunk_size)
+    return out.getvalue()
+
+def unseal(container):
+    out = io.BytesIO()
+    crypto.decrypt_stream(io.BytesIO(container), out)
+    return out.getvalue()
+
+def rejected(container):
+    try:
+        unseal(container)
+    except ValueError as e:
+        print(f"   Rejected: {e}")
+        return True
+    return False
+
+def test_round_trip():
+    """Round-trip at sizes around the chunk boundary"""
+    print("\n🔁 Testing round-trip...")
+    ok = True
+    for size in (0, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK):
+        plaintext = os.urandom(size)
+        match = unseal(seal(plaintext)) == plaintext
+        print(f"   {size} bytes: {'ok' if match else 'MISMATCH'}")
+        ok = ok and match
+    return ok
+
+def test_flipped_byte():
+    """A single flipped ciphertext byte fails authentication"""
+    print("\n🔀 Testing flipped byte...")
+    container = bytearray(seal(os.urandom(2 * CHUNK + 10)))
+    container[-MAC_SIZE - 1] ^= 0x01
+    return rejected(bytes(container))
+
+def test_dropped_chunk():
+    """Dropping the trailing chunk is detected (the new last chunk isn't final)"""
+    print("\n✂️ Testing dropped trailing chunk...")
+    container = seal(os.urandom(2 * CHUNK + 10))
+    return rejected(container[:-(10 + MAC_SIZE)])
+
+def test_random_access():
+    """decrypt_chunk reads any chunk alone and rejects out-of-range indexes"""
+    print("\n🎯 Testing random access...")
+    plaintext = os.urandom(3 * CHUNK + 5)
+    src = io.BytesIO(seal(plaintext))
+
+    ok = True
+    for index in range(4):
+        chunk = crypto.decrypt_chunk(src, index)
+        ok = ok and chunk == plaintext[index * CHUNK:(index + 1) * CHUNK]
+    print(f"   Chunks 0-3: {'ok' if ok else 'MISMATCH'}")
+
+    for index in (-1, 4):
+        try:
+            crypto.decrypt_chunk(src, index)
+            print(f"   Chunk {index}: not rejected")
+            ok = False
+        except IndexError:
+            print(f"   Chunk {index}: IndexError")
+    return ok
+
+def test_header():
+    """Header fields survive a pack/read cycle"""
+    print("\n📦 Testing header...")
+    container = seal(b"hello")
+    header = ContainerHeader.read(io.BytesIO(container))
+    print(f"   {header.domain}/{header.time_layer}, chunk size {header.chunk_size}")
+    return (header.domain, header.time_layer, header.chunk_size) == ("digital", "present", CHUNK)
+
+def test_legacy_import():
+    """secure_keys.json is imported once; later edits to it are ignored"""
+    print("\n🗝️ Testing legacy JSON import...")
+    store_dir = Path(tempfile.mkdtemp())
+    json_path = store_dir / "secure_keys.json"
+    db_path = store_dir / "secure_keys.db"
+
+    json_path.write_text(json.dumps({
+        "GITHUB_TOKEN": crypto.encrypt(b"ghp_legacy", "digital", "present")
+    }))
+    store = SqliteKeyStore(MASTER_KEY, db_path)
+    imported = store.retrieve_key("GITHUB_TOKEN") == "ghp_legacy"
+    print(f"   Imported: {imported}")
+
+    # Deleting the key and reopening must not resurrect it from the JSON file
+    store.delete_key("GITHUB_TOKEN")
+    json_path.write_text(json.dumps({
+        "GITHUB_TOKEN": crypto.encrypt(b"ghp_legacy", "digital", "present"),
+        "STRIPE_SECRET": crypto.encrypt(b"sk_later", "finance", "present")
+    }))
+    store = SqliteKeyStore(MASTER_KEY, db_path)
+    once = store.retrieve_key("GITHUB_TOKEN") is None and store.retrieve_key("STRIPE_SECRET") is None
+    print(f"   Not re-imported: {once}")
+
+    conn = sqlite3.connect(db_path)
+    marked = conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone() is not None
+    conn.close()
+    print(f"   Recorded in meta: {marked}")
+    return imported and once and marked
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("HARMONIC ENCRYPTION CONTAINER - TEST SUITE")
+    print("=" * 60)
+
+    tests = [
+        ("Round Trip", test_round_trip),
+        ("Flipped Byte", test_flipped_byte),
+        ("Dropped Chunk", test_dropped_chunk),
+        ("Random Access", test_random_access),
+        ("Header", test_header),
+        ("Legacy Import", test_legacy_import),
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            passed = test_func()
+            results.append((name, passed))
+        except Exception as e:
+            print(f"   ❌ Exception: {e}")
+            results.append((name, False))
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("TEST RESULTS:")
+    print("=" * 60)
+    for name, passed in results:
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"{status} - {name}")
+
+    passed_count = sum(1 for _, p in results if p)
+    total_count = len(results)
+    print(f"\n{passed_count}/{total_count} tests passed")
+    print("=" * 60)
+    sys.exit(0 if passed_count == total_count else 1)
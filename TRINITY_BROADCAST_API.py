@@ -5,13 +5,22 @@ Coordinates 1 input → 3 AI instances → 1 convergence output
 Backend server for TRINITY_3_PANEL_INTERFACE.html
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
+import atexit
+import base64
 import json
+import os
 import time
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import threading
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 
 app = Flask(__name__)
 CORS(app)
@@ -29,7 +38,272 @@ C2_OUTPUT = TRINITY_DIR / "c2_output.txt"
 C3_OUTPUT = TRINITY_DIR / "c3_output.txt"
 
 STATUS_FILE = TRINITY_DIR / "trinity_status.json"
-BROADCAST_LOG = TRINITY_DIR / "broadcast_log.json"
+BROADCAST_LOG = TRINITY_DIR / "broadcast_log.json"       # legacy, imported once
+BROADCAST_JOURNAL = TRINITY_DIR / "broadcast_log.jsonl"
+
+INPUT_FILES = {'c1': C1_INPUT, 'c2': C2_INPUT, 'c3': C3_INPUT}
+OUTPUT_FILES = {'c1': C1_OUTPUT, 'c2': C2_OUTPUT, 'c3': C3_OUTPUT}
+INSTANCES = list(OUTPUT_FILES)
+
+# Per-instance spool, one message file per broadcast named by its correlation id:
+#   spool/<instance>/inbox/<id>.json   {id, command, timestamp, from}
+#   spool/<instance>/outbox/<id>.json  {id, response}
+# Instances still on the fixed c*_input/c*_output files also get the command
+# (with its id). Their output is matched by id, or taken when it carries no id
+# and only one broadcast is in flight for that instance.
+SPOOL_DIR = TRINITY_DIR / "spool"
+
+RESPONSE_TIMEOUT = 30      # seconds to wait for each instance
+RECHECK_INTERVAL = 5       # safety re-read in case a file event is missed
+BROADCAST_WORKERS = 16     # broadcasts in flight
+INSTANCE_CONCURRENCY = 4   # commands in flight per instance
+MAX_JOBS = 200             # finished jobs kept for polling
+LONG_POLL_MAX = 60
+
+JOURNAL_MAX_BYTES = 10 * 1024 * 1024   # rotate broadcast_log.jsonl past this
+JOURNAL_KEEP = 5                       # rotated files kept (.1 newest)
+STATUS_FLUSH_INTERVAL = 2              # seconds between status file writes
+HISTORY_PAGE = 50
+HISTORY_PAGE_MAX = 500
+HISTORY_LEGACY = 100                   # entries in the unpaged /history array
+
+def spool_path(instance, box, message_id):
+    return SPOOL_DIR / instance / box / f"{message_id}.json"
+
+def encode_cursor(position):
+    """Opaque token for a journal position"""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode()).decode()
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; raises ValueError on a malformed token"""
+    if not token:
+        return None
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if (not isinstance(position, list) or len(position) != 2
+            or not all(isinstance(n, int) and not isinstance(n, bool) and n >= 0 for n in position)):
+        raise ValueError('Invalid cursor')
+    return tuple(position)
+
+def write_atomic(path, data):
+    """Write JSON via rename so instances never see a partial message"""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+class BroadcastJournal:
+    """Append-only JSONL broadcast log with size-based rotation"""
+
+    def __init__(self, path=BROADCAST_JOURNAL, max_bytes=JOURNAL_MAX_BYTES, keep=JOURNAL_KEEP,
+                 legacy=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.lock = threading.Lock()
+        if legacy and legacy.exists() and not self.path.exists():
+            self.import_legacy(legacy)
+
+    def import_legacy(self, legacy):
+        try:
+            entries = json.loads(legacy.read_text())
+        except (OSError, ValueError):
+            return
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry):
+        """One line per entry; a single write under the lock never interleaves"""
+        line = json.dumps(entry) + '\n'
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+                size = f.tell()
+            if size > self.max_bytes:
+                self.rotate()
+
+    def rotate(self):
+        for n in range(self.keep - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{n}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{n + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+    def files(self):
+        """Journal files, newest first"""
+        paths = [self.path] + [self.path.with_name(f"{self.path.name}.{n}")
+                               for n in range(1, self.keep + 1)]
+        return [path for path in paths if path.exists()]
+
+    @staticmethod
+    def reverse_lines(path, end=None, block=64 * 1024):
+        """Yield (offset, line) from byte `end` (default: EOF) back to the start"""
+        with open(path, 'rb') as f:
+            position = f.seek(0, os.SEEK_END) if end is None else end
+            tail = b''
+            while position > 0:
+                step = min(block, position)
+                position -= step
+                f.seek(position)
+                chunk = f.read(step) + tail
+                lines = chunk.split(b'\n')
+                tail = lines.pop(0)
+                offset = position + len(chunk)
+                for line in reversed(lines):
+                    offset -= len(line)
+                    if line.strip():
+                        yield offset, line
+                    offset -= 1
+            if tail.strip():
+                yield 0, tail
+
+    def entries(self, position=None):
+        """(position, entry) pairs, newest first, starting before `position`
+
+        A position is (inode, byte offset) of an entry's line. Rotation renames
+        files without changing their inode, so a position stays valid until
+        its file is pruned; after that there is nothing older to return.
+        """
+        files = self.files()
+        if position is not None:
+            inode, end = position
+            for index, path in enumerate(files):
+                try:
+                    if path.stat().st_ino == inode:
+                        break
+                except FileNotFoundError:
+                    continue
+            else:
+                return
+            files = files[index:]
+        else:
+            end = None
+
+        for path in files:
+            try:
+                inode = path.stat().st_ino
+                for offset, line in self.reverse_lines(path, end):
+                    try:
+                        yield (inode, offset), json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+            except FileNotFoundError:
+                continue  # Rotated while reading
+            end = None
+
+    def page(self, cursor=None, limit=HISTORY_PAGE):
+        """Up to `limit` entries older than `cursor`, plus the cursor for the next page"""
+        found = list(islice(self.entries(decode_cursor(cursor)), limit + 1))
+        return {
+            'entries': [entry for _, entry in found[:limit]],
+            'limit': limit,
+            'next_cursor': encode_cursor(found[limit - 1][0]) if len(found) > limit else None
+        }
+
+class ResponseRouter(FileSystemEventHandler):
+    """Wakes the delivery waiting on a response when its file is written"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.waiting = {}  # (instance, message id) -> Event
+        self.legacy = {path.name: instance for instance, path in OUTPUT_FILES.items()}
+        for instance in INSTANCES:
+            for box in ('inbox', 'outbox'):
+                (SPOOL_DIR / instance / box).mkdir(parents=True, exist_ok=True)
+        self.observer = Observer()
+        self.observer.schedule(self, str(TRINITY_DIR), recursive=True)
+        self.observer.daemon = True
+        self.observer.start()
+
+    def register(self, instance, message_id):
+        wake = threading.Event()
+        with self.lock:
+            self.waiting[(instance, message_id)] = wake
+        return wake
+
+    def unregister(self, instance, message_id):
+        with self.lock:
+            self.waiting.pop((instance, message_id), None)
+
+    def in_flight(self, instance=None):
+        with self.lock:
+            if instance is None:
+                counts = dict.fromkeys(INSTANCES, 0)
+                for inst, _ in self.waiting:
+                    counts[inst] += 1
+                return counts
+            return sum(1 for inst, _ in self.waiting if inst == instance)
+
+    def on_any_event(self, event):
+        for raw in (getattr(event, 'src_path', ''), getattr(event, 'dest_path', '')):
+            if not raw:
+                continue
+            path = Path(str(raw))
+            if path.parent.name == 'outbox' and path.suffix == '.json':
+                self.wake(path.parent.parent.name, path.stem)
+            elif path.name in self.legacy:
+                self.wake(self.legacy[path.name], None)
+
+    def wake(self, instance, message_id):
+        with self.lock:
+            for (inst, mid), wake in self.waiting.items():
+                if inst == instance and message_id in (None, mid):
+                    wake.set()
+
+class BroadcastJob:
+    """One broadcast; responses fill in as instances answer"""
+
+    def __init__(self, command):
+        self.id = uuid.uuid4().hex[:12]
+        self.command = command
+        self.state = 'pending'
+        self.responses = {}
+        self.convergence = None
+        self.created = datetime.now().isoformat()
+        self.finished = None
+        self.version = 0
+        self.changed = threading.Condition()
+
+    def update(self, **fields):
+        with self.changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self.version += 1
+            self.changed.notify_all()
+
+    def add_response(self, instance, response):
+        with self.changed:
+            self.responses[instance] = response
+            self.version += 1
+            self.changed.notify_all()
+
+    def wait(self, since, timeout):
+        """Block until the job changes after version `since` or finishes"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.version > since or self.state == 'done', timeout)
+            return self.snapshot()
+
+    def result(self):
+        return {
+            'c1_response': self.responses.get('c1'),
+            'c2_response': self.responses.get('c2'),
+            'c3_response': self.responses.get('c3'),
+            'convergence': self.convergence
+        }
+
+    def snapshot(self):
+        with self.changed:
+            return {
+                'job_id': self.id,
+                'command': self.command,
+                'state': self.state,
+                'version': self.version,
+                'responses': dict(self.responses),
+                'convergence': self.convergence,
+                'created': self.created,
+                'finished': self.finished
+            }
 
 class TrinityBroadcaster:
     def __init__(self):
@@ -39,6 +313,16 @@ class TrinityBroadcaster:
             'c3': {'status': 'idle', 'last_command': None, 'last_response': None}
         }
         self.load_status()
+        self.lock = threading.Lock()
+        self.status_dirty = False
+        self.journal = BroadcastJournal(legacy=BROADCAST_LOG)
+        threading.Thread(target=self.flush_loop, daemon=True).start()
+        atexit.register(self.flush_status)
+        self.jobs = OrderedDict()
+        self.pool = ThreadPoolExecutor(max_workers=BROADCAST_WORKERS)
+        self.instance_pools = {instance: ThreadPoolExecutor(max_workers=INSTANCE_CONCURRENCY)
+                               for instance in INSTANCES}
+        self.router = ResponseRouter()
 
     def load_status(self):
         """Load status from file"""
@@ -50,49 +334,70 @@ class TrinityBroadcaster:
                 pass
 
     def save_status(self):
-        """Save status to file"""
-        with open(STATUS_FILE, 'w') as f:
-            json.dump(self.status, f, indent=2)
+        """Mark status for the next flush; writes are batched by flush_loop"""
+        with self.lock:
+            self.status_dirty = True
+
+    def flush_status(self):
+        """Write status to file if it changed since the last flush"""
+        with self.lock:
+            if not self.status_dirty:
+                return
+            snapshot = json.dumps(self.status, indent=2)
+            self.status_dirty = False
+        tmp = STATUS_FILE.with_name(STATUS_FILE.name + '.tmp')
+        tmp.write_text(snapshot)
+        os.replace(tmp, STATUS_FILE)
+
+    def flush_loop(self):
+        while True:
+            time.sleep(STATUS_FLUSH_INTERVAL)
+            try:
+                self.flush_status()
+            except OSError:
+                self.save_status()  # Retry on the next tick
+
+    def submit(self, command):
+        """Start a broadcast in the background and return its job"""
+        job = BroadcastJob(command)
+        with self.lock:
+            self.jobs[job.id] = job
+            while len(self.jobs) > MAX_JOBS:
+                oldest = next(iter(self.jobs.values()))
+                if oldest.state != 'done':
+                    break
+                self.jobs.popitem(last=False)
+        self.pool.submit(self.run_job, job)
+        return job
+
+    def get_job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def run_job(self, job):
+        job.update(state='running')
+        try:
+            self.broadcast_command(job.command, job)
+        except Exception as e:
+            job.update(convergence={'error': str(e)})
+        job.update(state='done', finished=datetime.now().isoformat())
 
-    def broadcast_command(self, command):
+    def broadcast_command(self, command, job=None):
         """Broadcast command to all three instances"""
-        timestamp = datetime.now().isoformat()
-
-        # Write command to all input files
-        C1_INPUT.write_text(json.dumps({
-            'command': command,
-            'timestamp': timestamp,
-            'from': 'trinity_broadcast'
-        }))
-
-        C2_INPUT.write_text(json.dumps({
-            'command': command,
-            'timestamp': timestamp,
-            'from': 'trinity_broadcast'
-        }))
-
-        C3_INPUT.write_text(json.dumps({
-            'command': command,
-            'timestamp': timestamp,
-            'from': 'trinity_broadcast'
-        }))
-
-        # Update status
-        for instance in ['c1', 'c2', 'c3']:
-            self.status[instance]['status'] = 'processing'
-            self.status[instance]['last_command'] = command
-            self.status[instance]['command_time'] = timestamp
+        job = job or BroadcastJob(command)
 
+        # Fan out; each instance runs at most INSTANCE_CONCURRENCY commands at once
+        futures = {instance: self.instance_pools[instance].submit(self.deliver, job, instance)
+                   for instance in INSTANCES}
+        responses = {instance: future.result() for instance, future in futures.items()}
         self.save_status()
 
-        # Wait for responses (with timeout)
-        responses = self.collect_responses(timeout=30)
-
         # Generate convergence
         convergence = self.synthesize_convergence(command, responses)
+        job.update(convergence=convergence)
 
         # Log broadcast
-        self.log_broadcast(command, responses, convergence)
+        self.log_broadcast(command, responses, convergence, job.id)
 
         return {
             'c1_response': responses.get('c1'),
@@ -101,57 +406,85 @@ class TrinityBroadcaster:
             'convergence': convergence
         }
 
-    def collect_responses(self, timeout=30):
-        """Collect responses from all instances"""
-        responses = {}
-        start_time = time.time()
-
-        # Poll for responses
-        while (time.time() - start_time) < timeout:
-            # Check C1
-            if 'c1' not in responses and C1_OUTPUT.exists():
-                try:
-                    data = json.loads(C1_OUTPUT.read_text())
-                    responses['c1'] = data.get('response', 'No response')
-                    self.status['c1']['status'] = 'online'
-                    self.status['c1']['last_response'] = data.get('response')
-                except:
-                    pass
-
-            # Check C2
-            if 'c2' not in responses and C2_OUTPUT.exists():
-                try:
-                    data = json.loads(C2_OUTPUT.read_text())
-                    responses['c2'] = data.get('response', 'No response')
-                    self.status['c2']['status'] = 'online'
-                    self.status['c2']['last_response'] = data.get('response')
-                except:
-                    pass
-
-            # Check C3
-            if 'c3' not in responses and C3_OUTPUT.exists():
-                try:
-                    data = json.loads(C3_OUTPUT.read_text())
-                    responses['c3'] = data.get('response', 'No response')
-                    self.status['c3']['status'] = 'online'
-                    self.status['c3']['last_response'] = data.get('response')
-                except:
-                    pass
-
-            # All responses received?
-            if len(responses) == 3:
-                break
+    def set_status(self, instance, **fields):
+        with self.lock:
+            self.status[instance].update(fields)
+            self.status_dirty = True
 
-            time.sleep(0.5)
+    @staticmethod
+    def output_signature(path):
+        try:
+            stat = path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
 
-        # Fill in missing responses
-        for instance in ['c1', 'c2', 'c3']:
-            if instance not in responses:
-                responses[instance] = f"[TIMEOUT] {instance.upper()} did not respond in time"
-                self.status[instance]['status'] = 'timeout'
+    def deliver(self, job, instance):
+        """Send the job's command to one instance and wait for the response with its id"""
+        timestamp = datetime.now().isoformat()
+        message = {
+            'id': job.id,
+            'command': job.command,
+            'timestamp': timestamp,
+            'from': 'trinity_broadcast'
+        }
+        inbox = spool_path(instance, 'inbox', job.id)
+        wake = self.router.register(instance, job.id)
+        legacy_before = self.output_signature(OUTPUT_FILES[instance])
+        response = None
 
-        self.save_status()
-        return responses
+        try:
+            write_atomic(inbox, message)
+            INPUT_FILES[instance].write_text(json.dumps(message))
+            self.set_status(instance, status='processing', last_command=job.command,
+                            command_time=timestamp)
+
+            deadline = time.time() + RESPONSE_TIMEOUT
+            while True:
+                wake.clear()
+                data = self.read_response(instance, job.id, legacy_before)
+                remaining = deadline - time.time()
+                if data is not None or remaining <= 0:
+                    break
+                wake.wait(min(remaining, RECHECK_INTERVAL))
+        finally:
+            self.router.unregister(instance, job.id)
+            inbox.unlink(missing_ok=True)  # Withdraw it if the instance never claimed it
+
+        if data is not None:
+            response = data.get('response', 'No response')
+            self.set_status(instance, status='online', last_response=data.get('response'))
+        else:
+            response = f"[TIMEOUT] {instance.upper()} did not respond in time"
+            self.set_status(instance, status='timeout')
+
+        job.add_response(instance, response)
+        return response
+
+    def read_response(self, instance, message_id, legacy_before):
+        """Return the response for message_id from the spool or legacy output file"""
+        path = spool_path(instance, 'outbox', message_id)
+        try:
+            data = json.loads(path.read_text())
+            path.unlink(missing_ok=True)
+            return data
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            return None  # Half-written; the next event re-reads it
+
+        legacy = OUTPUT_FILES[instance]
+        if self.output_signature(legacy) == legacy_before:
+            return None
+        try:
+            data = json.loads(legacy.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('id') == message_id:
+            return data
+        if 'id' not in data and self.router.in_flight(instance) == 1:
+            return data
+        return None
 
     def synthesize_convergence(self, command, responses):
         """Synthesize convergence from three responses"""
@@ -180,27 +513,16 @@ class TrinityBroadcaster:
             'timestamp': datetime.now().isoformat()
         }
 
-    def log_broadcast(self, command, responses, convergence):
+    def log_broadcast(self, command, responses, convergence, broadcast_id=None):
         """Log broadcast event"""
-        log = []
-        if BROADCAST_LOG.exists():
-            try:
-                log = json.loads(BROADCAST_LOG.read_text())
-            except:
-                log = []
-
-        log.append({
+        self.journal.append({
+            'id': broadcast_id,
             'timestamp': datetime.now().isoformat(),
             'command': command,
             'responses': responses,
             'convergence': convergence
         })
 
-        # Keep last 100 broadcasts
-        log = log[-100:]
-
-        BROADCAST_LOG.write_text(json.dumps(log, indent=2))
-
 # Global broadcaster instance
 broadcaster = TrinityBroadcaster()
 
@@ -213,8 +535,60 @@ def broadcast():
     if not command:
         return jsonify({'error': 'No command provided'}), 400
 
-    result = broadcaster.broadcast_command(command)
-    return jsonify(result)
+    job = broadcaster.submit(command)
+
+    # Async: return the job id at once; poll /broadcast/<id> or stream /events
+    if data.get('async') or request.args.get('async'):
+        return jsonify({
+            'job_id': job.id,
+            'poll': f"/broadcast/{job.id}",
+            'events': f"/broadcast/{job.id}/events"
+        }), 202
+
+    while job.state != 'done':
+        job.wait(job.version, RESPONSE_TIMEOUT)
+    return jsonify(job.result())
+
+@app.route('/broadcast/<job_id>', methods=['GET'])
+def broadcast_job(job_id):
+    """Job state; ?since=<version>&wait=<s> long-polls for the next change"""
+    job = broadcaster.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    since = request.args.get('since', type=int)
+    wait = min(request.args.get('wait', default=0, type=float), LONG_POLL_MAX)
+    if since is not None and wait > 0:
+        return jsonify(job.wait(since, wait))
+    return jsonify(job.snapshot())
+
+@app.route('/broadcast/<job_id>/events', methods=['GET'])
+def broadcast_events(job_id):
+    """Server-Sent Events: one 'response' per instance, then 'done'"""
+    job = broadcaster.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    def stream():
+        sent = set()
+        version = -1
+        while True:
+            snap = job.wait(version, LONG_POLL_MAX)
+            idle = snap['version'] == version
+            version = snap['version']
+            for instance, response in snap['responses'].items():
+                if instance not in sent:
+                    sent.add(instance)
+                    payload = {'instance': instance, 'response': response}
+                    yield f"event: response\ndata: {json.dumps(payload)}\n\n"
+            if snap['state'] == 'done':
+                yield f"event: done\ndata: {json.dumps(job.result())}\n\n"
+                return
+            if idle:
+                yield ": keepalive\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/status', methods=['GET'])
 def status():
@@ -223,14 +597,21 @@ def status():
 
 @app.route('/history', methods=['GET'])
 def history():
-    """Get broadcast history"""
-    if BROADCAST_LOG.exists():
-        try:
-            log = json.loads(BROADCAST_LOG.read_text())
-            return jsonify(log)
-        except:
-            return jsonify([])
-    return jsonify([])
+    """Broadcast history
+
+    Without parameters: the last HISTORY_LEGACY broadcasts as a bare array,
+    oldest first (the original response). With ?limit=M and/or ?cursor=C:
+    {entries, limit, next_cursor}, newest first, paging back through the journal.
+    """
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        recent = [entry for _, entry in islice(broadcaster.journal.entries(), HISTORY_LEGACY)]
+        return jsonify(recent[::-1])
+
+    limit = min(max(request.args.get('limit', default=HISTORY_PAGE, type=int), 1), HISTORY_PAGE_MAX)
+    try:
+        return jsonify(broadcaster.journal.page(request.args.get('cursor'), limit))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -238,7 +619,8 @@ def health():
     return jsonify({
         'status': 'online',
         'timestamp': datetime.now().isoformat(),
-        'instances': broadcaster.status
+        'instances': broadcaster.status,
+        'in_flight': broadcaster.router.in_flight()
     })
 
 if __name__ == '__main__':
@@ -247,14 +629,17 @@ if __name__ == '__main__':
     print("=" * 60)
     print(f"Server starting on http://localhost:7777")
     print(f"Trinity directory: {TRINITY_DIR}")
+    print(f"Spool: {SPOOL_DIR}/<instance>/inbox|outbox/<id>.json")
     print("")
     print("Endpoints:")
-    print("  POST /broadcast - Broadcast command to C1, C2, C3")
+    print("  POST /broadcast - Broadcast command to C1, C2, C3 (async: true for a job id)")
+    print("  GET  /broadcast/<id>        - Job state (?since=N&wait=S long-polls)")
+    print("  GET  /broadcast/<id>/events - Server-Sent Events stream")
     print("  GET  /status    - Get instance status")
-    print("  GET  /history   - Get broadcast history")
+    print("  GET  /history   - Broadcast history (?limit=M&cursor=C pages newest first)")
     print("  GET  /health    - Health check")
     print("")
     print("Open TRINITY_3_PANEL_INTERFACE.html to use the interface")
     print("=" * 60)
 
-    app.run(host='0.0.0.0', port=7777, debug=False)
+    app.run(host='0.0.0.0', port=7777, debug=False, threaded=True)